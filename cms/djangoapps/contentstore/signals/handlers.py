@@ -12,6 +12,8 @@ from pytz import UTC
 
 from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer
 from contentstore.proctoring import register_special_exams
+from lms.djangoapps.courseware.tasks import precompute_problem_contexts
+from lms.djangoapps.courseware.toggles import COURSEWARE_PRECOMPUTE_PROBLEM_CONTEXTS
 from lms.djangoapps.grades.api import task_compute_all_grades_for_course
 from openedx.core.djangoapps.credit.signals import on_course_publish
 from openedx.core.lib.gating import api as gating_api
@@ -66,6 +68,10 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
 
         update_search_index.delay(six.text_type(course_key), datetime.now(UTC).isoformat())
 
+    # and compute the contexts of the randomized problems before learners see them
+    if COURSEWARE_PRECOMPUTE_PROBLEM_CONTEXTS.is_enabled(course_key):
+        precompute_problem_contexts.delay(six.text_type(course_key))
+
 
 @receiver(SignalHandler.library_updated)
 def listen_for_library_update(sender, library_key, **kwargs):  # pylint: disable=unused-argument
@@ -850,6 +850,16 @@ MODULESTORE = {
     }
 }
 
+# Maximum size, in bytes, of the per-process LRU cache of pickled split
+# modulestore course structures that sits in front of 'course_structure_cache'.
+# Structures are immutable, so cached entries never go stale. 0 disables it.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_BYTES = 0
+
+# Maximum size, in bytes, of the per-process LRU cache of pickled split
+# modulestore definitions, keyed by definition id. Saved definitions are
+# immutable, so cached entries never go stale. 0 disables it.
+COURSE_DEFINITION_PROCESS_CACHE_MAX_BYTES = 0
+
 # Modulestore-level field override providers. These field override providers don't
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ()
@@ -914,6 +924,18 @@ CODE_JAIL = {
     },
 }
 
+# Executes sandboxed code in a pool of sandbox workers that stay running, instead of
+# starting a new sandboxed Python for each execution (see capa/safe_exec/worker_pool.py).
+CODE_JAIL_WORKER_POOL = {
+    'ENABLED': False,
+    # Number of workers started by each process.
+    'SIZE': 2,
+    # Number of executions after which a worker is replaced.
+    'MAX_EXECUTIONS': 100,
+    # Seconds to wait for a worker, before executing the code in a new sandbox.
+    'ACQUIRE_TIMEOUT': 1,
+}
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
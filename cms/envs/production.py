@@ -255,6 +255,8 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
     else:
         CODE_JAIL[name] = value
 
+CODE_JAIL_WORKER_POOL.update(ENV_TOKENS.get('CODE_JAIL_WORKER_POOL', {}))
+
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
 
 # COMPREHENSIVE_THEME_LOCALE_PATHS contain the paths to themes locale directories e.g.
@@ -2,6 +2,9 @@
 
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
 
 import six
 from django.conf import settings
@@ -111,14 +114,8 @@ def process_static_urls(text, replacement_function, data_dir=None):
         quote = match.group('quote')
         rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
-
-        starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        # Don't rewrite XBlock resource links.
+        if _is_xblock_resource_url(prefix + rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
@@ -173,59 +170,256 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         """
         Replace a single matched url.
         """
-        original_uri = "".join([prefix, rest])
-        # Don't mess with things that end in '?raw'
-        if rest.endswith('?raw'):
-            static_paths_out.append((original_uri, original_uri))
-            return original
+        return _replace_static_url(
+            original, prefix, quote, rest, data_directory, course_id, static_asset_path, static_paths_out
+        )
 
-        # In debug mode, if we can find the url as is,
-        if settings.DEBUG and finders.find(rest, True):
-            static_paths_out.append((original_uri, original_uri))
-            return original
+    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+
+def replace_urls(text, course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Applies the rewrites of replace_static_urls, replace_course_urls and, if
+    jump_to_id_base_url is given, replace_jump_to_id_urls to text in a single
+    pass, rather than scanning the whole text once for each of them.
+
+    text: The source text to do the substitution in
+    course_id: The course in which the rewrites happen
+    data_directory, static_asset_path: As for replace_static_urls
+    jump_to_id_base_url: As for replace_jump_to_id_urls
+    """
+    data_dir = static_asset_path or data_directory
+    course_url_base = '/courses/' + text_type(course_id) + '/'
+    static_paths_out = []
+
+    def replace_url(match):
+        """
+        Replace a single matched url, according to the prefix it matched.
+        """
+        original = match.group(0)
+        quote = match.group('quote')
+        rest = match.group('rest')
+
+        static_prefix = match.group('static')
+        if static_prefix is not None:
+            if _is_xblock_resource_url(static_prefix + rest):
+                return original
+            return _replace_static_url(
+                original, static_prefix, quote, rest, data_directory, course_id, static_asset_path, static_paths_out
+            )
+
+        if match.group('course') is not None:
+            return "".join([quote, course_url_base, rest, quote])
+
+        return "".join([quote, jump_to_id_base_url + rest, quote])
+
+    return _combined_url_replace_regex(data_dir, jump_to_id_base_url is not None).sub(replace_url, text)
+
+
+# dict((STATIC_URL, data_dir, replace jump_to_id urls), compiled regex)
+_COMBINED_URL_REPLACE_REGEXES = {}
+
+
+def _combined_url_replace_regex(data_dir, jump_to_id):
+    """
+    Returns the compiled regex used by replace_urls, which matches the urls
+    matched by each of the separate rewrites.
+    """
+    regex_key = (settings.STATIC_URL, data_dir, jump_to_id)
+    if regex_key not in _COMBINED_URL_REPLACE_REGEXES:
+        prefixes = [
+            u'(?P<static>(?:{static_url}|/static/)(?!{data_dir}))'.format(
+                static_url=settings.STATIC_URL,
+                data_dir=data_dir
+            ),
+            u'(?P<course>/course/)',
+        ]
+        if jump_to_id:
+            prefixes.append(u'(?P<jump_to_id>/jump_to_id/)')
+        _COMBINED_URL_REPLACE_REGEXES[regex_key] = re.compile(
+            _url_replace_regex(u'(?:{})'.format(u'|'.join(prefixes)))
+        )
+    return _COMBINED_URL_REPLACE_REGEXES[regex_key]
+
+
+def _is_xblock_resource_url(full_url):
+    """
+    Returns whether the url is a link to an XBlock resource.  Probably wasn't a good
+    idea that /static works for actual static assets and for magical course asset URLs....
+    """
+    starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    return starts_with_prefix or (starts_with_static_url and contains_prefix)
+
+
+def _replace_static_url(original, prefix, quote, rest, data_directory, course_id, static_asset_path,
+                        static_paths_out):
+    """
+    Replace a single static url matched in the text given to replace_static_urls.
+    """
+    original_uri = "".join([prefix, rest])
+    # Don't mess with things that end in '?raw'
+    if rest.endswith('?raw'):
+        static_paths_out.append((original_uri, original_uri))
+        return original
+
+    # In debug mode, if we can find the url as is,
+    if settings.DEBUG and finders.find(rest, True):
+        static_paths_out.append((original_uri, original_uri))
+        return original
+
+    # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
+    elif (not static_asset_path) and course_id:
+        url = _cached_asset_url(
+            (text_type(course_id), rest),
+            lambda: _course_asset_url(course_id, rest)
+        )
+
+    # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+    else:
+        url = _cached_asset_url(
+            (static_asset_path or data_directory, prefix, rest),
+            lambda: _data_directory_asset_url(prefix, rest, static_asset_path or data_directory)
+        )
+
+    static_paths_out.append((original_uri, url))
+    return "".join([quote, url, quote])
+
+
+def _course_asset_url(course_id, rest):
+    """
+    Returns the url of the static asset at path rest in the course.
+    """
+    # first look in the static file pipeline and see if we are trying to reference
+    # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+    exists_in_staticfiles_storage = False
+    try:
+        exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+    except Exception as err:
+        log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+            rest, str(err)))
+
+    if exists_in_staticfiles_storage:
+        url = staticfiles_storage.url(rest)
+    else:
+        # if not, then assume it's courseware specific content and then look in the
+        # Mongo-backed database
+        # Import is placed here to avoid model import at project startup.
+        from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+        base_url = AssetBaseUrlConfig.get_base_url()
+        excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+        url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+
+        if AssetLocator.CANONICAL_NAMESPACE in url:
+            url = url.replace('block@', 'block/', 1)
+    return url
+
+
+def _data_directory_asset_url(prefix, rest, data_directory):
+    """
+    Returns the url of the static asset at path rest in staticfiles_storage,
+    within the data directory if it isn't found on its own.
+    """
+    course_path = "/".join((data_directory, rest))
 
-        # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
-
-        # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+    try:
+        if staticfiles_storage.exists(rest):
+            url = staticfiles_storage.url(rest)
         else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
-
-            try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
-                    url = staticfiles_storage.url(course_path)
-            # And if that fails, assume that it's course content, and add manually data directory
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-                url = "".join([prefix, course_path])
-
-        static_paths_out.append((original_uri, url))
-        return "".join([quote, url, quote])
+            url = staticfiles_storage.url(course_path)
+    # And if that fails, assume that it's course content, and add manually data directory
+    except Exception as err:
+        log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+            rest, str(err)))
+        url = "".join([prefix, course_path])
+    return url
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+class AssetUrlCache(object):
+    """
+    A bounded, in-process LRU cache of the urls that static asset paths
+    resolve to, so that an asset referenced on every render isn't looked up
+    in staticfiles storage and the contentstore each time.
+
+    Whether an asset is locked, and so whether it is served from the CDN, can
+    change at any time, so entries expire after ``timeout`` seconds.
+    """
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Return the url stored for ``key``, or None if it isn't cached or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            url, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return url
+
+    def set(self, key, url):
+        """
+        Store ``url`` under ``key``, evicting the least recently used entry
+        if the cache is full.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (url, time.time() + self.timeout)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# (settings, AssetUrlCache)
+_ASSET_URL_CACHE = [None, None]
+
+
+def get_asset_url_cache():
+    """
+    Return the process-wide :class:`AssetUrlCache`, or None if it is disabled.
+
+    The cache is enabled by setting ``STATIC_REPLACE_ASSET_URL_CACHE_SIZE`` to
+    a positive number of entries.
+    """
+    max_entries = getattr(settings, 'STATIC_REPLACE_ASSET_URL_CACHE_SIZE', 0)
+    if not max_entries:
+        return None
+    cache_settings = (max_entries, getattr(settings, 'STATIC_REPLACE_ASSET_URL_CACHE_TIMEOUT', 300))
+    if _ASSET_URL_CACHE[0] != cache_settings:
+        _ASSET_URL_CACHE[:] = [cache_settings, AssetUrlCache(*cache_settings)]
+    return _ASSET_URL_CACHE[1]
+
+
+def _cached_asset_url(cache_key, resolve):
+    """
+    Returns the asset url stored in the asset url cache under cache_key, or
+    the url returned by resolve() if there is none.
+    """
+    asset_url_cache = get_asset_url_cache()
+    if asset_url_cache is None:
+        return resolve()
+
+    url = asset_url_cache.get(cache_key)
+    if url is None:
+        url = resolve()
+        asset_url_cache.set(cache_key, url)
+    return url
@@ -16,10 +16,13 @@ from PIL import Image
 
 from static_replace import (
     _url_replace_regex,
+    get_asset_url_cache,
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
-    replace_static_urls
+    replace_jump_to_id_urls,
+    replace_static_urls,
+    replace_urls
 )
 from xmodule.assetstore.assetmgr import AssetManager
 from xmodule.contentstore.content import StaticContent
@@ -252,6 +255,73 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY) == post_text
 
 
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_replace_urls(mock_storage):
+    """
+    Make sure that replace_urls makes the same rewrites as replace_static_urls,
+    replace_course_urls and replace_jump_to_id_urls applied one after the other.
+    """
+    mock_storage.exists.return_value = True
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+
+    # xss-lint: disable=python-wrap-html
+    text = (
+        '<img src="/static/file.png"/><a href=\'/course/info\'>info</a>'
+        '<a href="/jump_to_id/abc">abc</a><img src="/static/{data_dir}/other.png"/>'
+        '<img src="/static/foo.png?raw"/><img src="/static/xblock/resources/a.png"/>'
+    ).format(data_dir=DATA_DIRECTORY)
+
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url,
+    )
+    assert replace_urls(text, COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url=jump_to_id_base_url) == expected
+    assert '"/jump_to_id/abc"' in replace_urls(text, COURSE_KEY, DATA_DIRECTORY)
+
+
+@override_settings(STATIC_REPLACE_ASSET_URL_CACHE_SIZE=2)
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_asset_url_cache(mock_storage):
+    """
+    Make sure that the urls of static assets are looked up once while they are cached.
+    """
+    mock_storage.exists.return_value = True
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+    get_asset_url_cache().clear()
+
+    for __ in range(3):
+        assert replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY) == '"/static/hashed/file.png"'
+    mock_storage.url.assert_called_once_with('file.png')
+
+    # The least recently used asset is evicted once the cache is full
+    replace_static_urls('"/static/a.png"', DATA_DIRECTORY)
+    replace_static_urls('"/static/b.png"', DATA_DIRECTORY)
+    assert len(get_asset_url_cache()) == 2
+    replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY)
+    assert mock_storage.url.call_count == 4
+
+
+@override_settings(STATIC_REPLACE_ASSET_URL_CACHE_SIZE=10, STATIC_REPLACE_ASSET_URL_CACHE_TIMEOUT=60)
+@patch('static_replace.time.time')
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_asset_url_cache_expiry(mock_storage, mock_time):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.png'
+    mock_time.return_value = 1000
+    get_asset_url_cache().clear()
+
+    replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY)
+    mock_time.return_value = 1059
+    replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY)
+    assert mock_storage.url.call_count == 1
+
+    mock_time.return_value = 1060
+    replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY)
+    assert mock_storage.url.call_count == 2
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
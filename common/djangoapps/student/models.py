@@ -174,11 +174,8 @@ def anonymous_id_for_user(user, course_id, save=True):
         hasher.update(text_type(course_id).encode('utf-8'))
     digest = hasher.hexdigest()
 
-    if not hasattr(user, '_anonymous_id'):
-        user._anonymous_id = {}  # pylint: disable=protected-access
-
-    user._anonymous_id[course_id] = digest  # pylint: disable=protected-access
-
+    # The id isn't cached until it's saved, so that a later call that
+    # saves it doesn't find it cached and skip creating the AnonymousUserId.
     if save is False:
         return digest
 
@@ -193,6 +190,11 @@ def anonymous_id_for_user(user, course_id, save=True):
         # continue
         pass
 
+    if not hasattr(user, '_anonymous_id'):
+        user._anonymous_id = {}  # pylint: disable=protected-access
+
+    user._anonymous_id[course_id] = digest  # pylint: disable=protected-access
+
     return digest
 
 
@@ -39,6 +39,7 @@ from openedx.core.djangoapps.site_configuration.tests.mixins import SiteMixin
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
 from student.helpers import _cert_info, process_survey_link
 from student.models import (
+    AnonymousUserId,
     CourseEnrollment,
     LinkedInAddToProfileConfiguration,
     UserAttribute,
@@ -983,6 +984,12 @@ class AnonymousLookupTable(ModuleStoreTestCase):
         self.assertEqual(self.user, real_user)
         self.assertEqual(anonymous_id, anonymous_id_for_user(self.user, course2.id, save=False))
 
+    def test_saved_after_unsaved_lookup(self):
+        anonymous_id = anonymous_id_for_user(self.user, self.course.id, save=False)
+        self.assertIsNone(user_by_anonymous_id(anonymous_id))
+        self.assertEqual(anonymous_id, anonymous_id_for_user(self.user, self.course.id))
+        self.assertTrue(AnonymousUserId.objects.filter(user=self.user, anonymous_user_id=anonymous_id).exists())
+
     def test_secret_key_changes(self):
         """Test that a new anonymous id is returned when the secret key changes."""
         CourseEnrollment.enroll(self.user, self.course.id)
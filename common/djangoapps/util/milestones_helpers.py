@@ -350,7 +350,7 @@ def get_course_content_milestones(course_id, content_id=None, relationship='requ
     """
     Client API operation adapter/wrapper
     Uses the request cache to store all of a user's
-    milestones
+    milestones in the course, indexed by content block
 
     Returns all content blocks in a course if content_id is None, otherwise it just returns that
     specific content block.
@@ -362,20 +362,24 @@ def get_course_content_milestones(course_id, content_id=None, relationship='requ
         return milestones_api.get_course_content_milestones(course_id, content_id, relationship)
 
     request_cache_dict = get_cache(REQUEST_CACHE_NAME)
-    if user_id not in request_cache_dict:
-        request_cache_dict[user_id] = {}
-
-    if relationship not in request_cache_dict[user_id]:
-        request_cache_dict[user_id][relationship] = milestones_api.get_course_content_milestones(
+    cache_key = (user_id, six.text_type(course_id), relationship)
+    if cache_key not in request_cache_dict:
+        milestones = milestones_api.get_course_content_milestones(
             course_key=course_id,
             relationship=relationship,
             user={"id": user_id}
         )
+        # Index the milestones by content block, so checking a single block doesn't scan them all
+        milestones_by_content = {}
+        for milestone in milestones:
+            milestones_by_content.setdefault(milestone['content_id'], []).append(milestone)
+        request_cache_dict[cache_key] = (milestones, milestones_by_content)
 
+    milestones, milestones_by_content = request_cache_dict[cache_key]
     if content_id is None:
-        return request_cache_dict[user_id][relationship]
+        return milestones
 
-    return [m for m in request_cache_dict[user_id][relationship] if m['content_id'] == six.text_type(content_id)]
+    return list(milestones_by_content.get(six.text_type(content_id), []))
 
 
 def remove_course_content_user_milestones(course_key, content_key, user, relationship):
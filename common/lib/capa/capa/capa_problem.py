@@ -14,15 +14,18 @@ This is used by capa_module.
 """
 
 
+import hashlib
 import logging
 import os.path
 import re
-from collections import OrderedDict
+import threading
+from collections import OrderedDict, namedtuple
 from copy import deepcopy
 from datetime import datetime
 from xml.sax.saxutils import unescape
 
 import six
+from codejail.safe_exec import SafeExecException, json_safe
 from django.utils.encoding import python_2_unicode_compatible
 from lxml import etree
 from pytz import UTC
@@ -32,7 +35,7 @@ import capa.inputtypes as inputtypes
 import capa.responsetypes as responsetypes
 import capa.xqueue_interface as xqueue_interface
 from capa.correctmap import CorrectMap
-from capa.safe_exec import safe_exec
+from capa.safe_exec import safe_exec, update_hash
 from capa.util import contextualize_text, convert_files_to_filenames
 from openedx.core.djangolib.markup import HTML, Text
 from openedx.core.lib.edx_six import get_gettext
@@ -74,6 +77,11 @@ html_problem_semantics = [
     "openendedrubric",
 ]
 
+# total length of the XML, in characters, of the preprocessed problem trees kept by
+# each process (lxml trees take about 6 bytes per character of the XML they're parsed
+# from, so about 50MB)
+PROBLEM_TEMPLATE_CACHE_SIZE = 8 * 1024 * 1024
+
 log = logging.getLogger(__name__)
 
 #-----------------------------------------------------------------------------
@@ -184,16 +192,10 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        if isinstance(problem_text, six.text_type):
-            # etree chokes on Unicode XML with an encoding declaration
-            problem_text = problem_text.encode('utf-8')
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        # parse problem XML file into an element tree, handle any <include file="foo"> tags and
+        # assign the IDs of the responses and their inputs, copying the tree preprocessed for
+        # the previous learners of the problem, which we then modify.
+        self.tree, self.problem_data = self._copy_problem_template()
 
         # construct script processor context (eg for customresponse problems)
         if minimal_init:
@@ -201,11 +203,10 @@ class LoncapaProblem(object):
         else:
             self.context = self._extract_context(self.tree)
 
-        # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
-        # transformations.  This also creates the dict (self.responders) of Response
-        # instances for each question in the problem. The dict has keys = xml subtree of
-        # Response, values = Response instance
-        self.problem_data = self._preprocess_problem(self.tree, minimal_init)
+        # Create the dict (self.responders) of Response instances for each question in
+        # the problem, which perform some in-place transformations of the tree. The dict has
+        # keys = xml subtree of Response, values = Response instance
+        self._preprocess_problem(self.tree, minimal_init)
 
         if not minimal_init:
             if not self.student_answers:  # True when student_answers is an empty dict
@@ -226,7 +227,8 @@ class LoncapaProblem(object):
             if extract_tree:
                 self.extracted_tree = self._extract_html(self.tree)
 
-    def make_xml_compatible(self, tree):
+    @staticmethod
+    def make_xml_compatible(tree):
         """
         Adjust tree xml in-place for compatibility before creating
         a problem from it.
@@ -787,18 +789,71 @@ class LoncapaProblem(object):
 
     # ======= Private Methods Below ========
 
-    def _process_includes(self):
+    def _copy_problem_template(self):
+        """
+        Returns a copy of the problem's tree, with its includes processed and the IDs
+        of its responses and inputs assigned, and the accessibility data of its inputs.
+
+        These steps don't depend on the learner, so their result is shared by all of
+        the learners of the problem in the process: copying it is much faster than
+        parsing and preprocessing the XML again. The accessibility data is only read,
+        so it isn't copied.
+        """
+        key = (self.problem_text, self.problem_id, self.capa_system.DEBUG)
+        template = problem_templates.get(key)
+        if template is None or not self._includes_unchanged(template.included):
+            problem_text = self.problem_text
+            if isinstance(problem_text, six.text_type):
+                # etree chokes on Unicode XML with an encoding declaration
+                problem_text = problem_text.encode('utf-8')
+            tree = etree.XML(problem_text)
+            self.make_xml_compatible(tree)
+            included = self._process_includes(tree)
+            problem_data = self._assign_ids(tree)
+            template = ProblemTemplate(tree, problem_data, included)
+            problem_templates.set(
+                key, template, len(self.problem_text) + sum(len(content or '') for __, content in included)
+            )
+        return deepcopy(template.tree), template.problem_data
+
+    def _includes_unchanged(self, included):
+        """
+        Returns whether the files included by a problem tree still have the content
+        the tree was built with.
+        """
+        for filename, content in included:
+            try:
+                if self._read_include(filename) != content:
+                    return False
+            except Exception:  # pylint: disable=broad-except
+                if content is not None:
+                    return False
+        return True
+
+    def _read_include(self, filename):
+        """
+        Returns the content of an included file, read from the LoncapaSystem OSFS filestore.
+        """
+        ifp = self.capa_system.filestore.open(filename)
+        try:
+            return ifp.read()
+        finally:
+            ifp.close()
+
+    def _process_includes(self, tree):
         """
         Handle any <include file="foo"> tags by reading in the specified file and inserting it
-        into our XML tree.  Fail gracefully if debugging.
+        into the XML tree.  Fail gracefully if debugging.
+
+        Returns the name and the content of each file read, None for the files that couldn't be.
         """
-        includes = self.tree.findall('.//include')
+        included = []
+        includes = tree.findall('.//include')
         for inc in includes:
             filename = inc.get('file') if six.PY3 else inc.get('file').decode('utf-8')
             if filename is not None:
                 try:
-                    # open using LoncapaSystem OSFS filestore
-                    ifp = self.capa_system.filestore.open(filename)
+                    content = self._read_include(filename)
                 except Exception as err:
                     log.warning(
                         'Error %s in problem xml include: %s',
@@ -813,10 +868,12 @@ class LoncapaProblem(object):
                     if not self.capa_system.DEBUG:
                         raise
                     else:
+                        included.append((filename, None))
                         continue
+                included.append((filename, content))
                 try:
-                    # read in and convert to XML
-                    incxml = etree.XML(ifp.read())
+                    # convert to XML
+                    incxml = etree.XML(content)
                 except Exception as err:
                     log.warning(
                         'Error %s in problem xml include: %s',
@@ -836,6 +893,7 @@ class LoncapaProblem(object):
                 parent.insert(parent.index(inc), incxml)
                 parent.remove(inc)
                 log.debug('Included %s into %s', filename, self.problem_id)
+        return included
 
     def _extract_system_path(self, script):
         """
@@ -912,6 +970,20 @@ class LoncapaProblem(object):
                 extra_files.append(("python_lib.zip", zip_lib))
                 python_path.append("python_lib.zip")
 
+            # Unless the code uses the learner's id, its context only depends on the code and the seed, so
+            # it's shared by all of the learners with the same seed (see precompute_problem_contexts).
+            cache = self.capa_system.cache
+            context_key = None
+            if cache and 'anonymous_student_id' not in all_code:
+                context_key = context_cache_key(all_code, python_path, extra_files, self.seed)
+                cached = cache.get(context_key)
+                if cached is not None:
+                    emsg, cached_context = cached
+                    context.update(cached_context)
+                    if emsg:
+                        raise responsetypes.LoncapaProblemError(Text("Error while executing script code: %s" % emsg))
+                    return self._finish_context(context, all_code, python_path, extra_files)
+
             try:
                 safe_exec(
                     all_code,
@@ -919,16 +991,31 @@ class LoncapaProblem(object):
                     random_seed=self.seed,
                     python_path=python_path,
                     extra_files=extra_files,
-                    cache=self.capa_system.cache,
+                    cache=None if context_key else cache,
                     slug=self.problem_id,
                     unsafely=self.capa_system.can_execute_unsafe_code(),
                 )
             except Exception as err:
                 log.exception("Error while execing script code: " + all_code)
-                msg = Text("Error while executing script code: %s" % str(err))
+                emsg = str(err)
+                if context_key and isinstance(err, SafeExecException):
+                    cache.set(context_key, (emsg, {}))
+                msg = Text("Error while executing script code: %s" % emsg)
                 raise responsetypes.LoncapaProblemError(msg)
 
-        # Store code source in context, along with the Python path needed to run it correctly.
+            if context_key:
+                shared_context = json_safe(context)
+                shared_context.pop('anonymous_student_id', None)
+                cache.set(context_key, (None, shared_context))
+
+        return self._finish_context(context, all_code, python_path, extra_files)
+
+    @staticmethod
+    def _finish_context(context, all_code, python_path, extra_files):
+        """
+        Stores the code of the problem's scripts in its context, along with the
+        Python path needed to run it correctly, and returns the context.
+        """
         context['script_code'] = all_code
         context['python_path'] = python_path
         context['extra_files'] = extra_files or None
@@ -1050,20 +1137,16 @@ class LoncapaProblem(object):
 
         return tree
 
-    def _preprocess_problem(self, tree, minimal_init):  # private
+    def _assign_ids(self, tree):  # private
         """
         Assign IDs to all the responses
         Assign sub-IDs to all entries (textline, schematic, etc.)
-        Annoted correctness and value
         In-place transformation
 
-        Also create capa Response instances for each responsetype and save as self.responders
-
-        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        Returns the accessibility data of the entries, keyed by their IDs.
         """
         response_id = 1
         problem_data = {}
-        self.responders = {}
         for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
             responsetype_id = self.problem_id + "_" + str(response_id)
             # create and save ID for this response
@@ -1071,11 +1154,7 @@ class LoncapaProblem(object):
             response_id += 1
 
             answer_id = 1
-            input_tags = inputtypes.registry.registered_tags()
-            inputfields = tree.xpath(
-                "|".join(['//' + response.tag + '[@id=$id]//' + x for x in input_tags]),
-                id=responsetype_id
-            )
+            inputfields = self._response_inputfields(response)
 
             # assign one answer_id for each input type
             for entry in inputfields:
@@ -1086,6 +1165,29 @@ class LoncapaProblem(object):
 
             self.response_a11y_data(response, inputfields, responsetype_id, problem_data)
 
+        return problem_data
+
+    @staticmethod
+    def _response_inputfields(response):
+        """
+        Returns the entries (textline, schematic, etc.) of the response, in document order.
+        """
+        return list(response.iterdescendants(*inputtypes.registry.registered_tags()))
+
+    def _preprocess_problem(self, tree, minimal_init):  # private
+        """
+        Annoted correctness and value
+        In-place transformation
+
+        Create capa Response instances for each responsetype, whose IDs are assigned
+        (see _assign_ids), and save as self.responders
+
+        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        """
+        self.responders = {}
+        for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
+            inputfields = self._response_inputfields(response)
+
             # instantiate capa Response
             responsetype_cls = responsetypes.registry.get_class_for_tag(response.tag)
             responder = responsetype_cls(
@@ -1114,8 +1216,6 @@ class LoncapaProblem(object):
                 solution.attrib['id'] = "%s_solution_%i" % (self.problem_id, solution_id)
                 solution_id += 1
 
-        return problem_data
-
     def response_a11y_data(self, response, inputfields, responsetype_id, problem_data):
         """
         Construct data to be used for a11y.
@@ -1209,3 +1309,83 @@ class LoncapaProblem(object):
                 'label': HTML(label.strip()) if label else '',
                 'descriptions': descriptions
             }
+
+
+def context_cache_key(code, python_path, extra_files, seed):
+    """
+    Returns the key of the context computed by executing the code of a
+    problem's scripts with the seed, for any learner.
+
+    The key changes with the code and the files it can import, so a new version
+    of the problem's definition doesn't use the contexts of the previous one.
+    """
+    md5er = hashlib.md5()
+    md5er.update(repr(code).encode('utf-8'))
+    update_hash(md5er, python_path)
+    for name, content in extra_files:
+        md5er.update(name.encode('utf-8'))
+        md5er.update(content)
+    return "capa_context.%r.%s" % (seed, md5er.hexdigest())
+
+
+# The tree of a problem's XML, with its includes processed and the IDs of its responses and
+# inputs assigned, the accessibility data of its inputs and the files it included.
+ProblemTemplate = namedtuple('ProblemTemplate', ['tree', 'problem_data', 'included'])
+
+
+class ProblemTemplateCache(object):
+    """
+    Least recently used cache of the problem templates shared by the learners of
+    the problems, bounded by the total size of the XML they were built from.
+
+    The templates must not be modified: LoncapaProblem modifies deepcopies of them.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get(self, key):
+        """
+        Returns the template cached for the key, or None.
+        """
+        with self._lock:
+            if key not in self._templates:
+                self.misses += 1
+                return None
+            self.hits += 1
+            template, size = self._templates.pop(key)
+            self._templates[key] = (template, size)
+            return template
+
+    def set(self, key, template, size):
+        """
+        Caches the template for the key, evicting the least recently used
+        templates to keep the total size within the maximum.
+        """
+        if size > self.max_size:
+            return
+        with self._lock:
+            if key in self._templates:
+                self.size -= self._templates.pop(key)[1]
+            while self._templates and self.size + size > self.max_size:
+                self.size -= self._templates.popitem(last=False)[1][1]
+            self._templates[key] = (template, size)
+            self.size += size
+
+    def clear(self):
+        """
+        Removes all of the templates.
+        """
+        with self._lock:
+            self._templates.clear()
+            self.size = self.hits = self.misses = 0
+
+
+problem_templates = ProblemTemplateCache(PROBLEM_TEMPLATE_CACHE_SIZE)
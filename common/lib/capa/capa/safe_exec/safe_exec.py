@@ -10,6 +10,7 @@ import six
 from six import text_type
 
 from . import lazymod
+from .worker_pool import get_worker_pool
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -139,7 +140,8 @@ def safe_exec(
     if unsafely:
         exec_fn = codejail_not_safe_exec
     else:
-        exec_fn = codejail_safe_exec
+        worker_pool = get_worker_pool()
+        exec_fn = worker_pool.safe_exec if worker_pool else codejail_safe_exec
 
     # Run the code!  Results are side effects in globals_dict.
     try:
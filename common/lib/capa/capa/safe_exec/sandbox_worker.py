@@ -0,0 +1,182 @@
+"""
+A sandbox worker: a long-lived Python process that imports the modules problem
+code uses once, then forks a new child to execute each job it is sent, so that
+jobs don't pay for starting Python and importing the modules, but still can't
+affect each other.
+
+This is run by the sandbox's Python, as the sandbox user, so it must only use
+the standard library.
+
+The worker writes a "ready" line when it has imported the modules. Then, for
+each line of JSON it reads from stdin, describing a job:
+
+    {
+        "dir": the directory to execute the code in, with the job's files,
+        "code": the code to execute,
+        "globals": the globals to execute the code with,
+        "python_path": the directories, relative to "dir", to add to sys.path,
+        "limits": the resource limits of codejail.jail_code.LIMITS,
+    }
+
+it writes a line of JSON with the result:
+
+    {
+        "status": the exit status of the child, negative if it was killed,
+        "globals": the JSON-serializable globals after executing the code,
+        "stderr": the traceback of the exception the code raised,
+    }
+"""
+
+
+import json
+import os
+import resource
+import select
+import shutil
+import signal
+import sys
+import time
+import traceback
+
+# Copied from codejail.safe_exec: the globals that are returned.
+OK_TYPES = (type(None), int, float, str, list, tuple, dict)
+BAD_KEYS = ("__builtins__",)
+
+
+def jsonable(value):
+    """
+    Returns whether the value can be returned.
+    """
+    if not isinstance(value, OK_TYPES):
+        return False
+    try:
+        json.dumps(value)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
+
+
+def set_limits(limits):
+    """
+    Sets the resource limits of the current process, as codejail.jail_code does.
+    """
+    if limits.get("NPROC"):
+        resource.setrlimit(resource.RLIMIT_NPROC, (limits["NPROC"], limits["NPROC"]))
+    if limits.get("CPU"):
+        # The soft limit sends SIGXCPU, which is more distinctive than the hard limit's SIGKILL.
+        resource.setrlimit(resource.RLIMIT_CPU, (limits["CPU"], limits["CPU"] + 1))
+    if limits.get("VMEM"):
+        resource.setrlimit(resource.RLIMIT_AS, (limits["VMEM"], limits["VMEM"]))
+    fsize = limits.get("FSIZE", 0)
+    resource.setrlimit(resource.RLIMIT_FSIZE, (fsize, fsize))
+
+
+def run_child(job, result_fd):
+    """
+    Executes the job's code in the forked child, and writes its result to result_fd.
+    """
+    status = 0
+    try:
+        # Detach the code from the worker's pipes, so it can't read the next jobs or
+        # write results, and put it in its own process group, to kill any processes
+        # it leaves behind.
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        os.dup2(devnull, 0)
+        os.dup2(devnull, 1)
+
+        os.chdir(job["dir"])
+        os.environ.clear()
+        os.environ["TMPDIR"] = "tmp"
+        sys.path.extend(job["python_path"])
+        set_limits(job["limits"])
+
+        g_dict = job["globals"]
+        exec(job["code"], g_dict)  # pylint: disable=exec-used
+        result = {
+            "globals": dict((key, value) for key, value in g_dict.items() if jsonable(value) and key not in BAD_KEYS),
+        }
+    except BaseException:  # pylint: disable=broad-except
+        status = 1
+        result = {"stderr": traceback.format_exc()}
+
+    with os.fdopen(result_fd, "w") as result_file:
+        json.dump(result, result_file)
+    os._exit(status)  # pylint: disable=protected-access
+
+
+def read_result(result_fd, realtime):
+    """
+    Returns the data written by the child to result_fd, and whether it took
+    longer than realtime seconds (if realtime isn't 0) to close it.
+    """
+    deadline = time.time() + realtime if realtime else None
+    chunks = []
+    while True:
+        timeout = max(deadline - time.time(), 0) if deadline else None
+        readable, __, __ = select.select([result_fd], [], [], timeout)
+        if not readable:
+            return b"".join(chunks), True
+        chunk = os.read(result_fd, 65536)
+        if not chunk:
+            return b"".join(chunks), False
+        chunks.append(chunk)
+
+
+def run_job(job):
+    """
+    Forks a child to execute the job, and returns its result.
+    """
+    result_read_fd, result_write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(result_read_fd)
+        run_child(job, result_write_fd)
+
+    os.close(result_write_fd)
+    try:
+        data, timed_out = read_result(result_read_fd, job["limits"].get("REALTIME", 0))
+    finally:
+        os.close(result_read_fd)
+
+    if timed_out:
+        os.kill(pid, signal.SIGKILL)
+    __, status = os.waitpid(pid, 0)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+    shutil.rmtree(os.path.join(job["dir"], "tmp"), ignore_errors=True)
+
+    if os.WIFSIGNALED(status):
+        return {"status": -os.WTERMSIG(status), "stderr": ""}
+    try:
+        result = json.loads(data.decode("utf-8"))
+    except ValueError:
+        result = {"stderr": ""}
+    result["status"] = os.WEXITSTATUS(status)
+    return result
+
+
+def main(preimports):
+    """
+    Imports the modules, then executes the jobs read from stdin until it's closed.
+    """
+    # Set before importing numpy, as the code prolog of capa's safe_exec does (see TNL-6456).
+    os.environ["OPENBLAS_NUM_THREADS"] = "1"
+    for module_name in preimports:
+        try:
+            __import__(module_name)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    stdin, stdout = sys.stdin, sys.stdout
+    stdout.write("ready\n")
+    stdout.flush()
+    for line in stdin:
+        stdout.write(json.dumps(run_job(json.loads(line))) + "\n")
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    main(json.loads(sys.argv[1]) if len(sys.argv) > 1 else [])
@@ -0,0 +1,97 @@
+"""Test worker_pool.py"""
+
+
+import os.path
+import unittest
+
+from codejail.safe_exec import SafeExecException
+from mock import Mock, patch
+from six import text_type
+
+from capa.safe_exec import safe_exec
+from capa.safe_exec.worker_pool import SandboxWorkerPool, local_worker_command
+
+
+class TestSandboxWorkerPool(unittest.TestCase):
+    """
+    Test executing code in a pool of workers started without a sandbox.
+    """
+    def setUp(self):
+        super(TestSandboxWorkerPool, self).setUp()
+        self.fallback = Mock()
+        self.pool = self.create_pool()
+
+    def create_pool(self, **kwargs):
+        """
+        Returns a pool of local workers, that is used by safe_exec during the test.
+        """
+        pool = SandboxWorkerPool(local_worker_command(), fallback=self.fallback, **kwargs)
+        self.addCleanup(pool.close)
+        patcher = patch('capa.safe_exec.safe_exec.get_worker_pool', return_value=pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return pool
+
+    def test_set_values(self):
+        g = {'b': 2}
+        safe_exec("a = 1/b + int(math.pi)", g, random_seed=17)
+        self.assertEqual(g['a'], 3.5)
+        self.assertFalse(self.fallback.called)
+
+    def test_same_results_as_new_sandbox(self):
+        code = "rnums = [random.randint(0, 999) for _ in xrange(10)]"
+        g = {}
+        safe_exec(code, g, random_seed=17)
+        g_unsafe = {}
+        safe_exec(code, g_unsafe, random_seed=17, unsafely=True)
+        self.assertEqual(g['rnums'], g_unsafe['rnums'])
+
+    def test_python_lib(self):
+        pylib = os.path.dirname(__file__) + "/test_files/pylib"
+        g = {}
+        safe_exec("import constant; a = constant.THE_CONST", g, python_path=[pylib])
+        self.assertEqual(g['a'], 23)
+
+    def test_extra_files(self):
+        g = {}
+        safe_exec("a = open('data.txt').read()", g, extra_files=[('data.txt', b'some data')])
+        self.assertEqual(g['a'], 'some data')
+
+    def test_executions_dont_share_state(self):
+        g = {}
+        safe_exec("import math; math.shared = 1", g)
+        safe_exec("import math; a = hasattr(math, 'shared')", g)
+        self.assertFalse(g['a'])
+
+    def test_raising_exceptions(self):
+        worker = self.pool._idle_workers.queue[0]  # pylint: disable=protected-access
+        with self.assertRaises(SafeExecException) as cm:
+            safe_exec("1/0", {})
+        self.assertIn("ZeroDivisionError", text_type(cm.exception))
+
+        # the worker was replaced
+        self.assertNotIn(worker, self.pool._workers)  # pylint: disable=protected-access
+        self.assertEqual(len(self.pool._workers), 2)  # pylint: disable=protected-access
+
+        g = {}
+        safe_exec("a = 1", g)
+        self.assertEqual(g['a'], 1)
+
+    @patch.dict('codejail.jail_code.LIMITS', {'REALTIME': 1})
+    def test_realtime_limit(self):
+        with self.assertRaises(SafeExecException) as cm:
+            safe_exec("while True: pass", {})
+        self.assertIn("status code: -9", text_type(cm.exception))
+
+    def test_max_executions(self):
+        pool = self.create_pool(size=1, max_executions=2)
+        worker = pool._idle_workers.queue[0]  # pylint: disable=protected-access
+        for __ in range(2):
+            safe_exec("a = 1", {})
+        self.assertNotIn(worker, pool._workers)  # pylint: disable=protected-access
+        self.assertEqual(len(pool._workers), 1)  # pylint: disable=protected-access
+
+    def test_no_worker_available(self):
+        self.create_pool(size=0, acquire_timeout=0)
+        safe_exec("a = 1", {}, slug='no_workers')
+        self.assertTrue(self.fallback.called)
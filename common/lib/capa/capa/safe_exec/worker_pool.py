@@ -0,0 +1,286 @@
+"""
+A pool of sandbox workers for executing problem code.
+
+Executing code with codejail starts a new sandboxed Python process, which
+then imports the modules the code uses, for every execution.  The pool keeps
+sandbox workers (see sandbox_worker.py) running instead: each worker is
+started the same way codejail starts a sandboxed process, as the sandbox user
+with the sandbox's Python, imports the modules once, and forks a new child,
+with codejail's resource limits, to execute each piece of code.
+
+Workers are replaced after executing MAX_EXECUTIONS pieces of code, and after
+any failure.
+
+The pool is enabled by the CODE_JAIL_WORKER_POOL setting, and only used when
+codejail is configured.
+"""
+
+
+import atexit
+import json
+import logging
+import os
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from codejail import jail_code
+from codejail.safe_exec import SafeExecException, json_safe
+from codejail.safe_exec import safe_exec as codejail_safe_exec
+from django.conf import settings
+from edx_django_utils.monitoring import set_custom_metric
+from six.moves import queue
+
+from . import sandbox_worker
+
+log = logging.getLogger(__name__)
+
+# The modules imported by the workers before executing any code.
+PREIMPORTS = ['six', 'random2', 'numpy', 'math', 'scipy', 'calc', 'eia', 'chem', 'verifiers']
+
+# How much longer than the REALTIME limit to wait for a worker's result, before
+# deciding that the worker itself is stuck.
+WORKER_TIMEOUT_MARGIN = 5
+
+# How long to wait for a worker to import the modules.
+WORKER_READY_TIMEOUT = 60
+
+with open(os.path.splitext(sandbox_worker.__file__)[0] + '.py') as worker_file:
+    WORKER_SOURCE = worker_file.read()
+
+
+def jailed_worker_command():
+    """
+    Returns the command that starts a worker in the sandbox configured for
+    codejail, or None if codejail isn't configured.
+    """
+    if not jail_code.is_configured('python'):
+        return None
+    command = []
+    user = jail_code.COMMANDS['python']['user']
+    if user:
+        command.extend(['sudo', '-u', user])
+    command.extend(jail_code.COMMANDS['python']['cmdline_start'])
+    return command + ['-c', WORKER_SOURCE, json.dumps(PREIMPORTS)]
+
+
+def local_worker_command():
+    """
+    Returns the command that starts a worker with the current Python, without
+    any sandboxing, for tests and development.
+    """
+    return [sys.executable, '-c', WORKER_SOURCE, json.dumps(PREIMPORTS)]
+
+
+class SandboxWorkerError(Exception):
+    """
+    A worker failed, rather than the code it was executing.
+    """
+    pass
+
+
+class SandboxWorker(object):
+    """
+    A running sandbox worker.
+    """
+    def __init__(self, command):
+        self.executions = 0
+        self._ready = False
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env={},
+        )
+
+    def _read_line(self, timeout):
+        """
+        Returns the next line written by the worker.
+        """
+        readable, __, __ = select.select([self._process.stdout], [], [], timeout)
+        line = self._process.stdout.readline() if readable else b''
+        if not line:
+            raise SandboxWorkerError(u'The sandbox worker stopped responding.')
+        return line
+
+    def execute(self, job):
+        """
+        Executes the job, and returns the worker's result.
+        """
+        if not self._ready:
+            self._read_line(WORKER_READY_TIMEOUT)
+            self._ready = True
+
+        self.executions += 1
+        try:
+            self._process.stdin.write(json.dumps(job).encode('utf-8') + b'\n')
+            self._process.stdin.flush()
+        except (IOError, OSError):
+            raise SandboxWorkerError(u'The sandbox worker stopped responding.')
+        realtime = job['limits'].get('REALTIME') or 0
+        return json.loads(self._read_line(realtime + WORKER_TIMEOUT_MARGIN if realtime else None).decode('utf-8'))
+
+    def close(self):
+        """
+        Stops the worker.
+        """
+        try:
+            self._process.stdin.close()
+        except (IOError, OSError):
+            pass
+        try:
+            self._process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+
+
+class SandboxWorkerPool(object):
+    """
+    Executes code in a pool of sandbox workers, started with worker_command.
+
+    The pool is used like codejail.safe_exec.safe_exec, and raises
+    SafeExecException in the same cases.  When no worker becomes available
+    within acquire_timeout seconds, the code is executed with fallback.
+    """
+    def __init__(self, worker_command, size=2, max_executions=100, acquire_timeout=1, fallback=codejail_safe_exec):
+        self.worker_command = worker_command
+        self.max_executions = max_executions
+        self.acquire_timeout = acquire_timeout
+        self.fallback = fallback
+        self.pid = os.getpid()
+        self._idle_workers = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        for __ in range(size):
+            self._add_worker()
+
+    def _add_worker(self):
+        """
+        Starts a new worker, which imports the modules while it waits to be used.
+        """
+        worker = SandboxWorker(self.worker_command)
+        with self._lock:
+            self._workers.add(worker)
+        self._idle_workers.put(worker)
+
+    def _retire_worker(self, worker):
+        """
+        Stops the worker, and starts another one to replace it.
+        """
+        with self._lock:
+            self._workers.discard(worker)
+        worker.close()
+        self._add_worker()
+
+    def close(self):
+        """
+        Stops all of the workers.
+        """
+        with self._lock:
+            workers, self._workers = self._workers, set()
+        for worker in workers:
+            worker.close()
+
+    def safe_exec(self, code, globals_dict, python_path=None, extra_files=None, slug=None):
+        """
+        Executes code, like codejail.safe_exec.safe_exec, in a worker.
+        """
+        start_time = time.time()
+        try:
+            worker = self._idle_workers.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            log.warning(u'No sandbox worker available to execute %s, executing it in a new sandbox', slug)
+            return self.fallback(
+                code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug,
+            )
+        wait_time = time.time() - start_time
+
+        start_time = time.time()
+        job_dir = _make_job_dir(python_path, extra_files)
+        try:
+            result = worker.execute({
+                'dir': job_dir,
+                'code': code,
+                'globals': json_safe(globals_dict),
+                'python_path': [os.path.basename(pydir) for pydir in python_path or ()],
+                'limits': dict(jail_code.LIMITS),
+            })
+        except SandboxWorkerError as error:
+            self._retire_worker(worker)
+            raise SafeExecException(u"Couldn't execute jailed code: {}".format(error))
+        finally:
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+        if result['status'] != 0 or worker.executions >= self.max_executions:
+            self._retire_worker(worker)
+        else:
+            self._idle_workers.put(worker)
+
+        exec_time = time.time() - start_time
+        set_custom_metric('safe_exec_worker_wait_time', wait_time)
+        set_custom_metric('safe_exec_worker_exec_time', exec_time)
+        log.debug(u'%s waited %.3fs for a sandbox worker, and executed in %.3fs', slug, wait_time, exec_time)
+
+        if result['status'] != 0:
+            raise SafeExecException((
+                u"Couldn't execute jailed code: stdout: {stdout!r}, "
+                u"stderr: {stderr!r} with status code: {status}"
+            ).format(stdout=b'', stderr=result.get('stderr', u'').encode('utf-8'), status=result['status']))
+        globals_dict.update(result['globals'])
+
+
+def _make_job_dir(python_path, extra_files):
+    """
+    Returns a new directory containing the files for executing code, as
+    codejail.jail_code creates for each process.
+    """
+    job_dir = tempfile.mkdtemp(prefix='codejail-')
+    os.chmod(job_dir, 0o755)
+    tmp_dir = os.path.join(job_dir, 'tmp')
+    os.mkdir(tmp_dir)
+    os.chmod(tmp_dir, 0o777)
+    for pydir in python_path or ():
+        destination = os.path.join(job_dir, os.path.basename(pydir))
+        if os.path.isdir(pydir):
+            shutil.copytree(pydir, destination)
+        elif os.path.exists(pydir):
+            shutil.copy(pydir, destination)
+    for name, content in extra_files or ():
+        with open(os.path.join(job_dir, name), 'wb') as extra_file:
+            extra_file.write(content)
+    return job_dir
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_worker_pool():
+    """
+    Returns the process's pool of sandbox workers, or None if it's disabled.
+    """
+    global _POOL  # pylint: disable=global-statement
+    config = getattr(settings, 'CODE_JAIL_WORKER_POOL', {})
+    if not config.get('ENABLED'):
+        return None
+
+    with _POOL_LOCK:
+        # The pool is started by each process that uses it, as forked processes can't share the workers.
+        if _POOL is None or _POOL.pid != os.getpid():
+            worker_command = jailed_worker_command()
+            if worker_command is None:
+                return None
+            _POOL = SandboxWorkerPool(
+                worker_command,
+                size=config.get('SIZE', 2),
+                max_executions=config.get('MAX_EXECUTIONS', 100),
+                acquire_timeout=config.get('ACQUIRE_TIMEOUT', 1),
+            )
+            atexit.register(_POOL.close)
+        return _POOL
@@ -3,17 +3,22 @@ Test capa problem.
 """
 
 
+import shutil
+import tempfile
 import textwrap
 import unittest
 
 import ddt
+import fs.osfs
 import six
 from lxml import etree
 from markupsafe import Markup
 from mock import patch
 
+from capa.capa_problem import ProblemTemplateCache, problem_templates
 from capa.responsetypes import LoncapaProblemError
-from capa.tests.helpers import new_loncapa_problem
+from capa.safe_exec.tests.test_safe_exec import DictCache
+from capa.tests.helpers import new_loncapa_problem, test_capa_system
 from openedx.core.djangolib.markup import HTML
 
 
@@ -789,3 +794,204 @@ class CAPAProblemReportHelpersTest(unittest.TestCase):
         # Ensure that the answer is a string so that the dict returned from this
         # function can eventualy be serialized to json without issues.
         self.assertIsInstance(problem.get_question_answers()['1_solution_1'], six.text_type)
+
+
+class ProblemTemplateTest(unittest.TestCase):
+    """
+    Tests for the preprocessed trees of problem XML shared between learners.
+    """
+    xml = textwrap.dedent("""
+        <problem>
+            <optionresponse>
+                <optioninput>
+                    <option correct="False">Red</option>
+                    <option correct="True">Blue</option>
+                </optioninput>
+            </optionresponse>
+            <multiplechoiceresponse>
+                <label>Which is a color?</label>
+                <choicegroup type="MultipleChoice" shuffle="true">
+                    <choice correct="false">Apple</choice>
+                    <choice correct="false">Banana</choice>
+                    <choice correct="false">Cherry</choice>
+                    <choice correct="true">Red</choice>
+                    <choice correct="false">Tomato</choice>
+                </choicegroup>
+            </multiplechoiceresponse>
+            <solution><p>Red is a color.</p></solution>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(ProblemTemplateTest, self).setUp()
+        problem_templates.clear()
+        self.addCleanup(problem_templates.clear)
+
+    def get_template(self, problem):
+        """
+        Returns the template shared by the learners of the problem.
+        """
+        return problem_templates.get((problem.problem_text, problem.problem_id, problem.capa_system.DEBUG))
+
+    def test_template_shared_between_learners(self):
+        problems = [new_loncapa_problem(self.xml, seed=seed) for seed in (1, 2)]
+
+        self.assertEqual(problem_templates.misses, 1)
+        self.assertEqual(problem_templates.hits, 1)
+        self.assertIsNot(problems[0].tree, problems[1].tree)
+        self.assertIs(problems[0].problem_data, problems[1].problem_data)
+
+        # the choices are shuffled for each learner
+        choices = [
+            [choice.text for choice in problem.tree.findall('.//choice')] for problem in problems
+        ]
+        self.assertNotEqual(choices[0], choices[1])
+
+    def test_template_not_modified(self):
+        problem = new_loncapa_problem(self.xml)
+        template = self.get_template(problem)
+
+        # the template has its options made compatible, the ids of its responses and inputs
+        # and its labels extracted, but isn't shuffled and has no ids for its solutions
+        self.assertEqual(template.tree.find('.//optioninput').get('options'), "('Red','Blue')")
+        self.assertEqual(template.tree.find('.//optionresponse').get('id'), '1_1')
+        self.assertEqual(template.tree.find('.//choicegroup').get('id'), '1_3_1')
+        self.assertIsNone(template.tree.find('.//label'))
+        self.assertEqual(template.problem_data['1_3_1']['label'], 'Which is a color?')
+        self.assertEqual(
+            [choice.text for choice in template.tree.findall('.//choice')],
+            ['Apple', 'Banana', 'Cherry', 'Red', 'Tomato'],
+        )
+        self.assertIsNone(template.tree.find('.//solution').get('id'))
+        self.assertEqual(problem.tree.find('.//solution').get('id'), '1_solution_1')
+
+    def test_template_per_problem(self):
+        new_loncapa_problem(self.xml, problem_id='1')
+        problem = new_loncapa_problem(self.xml, problem_id='2')
+
+        self.assertEqual(problem_templates.misses, 2)
+        self.assertEqual(problem.tree.find('.//optionresponse').get('id'), '2_1')
+
+    def test_invalid_xml_not_cached(self):
+        xml = "<problem><optionresponse><optioninput>" \
+              "<option correct='True'>Red</option><option correct='True'>Blue</option>" \
+              "</optioninput></optionresponse></problem>"
+        for __ in range(2):
+            with self.assertRaises(LoncapaProblemError):
+                new_loncapa_problem(xml)
+        self.assertEqual(len(problem_templates), 0)
+
+    def test_included_file_changed(self):
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        capa_system = test_capa_system()
+        capa_system.filestore = fs.osfs.OSFS(tempdir)
+        xml = '<problem><include file="include.xml"/></problem>'
+
+        def include(content):
+            """
+            Writes the content of the included file, and returns the problem including it.
+            """
+            with capa_system.filestore.open('include.xml', 'w') as include_file:
+                include_file.write(content)
+            return new_loncapa_problem(xml, capa_system=capa_system)
+
+        self.assertEqual(include('<p>First</p>').tree.find('p').text, 'First')
+        self.assertEqual(include('<p>First</p>').tree.find('p').text, 'First')
+        self.assertEqual(include('<p>Second</p>').tree.find('p').text, 'Second')
+        self.assertEqual(problem_templates.hits, 2)
+        self.assertEqual(len(problem_templates), 1)
+
+
+class ProblemTemplateCacheTest(unittest.TestCase):
+    """
+    Tests for ProblemTemplateCache.
+    """
+    def setUp(self):
+        super(ProblemTemplateCacheTest, self).setUp()
+        self.cache = ProblemTemplateCache(max_size=10)
+
+    def test_bounded_by_size(self):
+        self.cache.set('a', 'A', 4)
+        self.cache.set('b', 'B', 4)
+        self.assertEqual(self.cache.get('a'), 'A')
+
+        # the least recently used template is evicted
+        self.cache.set('c', 'C', 4)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'A')
+        self.assertEqual(self.cache.get('c'), 'C')
+        self.assertEqual(self.cache.size, 8)
+
+    def test_replace(self):
+        self.cache.set('a', 'A', 4)
+        self.cache.set('a', 'A2', 6)
+        self.assertEqual(self.cache.get('a'), 'A2')
+        self.assertEqual(self.cache.size, 6)
+
+    def test_too_large(self):
+        self.cache.set('a', 'A', 4)
+        self.cache.set('b', 'B', 11)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'A')
+
+
+class SharedContextTest(unittest.TestCase):
+    """
+    Tests for the contexts of problem scripts shared between learners with the same seed.
+    """
+    xml = textwrap.dedent("""
+        <problem>
+            <script type="loncapa/python">
+x = random.randint(0, 100)
+            </script>
+            <customresponse cfn="check" expect="$x">
+                <textline/>
+            </customresponse>
+        </problem>
+    """)
+
+    def new_problem(self, cache, student_id, xml=None, seed=1):
+        """
+        Returns the problem loaded for the learner with the cache.
+        """
+        capa_system = test_capa_system()
+        capa_system.cache = cache
+        capa_system.anonymous_student_id = student_id
+        return new_loncapa_problem(xml or self.xml, capa_system=capa_system, seed=seed)
+
+    def test_context_shared_between_learners(self):
+        cache = {}
+        first = self.new_problem(DictCache(cache), 'first')
+        self.assertEqual(len(cache), 1)
+
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            second = self.new_problem(DictCache(cache), 'second')
+        self.assertFalse(mock_safe_exec.called)
+        self.assertEqual(second.context['x'], first.context['x'])
+        self.assertEqual(second.context['anonymous_student_id'], 'second')
+        self.assertEqual(second.context['script_code'], first.context['script_code'])
+
+    def test_context_per_seed(self):
+        cache = {}
+        self.new_problem(DictCache(cache), 'first', seed=1)
+        self.new_problem(DictCache(cache), 'second', seed=2)
+        self.assertEqual(len(cache), 2)
+
+    def test_context_using_learner_not_shared(self):
+        xml = self.xml.replace('x = random.randint(0, 100)', 'x = len(anonymous_student_id)')
+        cache = {}
+        first = self.new_problem(DictCache(cache), 'first', xml=xml)
+        second = self.new_problem(DictCache(cache), 'second learner', xml=xml)
+        self.assertNotEqual(first.context['x'], second.context['x'])
+        self.assertFalse([key for key in cache if key.startswith('capa_context.')])
+
+    def test_error_shared_between_learners(self):
+        xml = self.xml.replace('x = random.randint(0, 100)', 'x = 1 / 0')
+        cache = {}
+        with self.assertRaises(LoncapaProblemError):
+            self.new_problem(DictCache(cache), 'first', xml=xml)
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            with self.assertRaises(LoncapaProblemError):
+                self.new_problem(DictCache(cache), 'second', xml=xml)
+        self.assertFalse(mock_safe_exec.called)
@@ -7,12 +7,15 @@ Tests capa util
 import unittest
 
 import ddt
+from calc import UndefinedVariable, evaluator
 from lxml import etree
+from mock import patch
 
 from capa.tests.helpers import test_capa_system
 from capa.util import (
     compare_with_tolerance,
     contextualize_text,
+    evaluate_samples,
     get_inner_html_from_xpath,
     remove_markup,
     sanitize_html
@@ -169,3 +172,56 @@ class UtilTest(unittest.TestCase):
         expected_text = '$あなたあなたあなたあなた あなたhi'
         contextual_text = contextualize_text(text, context)
         self.assertEqual(expected_text, contextual_text)
+
+
+@ddt.ddt
+class EvaluateSamplesTest(unittest.TestCase):
+    """Tests for evaluating formulas for many samples of their variables at once"""
+
+    samples = [{'x': x, 'Y': y} for x, y in [(-2.5, 1.0), (0.5, 3.25), (1.75, -4.0), (3.0, 0.125)]]
+
+    def assert_same_as_evaluator(self, math_expr, case_sensitive=False):
+        """
+        Asserts that the expression has the values calc.evaluator computes for each sample.
+        """
+        expected = [evaluator(var_dict, {}, math_expr, case_sensitive=case_sensitive) for var_dict in self.samples]
+        for value, expected_value in zip(evaluate_samples(self.samples, math_expr, case_sensitive), expected):
+            self.assertTrue(compare_with_tolerance(value, expected_value))
+
+    @ddt.data(
+        'x^2 + 2*x*y - y/3',
+        'sin(x)/cos(y) + e^x',
+        '2^3^2*x',
+        'x || y',
+        '-x - -3 + 5%*y',
+        'sqrt(x) + ln(x)',
+        'x^0.5',
+        'x*i + pi',
+        'fact(3)*x',
+        'arccot(x)',
+    )
+    def test_same_as_evaluator(self, math_expr):
+        self.assert_same_as_evaluator(math_expr)
+
+    def test_case_sensitive(self):
+        self.assert_same_as_evaluator('x*Y', case_sensitive=True)
+        with self.assertRaises(UndefinedVariable):
+            evaluate_samples(self.samples, 'x*y', case_sensitive=True)
+
+    def test_evaluated_at_once(self):
+        with patch('capa.util.evaluator') as mock_evaluator:
+            evaluate_samples(self.samples, 'x^2 + sin(y)')
+        self.assertFalse(mock_evaluator.called)
+
+    @ddt.data('fact(x)', 'x/(y-y)', 'x^1000')
+    def test_evaluated_for_each_sample(self, math_expr):
+        # functions that don't accept arrays, floating point errors and infinite values are left to evaluator
+        with patch('capa.util.evaluator', return_value=1.0) as mock_evaluator:
+            self.assertEqual(evaluate_samples(self.samples, math_expr), [1.0] * len(self.samples))
+        self.assertEqual(mock_evaluator.call_count, len(self.samples))
+
+    def test_errors(self):
+        with self.assertRaises(ZeroDivisionError):
+            evaluate_samples(self.samples, 'x/0')
+        with self.assertRaises(UndefinedVariable):
+            evaluate_samples(self.samples, 'x*z')
@@ -7,10 +7,12 @@ import logging
 import re
 from cmath import isinf, isnan
 from decimal import Decimal
+from functools import lru_cache
 
 import bleach
+import numpy
 import six
-from calc import evaluator
+from calc import ParseAugmenter, add_defaults, check_parens, eval_number, evaluator
 from lxml import etree
 
 from openedx.core.djangolib.markup import HTML
@@ -21,6 +23,9 @@ from openedx.core.djangolib.markup import HTML
 default_tolerance = '0.001%'
 log = logging.getLogger(__name__)
 
+# number of parsed formulas kept by each process
+FORMULA_CACHE_SIZE = 1024
+
 
 def compare_with_tolerance(student_complex, instructor_complex, tolerance=default_tolerance, relative_tolerance=False):
     """
@@ -61,11 +66,11 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         if tolerance == default_tolerance:
             relative_tolerance = True
         if tolerance.endswith('%'):
-            tolerance = evaluator(dict(), dict(), tolerance[:-1]) * 0.01
+            tolerance = _evaluate_tolerance(tolerance[:-1]) * 0.01
             if not relative_tolerance:
                 tolerance = tolerance * abs(instructor_complex)
         else:
-            tolerance = evaluator(dict(), dict(), tolerance)
+            tolerance = _evaluate_tolerance(tolerance)
 
     if relative_tolerance:
         tolerance = tolerance * max(abs(student_complex), abs(instructor_complex))
@@ -98,6 +103,136 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         return abs(student_complex - instructor_complex) <= tolerance
 
 
+@lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def _evaluate_tolerance(tolerance):
+    """
+    Returns the value of the tolerance string, which is the same for every
+    comparison made with it.
+    """
+    return evaluator(dict(), dict(), tolerance)
+
+
+@lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def _parse_formula(math_expr, case_sensitive):
+    """
+    Returns the calc.ParseAugmenter of the parsed math expression, raising the
+    errors calc.evaluator raises for it.
+
+    The parsed tree isn't modified by evaluating it, so it's shared by every
+    evaluation of the expression in the process.
+    """
+    check_parens(math_expr)
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+    return math_interpreter
+
+
+def _operands(parse_result):
+    """
+    Returns the numbers and arrays of the parse results, without the operators.
+    """
+    return [value for value in parse_result if not isinstance(value, six.string_types)]
+
+
+def _eval_atom(parse_result):
+    """
+    Returns the value wrapped by the atom, ignoring parentheses.
+    """
+    return _operands(parse_result)[0]
+
+
+def _eval_power(parse_result):
+    """
+    Exponentiates the values right to left, like calc.eval_power.
+    """
+    values = _operands(parse_result)
+    power = values.pop()
+    while values:
+        power = values.pop() ** power
+    return power
+
+
+def _eval_parallel(parse_result):
+    """
+    Combines the values with the parallel resistors operator, like
+    calc.eval_parallel.  Zero values fail with a floating point error, rather
+    than returning NaN.
+    """
+    values = _operands(parse_result)
+    if len(values) == 1:
+        return values[0]
+    return 1. / sum(1. / value for value in values)
+
+
+def _eval_sum(parse_result):
+    """
+    Adds the values, keeping in mind their sign, like calc.eval_sum.
+    """
+    total = 0.0
+    subtract = False
+    for token in parse_result:
+        if isinstance(token, six.string_types):
+            subtract = token == '-'
+        else:
+            total = total - token if subtract else total + token
+    return total
+
+
+def _eval_product(parse_result):
+    """
+    Multiplies and divides the values, like calc.eval_product.
+    """
+    product = 1.0
+    divide = False
+    for token in parse_result:
+        if isinstance(token, six.string_types):
+            divide = token == '/'
+        else:
+            product = product / token if divide else product * token
+    return product
+
+
+def evaluate_samples(var_dict_list, math_expr, case_sensitive=False):
+    """
+    Returns the values of calc.evaluator for the math expression with each of
+    the dicts of variables in var_dict_list, which all have the same names.
+
+    The expression is parsed once, and evaluated for all of the samples at once,
+    with numpy arrays of the values of the variables.  When that fails, because
+    a function can't be applied to arrays, a floating point error happens or a
+    value isn't finite, the expression is evaluated for each sample by
+    calc.evaluator instead, so that the values, and the errors raised, are the
+    same as evaluator's.
+    """
+    if not var_dict_list or math_expr.strip() == "":
+        return [evaluator(var_dict, {}, math_expr, case_sensitive=case_sensitive) for var_dict in var_dict_list]
+
+    math_interpreter = _parse_formula(math_expr, case_sensitive)
+    samples = {name: numpy.array([var_dict[name] for var_dict in var_dict_list]) for name in var_dict_list[0]}
+    all_variables, all_functions = add_defaults(samples, {}, case_sensitive)
+    math_interpreter.check_variables(all_variables, all_functions)
+
+    casify = (lambda x: x) if case_sensitive else (lambda x: x.lower())
+    evaluate_actions = {
+        'number': eval_number,
+        'variable': lambda x: all_variables[casify(x[0])],
+        'function': lambda x: all_functions[casify(x[0])](x[1]),
+        'atom': _eval_atom,
+        'power': _eval_power,
+        'parallel': _eval_parallel,
+        'product': _eval_product,
+        'sum': _eval_sum,
+    }
+    try:
+        with numpy.errstate(all='raise', under='ignore'):
+            values = numpy.broadcast_to(math_interpreter.reduce_tree(evaluate_actions), (len(var_dict_list),))
+        if numpy.all(numpy.isfinite(values)):
+            return values.tolist()
+    except Exception:  # pylint: disable=broad-except
+        pass
+    return [evaluator(var_dict, {}, math_expr, case_sensitive=case_sensitive) for var_dict in var_dict_list]
+
+
 def contextualize_text(text, context):  # private
     """
     Takes a string with variables. E.g. $a+$b.
@@ -91,6 +91,61 @@ def randomization_bin(seed, problem_id):
     return int(r_hash.hexdigest()[:7], 16) % NUM_RANDOMIZATION_BINS
 
 
+def randomization_seeds(rerandomize):
+    """
+    Returns the seeds that choose_new_seed can choose for the learners of a
+    problem randomized with rerandomize, or None if there are too many of them
+    to compute anything for each seed.
+    """
+    if rerandomize == RANDOMIZATION.NEVER:
+        return [1]
+    elif rerandomize == RANDOMIZATION.PER_STUDENT:
+        return list(range(NUM_RANDOMIZATION_BINS))
+    return None
+
+
+def unmask_event(lcp, event_info):
+    """
+    Translates in-place the event_info of the LoncapaProblem to account for
+    masking and adds information about permutation options in force.
+    """
+    # answers is like: {u'i4x-Stanford-CS99-problem-dada976e76f34c24bc8415039dee1300_2_1': u'mask_0'}
+    # Each response values has an answer_id which matches the key in answers.
+    for response in lcp.responders.values():
+        # Un-mask choice names in event_info for masked responses.
+        if response.has_mask():
+            # We don't assume much about the structure of event_info,
+            # but check for the existence of the things we need to un-mask.
+
+            # Look for answers/id
+            answer = event_info.get('answers', {}).get(response.answer_id)
+            if answer is not None:
+                event_info['answers'][response.answer_id] = response.unmask_name(answer)
+
+            # Look for state/student_answers/id
+            answer = event_info.get('state', {}).get('student_answers', {}).get(response.answer_id)
+            if answer is not None:
+                event_info['state']['student_answers'][response.answer_id] = response.unmask_name(answer)
+
+            # Look for old_state/student_answers/id  -- parallel to the above case, happens on reset
+            answer = event_info.get('old_state', {}).get('student_answers', {}).get(response.answer_id)
+            if answer is not None:
+                event_info['old_state']['student_answers'][response.answer_id] = response.unmask_name(answer)
+
+        # Add 'permutation' to event_info for permuted responses.
+        permutation_option = None
+        if response.has_shuffle():
+            permutation_option = 'shuffle'
+        elif response.has_answerpool():
+            permutation_option = 'answerpool'
+
+        if permutation_option is not None:
+            # Add permutation record tuple: (one of:'shuffle'/'answerpool', [as-displayed list])
+            if 'permutation' not in event_info:
+                event_info['permutation'] = {}
+            event_info['permutation'][response.answer_id] = (permutation_option, response.unmask_order())
+
+
 class Randomization(String):
     """
     Define a field to store how to randomize a problem.
@@ -1353,41 +1408,7 @@ class CapaMixin(ScorableXBlockMixin, CapaFields):
         Translates in-place the event_info to account for masking
         and adds information about permutation options in force.
         """
-        # answers is like: {u'i4x-Stanford-CS99-problem-dada976e76f34c24bc8415039dee1300_2_1': u'mask_0'}
-        # Each response values has an answer_id which matches the key in answers.
-        for response in self.lcp.responders.values():
-            # Un-mask choice names in event_info for masked responses.
-            if response.has_mask():
-                # We don't assume much about the structure of event_info,
-                # but check for the existence of the things we need to un-mask.
-
-                # Look for answers/id
-                answer = event_info.get('answers', {}).get(response.answer_id)
-                if answer is not None:
-                    event_info['answers'][response.answer_id] = response.unmask_name(answer)
-
-                # Look for state/student_answers/id
-                answer = event_info.get('state', {}).get('student_answers', {}).get(response.answer_id)
-                if answer is not None:
-                    event_info['state']['student_answers'][response.answer_id] = response.unmask_name(answer)
-
-                # Look for old_state/student_answers/id  -- parallel to the above case, happens on reset
-                answer = event_info.get('old_state', {}).get('student_answers', {}).get(response.answer_id)
-                if answer is not None:
-                    event_info['old_state']['student_answers'][response.answer_id] = response.unmask_name(answer)
-
-            # Add 'permutation' to event_info for permuted responses.
-            permutation_option = None
-            if response.has_shuffle():
-                permutation_option = 'shuffle'
-            elif response.has_answerpool():
-                permutation_option = 'answerpool'
-
-            if permutation_option is not None:
-                # Add permutation record tuple: (one of:'shuffle'/'answerpool', [as-displayed list])
-                if 'permutation' not in event_info:
-                    event_info['permutation'] = {}
-                event_info['permutation'][response.answer_id] = (permutation_option, response.unmask_order())
+        unmask_event(self.lcp, event_info)
 
     def pretty_print_seconds(self, num_seconds):
         """
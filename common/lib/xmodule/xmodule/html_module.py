@@ -44,6 +44,7 @@ _ = lambda text: text
 
 @edxnotes
 @XBlock.needs("i18n")
+@XBlock.wants("fragment_cache")
 class HtmlBlock(
     XmlMixin, EditingMixin,
     XModuleDescriptorToXBlockMixin, XModuleToXBlockMixin, HTMLSnippet, ResourceTemplates, XModuleMixin,
@@ -90,7 +91,31 @@ class HtmlBlock(
         """
         Return a fragment that contains the html for the student view
         """
-        fragment = Fragment(self.get_html())
+        fragment_cache = self.runtime.service(self, 'fragment_cache')
+        if fragment_cache is None or not self.is_fragment_cacheable():
+            return self._student_view_fragment(self.get_html())
+
+        fragment = fragment_cache.get(self, 'student_view')
+        if fragment is None:
+            fragment = self._student_view_fragment(self.get_html())
+            fragment_cache.set(self, 'student_view', fragment)
+        else:
+            # rendering the html module counts as "progress", also when it is rendered from the cache
+            self.system.publish(self, 'progress', {})
+        return fragment
+
+    def is_fragment_cacheable(self):
+        """
+        Returns whether the student view of this block renders the same
+        fragment for every user, so that it can be shared between them.
+        """
+        return "%%USER_ID%%" not in (self.data or u"")
+
+    def _student_view_fragment(self, html):
+        """
+        Return the student view fragment for the given html.
+        """
+        fragment = Fragment(html)
         ## this line is a cutom change made during ironwood rebase
         fragment.add_javascript_url(settings.STATIC_URL + 'bundles/commons.js')
         add_webpack_to_fragment(fragment, 'HtmlBlockPreview')
@@ -463,6 +488,12 @@ class CourseInfoBlock(CourseInfoFields, HtmlBlock):
 
     template_dir_name = None
 
+    def is_fragment_cacheable(self):
+        """
+        Course info blocks render the course updates, and are not shared between users.
+        """
+        return False
+
     def get_html(self):
         """ Returns html required for rendering XModule. """
 
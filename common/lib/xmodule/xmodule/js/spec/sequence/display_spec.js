@@ -121,5 +121,107 @@
                 });
             });
         });
+
+        describe('Units loaded on demand', function() {
+            var cssResource = {mimetype: 'text/css', kind: 'text', data: '.unit-102 {}', placement: 'head'},
+                htmlResource = {mimetype: 'text/html', kind: 'text', data: '<meta name="unit-102">', placement: 'head'},
+                unitResponse = function(resources) {
+                    return {html: '<p class="unit-102">Unit 102</p>', resources: resources};
+                },
+                resolved = function(value) {
+                    return $.Deferred().resolve(value).promise();
+                },
+                rejected = function() {
+                    return $.Deferred().reject().promise();
+                };
+
+            beforeEach(function() {
+                loadFixtures('sequence.html');
+                $('#sequence_workflow').attr('data-position', 1);
+                $('#seq_content').after(
+                    '<div id="seq_contents_0" aria-labelledby="tab_0" class="seq_contents">' +
+                    '&lt;p class="unit-101"&gt;Unit 101&lt;/p&gt;</div>' +
+                    '<div id="seq_contents_1" aria-labelledby="tab_1" class="seq_contents" ' +
+                    'data-content-url="/xblock/unit-102"></div>'
+                );
+                window.loadedXBlockResources = [];
+                spyOn($, 'getJSON');
+                this.sequence = new Sequence($('.xblock-student_view-sequential'));
+                spyOn(this.sequence, 'loadResource').and.returnValue(resolved());
+                window.XBlock.initializeBlocks.calls.reset();
+            });
+
+            afterEach(function() {
+                delete window.loadedXBlockResources;
+            });
+
+            it('renders the unit rendered with the sequence without fetching it', function() {
+                expect($.getJSON).not.toHaveBeenCalled();
+                expect(this.sequence.content_container.find('.unit-101')).toExist();
+            });
+
+            it('fetches and renders a unit when it is first selected', function() {
+                $.getJSON.and.returnValue(resolved(unitResponse([['css-hash', cssResource]])));
+                this.sequence.render(2);
+
+                expect($.getJSON).toHaveBeenCalledWith('/xblock/unit-102');
+                expect(this.sequence.loadResource).toHaveBeenCalledWith(cssResource);
+                expect(window.loadedXBlockResources).toEqual(['css-hash']);
+                expect(this.sequence.content_container.find('.unit-102')).toExist();
+                expect(this.sequence.position).toBe(2);
+                expect(window.XBlock.initializeBlocks).toHaveBeenCalledWith(this.sequence.content_container, undefined);
+
+                // The fetched unit is reused when it is selected again.
+                this.sequence.render(1);
+                this.sequence.render(2);
+                expect($.getJSON.calls.count()).toBe(1);
+                expect(this.sequence.content_container.find('.unit-102')).toExist();
+            });
+
+            it('loads each resource only once', function() {
+                window.loadedXBlockResources = ['css-hash'];
+                $.getJSON.and.returnValue(resolved(unitResponse([
+                    ['css-hash', cssResource],
+                    ['html-hash', htmlResource],
+                    ['html-hash', htmlResource]
+                ])));
+                this.sequence.render(2);
+
+                expect(this.sequence.loadResource.calls.allArgs()).toEqual([[htmlResource]]);
+                expect(window.loadedXBlockResources).toEqual(['css-hash', 'html-hash']);
+                expect(this.sequence.content_container.find('.unit-102')).toExist();
+            });
+
+            it('shows an error and retries when the unit cannot be fetched', function() {
+                $.getJSON.and.returnValue(rejected());
+                this.sequence.render(2);
+
+                expect(this.sequence.content_container.find('.seq-content-error')).toExist();
+                expect(this.sequence.content_container.find('.unit-102')).not.toExist();
+                expect(this.sequence.position).toBe(2);
+                expect(window.XBlock.initializeBlocks).not.toHaveBeenCalled();
+
+                $.getJSON.and.returnValue(resolved(unitResponse([])));
+                this.sequence.content_container.find('.seq-content-retry').click();
+                expect($.getJSON.calls.count()).toBe(2);
+                expect(this.sequence.content_container.find('.seq-content-error')).not.toExist();
+                expect(this.sequence.content_container.find('.unit-102')).toExist();
+            });
+
+            it('does not record resources that fail to load', function() {
+                $.getJSON.and.returnValue(resolved(unitResponse([['css-hash', cssResource]])));
+                this.sequence.loadResource.and.returnValue(rejected());
+                this.sequence.render(2);
+
+                expect(window.loadedXBlockResources).toEqual([]);
+                expect(this.sequence.content_container.find('.seq-content-error')).toExist();
+
+                this.sequence.loadResource.and.returnValue(resolved());
+                this.sequence.content_container.find('.seq-content-retry').click();
+                expect(this.sequence.loadResource.calls.count()).toBe(2);
+                expect(window.loadedXBlockResources).toEqual(['css-hash']);
+                expect(this.sequence.content_container.find('.unit-102')).toExist();
+            });
+        });
     });
 }).call(this);
@@ -227,8 +227,7 @@
         };
 
         Sequence.prototype.render = function(newPosition) {
-            var bookmarked, currentTab, modxFullUrl, sequenceLinks,
-                self = this;
+            var modxFullUrl;
             if (this.position !== newPosition) {
                 if (this.position) {
                     this.mark_visited(this.position);
@@ -247,44 +246,168 @@
                 // Added for aborting video bufferization, see ../video/10_main.js
                 this.el.trigger('sequence:change');
                 this.mark_active(newPosition);
-                currentTab = this.contents.eq(newPosition - 1);
-                bookmarked = this.el.find('.active .bookmark-icon').hasClass('bookmarked');
-
-                // update the data-attributes with latest contents only for updated problems.
-                this.content_container
-                    .html(currentTab.text())  // xss-lint: disable=javascript-jquery-html
-                    .attr('aria-labelledby', currentTab.attr('aria-labelledby'))
-                    .data('bookmarked', bookmarked);
-
-
-                if (this.anyUpdatedProblems(newPosition)) {
-                    $.each(this.updatedProblems[newPosition], function(problemId, latestData) {
-                        var latestContent, latestResponse;
-                        latestContent = latestData[0];
-                        latestResponse = latestData[1];
-                        self.content_container
-                            .find("[data-problem-id='" + problemId + "']")
-                            .data('content', latestContent)
-                            .data('problem-score', latestResponse.current_score)
-                            .data('problem-total-possible', latestResponse.total_possible)
-                            .data('attempts-used', latestResponse.attempts_used);
+                this.showContent(newPosition);
+            }
+        };
+
+        Sequence.prototype.showContent = function(newPosition) {
+            var self = this;
+            this.pendingPosition = newPosition;
+            // Only show the content if no other tab was selected while it was loading.
+            this.loadContent(newPosition).done(function() {
+                if (self.pendingPosition === newPosition) {
+                    self.renderContent(newPosition);
+                }
+            }).fail(function() {
+                if (self.pendingPosition === newPosition) {
+                    self.renderLoadError(newPosition);
+                }
+            });
+        };
+
+        Sequence.prototype.renderLoadError = function(newPosition) {
+            var $retryButton = $('<button type="button" class="btn btn-link seq-content-retry"></button>'),
+                self = this;
+            $retryButton.text(gettext('Try again')).click(function() {
+                self.showContent(newPosition);
+            });
+            this.content_container
+                .empty()
+                .append(
+                    $('<div class="seq-content-error" role="alert"></div>')
+                        .text(gettext('There was an error loading this unit.') + ' ')
+                        .append($retryButton)
+                )
+                .attr('aria-labelledby', this.contents.eq(newPosition - 1).attr('aria-labelledby'));
+            this.position = newPosition;
+            this.toggleArrows();
+            this.sr_container.focus();
+        };
+
+        Sequence.prototype.renderContent = function(newPosition) {
+            var bookmarked, currentTab, requestToken, sequenceLinks,
+                self = this;
+            currentTab = this.contents.eq(newPosition - 1);
+            bookmarked = this.el.find('.active .bookmark-icon').hasClass('bookmarked');
+
+            // update the data-attributes with latest contents only for updated problems.
+            this.content_container
+                .html(currentTab.text())  // xss-lint: disable=javascript-jquery-html
+                .attr('aria-labelledby', currentTab.attr('aria-labelledby'))
+                .data('bookmarked', bookmarked);
+
+
+            if (this.anyUpdatedProblems(newPosition)) {
+                $.each(this.updatedProblems[newPosition], function(problemId, latestData) {
+                    var latestContent, latestResponse;
+                    latestContent = latestData[0];
+                    latestResponse = latestData[1];
+                    self.content_container
+                        .find("[data-problem-id='" + problemId + "']")
+                        .data('content', latestContent)
+                        .data('problem-score', latestResponse.current_score)
+                        .data('problem-total-possible', latestResponse.total_possible)
+                        .data('attempts-used', latestResponse.attempts_used);
+                });
+            }
+            // Units loaded on demand were rendered in their own request, so they
+            // are initialized with the request tokens rendered on the blocks themselves.
+            requestToken = currentTab.data('content-url') ? undefined : this.requestToken;
+            XBlock.initializeBlocks(this.content_container, requestToken);
+
+            // For embedded circuit simulator exercises in 6.002x
+            if (window.hasOwnProperty('update_schematics')) {
+                window.update_schematics();
+            }
+            this.position = newPosition;
+            this.toggleArrows();
+            this.hookUpContentStateChangeEvent();
+            this.updatePageTitle();
+            sequenceLinks = this.content_container.find('a.seqnav');
+            sequenceLinks.click(this.goto);
+
+            this.sr_container.focus();
+        };
+
+        /**
+         * Fetches the content of the unit at the given position if it was not
+         * rendered with the sequence, along with the JavaScript and CSS it
+         * depends upon.  Returns a promise that is resolved once the content
+         * is available, or rejected if it could not be loaded, in which case
+         * it is fetched again the next time.
+         */
+        Sequence.prototype.loadContent = function(position) {
+            var currentTab = this.contents.eq(position - 1),
+                contentUrl = currentTab.data('content-url'),
+                self = this;
+            if (!contentUrl || currentTab.data('content-loaded')) {
+                return $.Deferred().resolve().promise();
+            }
+            return $.getJSON(contentUrl).then(function(response) {
+                return self.addFragmentResources(response.resources).then(function() {
+                    currentTab.text(response.html).data('content-loaded', true);
+                });
+            });
+        };
+
+        /**
+         * Loads the [hash, resource] pairs returned by the xblock_view endpoint
+         * in order, skipping the ones already loaded into the page.  A resource
+         * is only recorded as loaded once it has loaded successfully.
+         */
+        Sequence.prototype.addFragmentResources = function(resources) {
+            var deferred = $.Deferred(),
+                self = this,
+                applyResource;
+
+            window.loadedXBlockResources = window.loadedXBlockResources || [];
+            applyResource = function(index) {
+                var hash;
+                if (index >= resources.length) {
+                    deferred.resolve();
+                    return;
+                }
+                hash = resources[index][0];
+                if (_.indexOf(window.loadedXBlockResources, hash) < 0) {
+                    self.loadResource(resources[index][1]).done(function() {
+                        window.loadedXBlockResources.push(hash);
+                        applyResource(index + 1);
+                    }).fail(function() {
+                        deferred.reject();
                     });
+                } else {
+                    applyResource(index + 1);
                 }
-                XBlock.initializeBlocks(this.content_container, this.requestToken);
+            };
+            applyResource(0);
+            return deferred.promise();
+        };
 
-                // For embedded circuit simulator exercises in 6.002x
-                if (window.hasOwnProperty('update_schematics')) {
-                    window.update_schematics();
+        Sequence.prototype.loadResource = function(resource) {
+            // We give XBlock fragments free-reign to add javascript and CSS to
+            // to the page, so XSS escaping doesn't matter much in this context
+            var $head = $('head');
+            if (resource.mimetype === 'text/css') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<style type='text/css'>" + resource.data + '</style>');
+                } else if (resource.kind === 'url') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<link rel='stylesheet' href='" + resource.data + "' type='text/css'>");
+                }
+            } else if (resource.mimetype === 'application/javascript') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append('<script>' + resource.data + '</script>');
+                } else if (resource.kind === 'url') {
+                    return $.ajax({url: resource.data, dataType: 'script', cache: true}).promise();
                 }
-                this.position = newPosition;
-                this.toggleArrows();
-                this.hookUpContentStateChangeEvent();
-                this.updatePageTitle();
-                sequenceLinks = this.content_container.find('a.seqnav');
-                sequenceLinks.click(this.goto);
-
-                this.sr_container.focus();
+            } else if (resource.mimetype === 'text/html' && resource.placement === 'head') {
+                // xss-lint: disable=javascript-jquery-append
+                $head.append(resource.data);
             }
+            // Return an already resolved promise for synchronous updates
+            return $.Deferred().resolve().promise();
         };
 
         Sequence.prototype.goto = function(event) {
@@ -425,6 +425,8 @@ class BlockData(object):
     def __init__(self, **kwargs):
         # Has the definition been loaded?
         self.definition_loaded = False
+        # Names of the fields left out of the definition, if it was partially loaded
+        self.excluded_definition_fields = None
         self.from_storable(kwargs)
 
     def to_storable(self):
@@ -612,6 +612,21 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except NotImplementedError:
             return None, None
 
+    @strip_key
+    def get_blocks_changed_since(self, course_key, version_guid, **kwargs):  # pylint: disable=unused-argument
+        """
+        Returns the usage keys of the blocks that were added, removed or
+        modified in the course since the structure with the given version_guid.
+
+        Returns None if the course's modulestore doesn't track versions or the
+        given version is not found.
+        """
+        try:
+            store = self._verify_modulestore_support(course_key, 'get_blocks_changed_since')
+            return store.get_blocks_changed_since(course_key, version_guid)
+        except NotImplementedError:
+            return None
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given course_id.
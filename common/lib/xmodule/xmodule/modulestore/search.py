@@ -92,36 +92,58 @@ def path_to_location(modulestore, usage_key, request=None, full_path=False):
         if full_path:
             return path
 
-        n = len(path)
-        course_id = path[0].course_key
-        # pull out the location names
-        chapter = path[1].block_id if n > 1 else None
-        section = path[2].block_id if n > 2 else None
-        vertical = path[3].block_id if n > 3 else None
-        # Figure out the position
-        position = None
-
-        # This block of code will find the position of a module within a nested tree
-        # of modules. If a problem is on tab 2 of a sequence that's on tab 3 of a
-        # sequence, the resulting position is 3_2. However, no positional modules
-        # (e.g. sequential and videosequence) currently deal with this form of
-        # representing nested positions. This needs to happen before jumping to a
-        # module nested in more than one positional module will work.
-
-        if n > 3:
-            position_list = []
-            for path_index in range(2, n - 1):
-                category = path[path_index].block_type
-                if category == 'sequential' or category == 'videosequence':
-                    section_desc = modulestore.get_item(path[path_index])
-                    # this calls get_children rather than just children b/c old mongo includes private children
-                    # in children but not in get_children
-                    child_locs = get_child_locations(section_desc, request, course_id)
-                    # positions are 1-indexed, and should be strings to be consistent with
-                    # url parsing.
-                    if path[path_index + 1] in child_locs:
-                        position_list.append(str(child_locs.index(path[path_index + 1]) + 1))
-            position = "_".join(position_list)
+        def get_position(section_key, child_key):
+            """
+            Returns the position of child_key in the section, or None if it isn't shown.
+            """
+            section_desc = modulestore.get_item(section_key)
+            # this calls get_children rather than just children b/c old mongo includes private children
+            # in children but not in get_children
+            child_locs = get_child_locations(section_desc, request, section_key.course_key)
+            # positions are 1-indexed, and should be strings to be consistent with
+            # url parsing.
+            if child_key in child_locs:
+                return str(child_locs.index(child_key) + 1)
+            return None
+
+        return location_from_path(path, get_position)
+
+
+def location_from_path(path, get_position):
+    """
+    Returns the tuple returned by path_to_location for the given path.
+
+    Args:
+        path: the list of keys from the course root to the location
+        get_position: a function that returns the 1-indexed position, as a string, of the
+            given child (the second argument) within the given positional module (the first
+            argument), or None if the child isn't shown in it
+    """
+    n = len(path)
+    course_id = path[0].course_key
+    # pull out the location names
+    chapter = path[1].block_id if n > 1 else None
+    section = path[2].block_id if n > 2 else None
+    vertical = path[3].block_id if n > 3 else None
+    # Figure out the position
+    position = None
+
+    # This block of code will find the position of a module within a nested tree
+    # of modules. If a problem is on tab 2 of a sequence that's on tab 3 of a
+    # sequence, the resulting position is 3_2. However, no positional modules
+    # (e.g. sequential and videosequence) currently deal with this form of
+    # representing nested positions. This needs to happen before jumping to a
+    # module nested in more than one positional module will work.
+
+    if n > 3:
+        position_list = []
+        for path_index in range(2, n - 1):
+            category = path[path_index].block_type
+            if category == 'sequential' or category == 'videosequence':
+                child_position = get_position(path[path_index], path[path_index + 1])
+                if child_position is not None:
+                    position_list.append(child_position)
+        position = "_".join(position_list)
 
     return (course_id, chapter, section, vertical, position, path[-1])
 
@@ -131,27 +153,13 @@ def get_child_locations(section_desc, request, course_id):
     Returns all child locations for a section. If user is learner or masquerading as learner,
     staff only blocks are excluded.
     """
-    is_staff_user = GlobalStaff().has_user(request.user) if request else False
-
-    def is_masquerading_as_student():
-        """
-        Return True if user is masquerading as learner.
-        """
-        masquerade_settings = request.session.get(MASQUERADE_SETTINGS_KEY, {})
-        course_info = masquerade_settings.get(course_id)
-        return masquerade_settings and course_info and getattr(course_info, 'role', '') == 'student'
-
-    def is_user_staff_and_not_masquerading_learner():
-        """
-        Return True if user is staff and not masquerading as learner.
-        """
-        return is_staff_user and not is_masquerading_as_student()
+    include_staff_only = includes_staff_only_children(request, course_id)
 
     def is_child_appendable(child_instance):
         """
         Return True if child is appendable based on request and request's user type.
         """
-        return (request and is_user_staff_and_not_masquerading_learner()) or not child_instance.visible_to_staff_only
+        return include_staff_only or not child_instance.visible_to_staff_only
 
     child_locs = []
     for child in section_desc.get_children():
@@ -161,6 +169,28 @@ def get_child_locations(section_desc, request, course_id):
     return child_locs
 
 
+def includes_staff_only_children(request, course_id):
+    """
+    Returns whether the children of a section that are visible to staff only count
+    towards positions within it, which they do for staff users who aren't
+    masquerading as learners.
+    """
+    if not request:
+        return False
+
+    is_staff_user = GlobalStaff().has_user(request.user)
+
+    def is_masquerading_as_student():
+        """
+        Return True if user is masquerading as learner.
+        """
+        masquerade_settings = request.session.get(MASQUERADE_SETTINGS_KEY, {})
+        course_info = masquerade_settings.get(course_id)
+        return masquerade_settings and course_info and getattr(course_info, 'role', '') == 'student'
+
+    return bool(is_staff_user and not is_masquerading_as_student())
+
+
 def navigation_index(position):
     """
     Get the navigation index from the position argument (where the position argument was received from a call to
@@ -85,6 +85,9 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.module_data = module_data
         self.default_class = default_class
         self.local_modules = {}
+        # definitions fetched by the blocks' DefinitionLazyLoaders, by the
+        # fields fetched (None for all of them) and then by id
+        self._fetched_definitions = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
 
     @lazy
@@ -144,6 +147,44 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.modulestore.cache_block(course_key, version_guid, block_key, block)
         return block
 
+    def fetch_definition(self, course_key, block_key, definition_id, fields=None):
+        """
+        Return the definition with the given id, of the block with the given
+        block_key, or None if it doesn't exist. If fields is given, only those
+        of the definition's fields are fetched.
+
+        Blocks are usually accessed along with their siblings (e.g. when
+        rendering a unit), so the not yet loaded definitions of the block's
+        siblings are fetched in the same query.
+
+        Fields that were left out when partially loading definitions (e.g. the
+        data of all of a course's blocks, to collect its block structure) are
+        usually then read for every block of a type or none, so they're
+        fetched for all the partially loaded blocks of the block's type.
+        """
+        fetched_definitions = self._fetched_definitions.setdefault(fields, {})
+        if definition_id not in fetched_definitions:
+            definition_ids = {definition_id}
+            blocks = self.course_entry.structure['blocks']
+            if fields is None:
+                parent_key = self._parent_map.get(block_key)
+                candidate_keys = [
+                    BlockKey(*sibling_key) for sibling_key in blocks[parent_key].fields.get('children', [])
+                ] if parent_key in blocks else []
+            else:
+                candidate_keys = [other_key for other_key in blocks if other_key.type == block_key.type]
+            for candidate_key in candidate_keys:
+                candidate = blocks.get(candidate_key)
+                if (
+                    candidate is not None and candidate.definition is not None and not candidate.definition_loaded and
+                    getattr(candidate, 'excluded_definition_fields', None) == fields
+                ):
+                    definition_ids.add(candidate.definition)
+            definition_ids.difference_update(fetched_definitions)
+            for definition in self.modulestore.get_definitions(course_key, list(definition_ids), fields=fields):
+                fetched_definitions[definition['_id']] = definition
+        return fetched_definitions.get(definition_id)
+
     @contract(block_key=BlockKey, course_key="CourseLocator | LibraryLocator")
     def get_module_data(self, block_key, course_key):
         """
@@ -201,6 +242,9 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 block_key.type,
                 definition_id,
                 convert_fields,
+                runtime=self,
+                block_key=block_key,
+                fields=getattr(block_data, 'excluded_definition_fields', None),
             )
         else:
             definition_loader = None
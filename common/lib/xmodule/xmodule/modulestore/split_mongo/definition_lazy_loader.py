@@ -12,16 +12,25 @@ class DefinitionLazyLoader(object):
     object doesn't force access during init but waits until client wants the
     definition. Only works if the modulestore is a split mongo store.
     """
-    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter):
+    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter, runtime=None,
+                 block_key=None, fields=None):
         """
         Simple placeholder for yet-to-be-fetched data
         :param modulestore: the pymongo db connection with the definitions
         :param definition_locator: the id of the record in the above to fetch
+        :param runtime: the CachingDescriptorSystem of the block, if it's to fetch
+            the definition along with those of the block's siblings
+        :param block_key: the BlockKey of the block whose definition this is
+        :param fields: the names of the only fields to fetch, if the others were
+            already loaded
         """
         self.modulestore = modulestore
         self.course_key = course_key
         self.definition_locator = DefinitionLocator(block_type, definition_id)
         self.field_converter = field_converter
+        self.runtime = runtime
+        self.block_key = block_key
+        self.fields = fields
 
     def fetch(self):
         """
@@ -31,5 +40,10 @@ class DefinitionLazyLoader(object):
         # get_definition may return a cached value perhaps from another course or code path
         # so, we copy the result here so that updates don't cross-pollinate nor change the cached
         # value in such a way that we can't tell that the definition's been updated.
-        definition = self.modulestore.get_definition(self.course_key, self.definition_locator.definition_id)
+        if self.runtime is not None:
+            definition = self.runtime.fetch_definition(
+                self.course_key, self.block_key, self.definition_locator.definition_id, self.fields
+            )
+        else:
+            definition = self.modulestore.get_definition(self.course_key, self.definition_locator.definition_id)
         return copy.deepcopy(definition)
@@ -7,7 +7,9 @@ import datetime
 import logging
 import math
 import re
+import threading
 import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -26,11 +28,17 @@ from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
     DJANGO_AVAILABLE = False
 
+try:
+    from edx_django_utils.monitoring import set_custom_metric
+except ImportError:
+    set_custom_metric = None
+
 new_contract('BlockData', BlockData)
 log = logging.getLogger(__name__)
 
@@ -204,6 +212,123 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class PickledLRUCache(object):
+    """
+    A bounded, in-process LRU cache of pickled values.
+
+    It is meant for values that are keyed by an immutable id, such as course
+    structures and definitions, so an entry never goes stale. Entries are kept
+    pickled, and each get unpickles a new copy of the value: split modulestore
+    edits the data it loads in place (see ``cache_items``), so it can't be
+    shared between requests or threads.
+
+    Since each hit still pays for a full ``pickle.loads``, the cache only saves
+    the round trip to the shared cache (or Mongo) and the decompression.
+
+    The cache is capped by the size of its pickled entries in bytes, and counts
+    its hits, misses and evictions.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Return a new copy of the value stored for ``key``, or None if it isn't
+        cached.
+        """
+        with self._lock:
+            pickled_data = self._entries.get(key)
+            if pickled_data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        if six.PY2:
+            return pickle.loads(pickled_data)
+        return pickle.loads(pickled_data, encoding='latin-1')
+
+    def set(self, key, pickled_data):
+        """
+        Store the ``pickled_data`` of a value under ``key``, evicting the least
+        recently used entries until the cache fits within ``max_bytes``.
+
+        Values that are larger than the whole cache are not stored.
+        """
+        if len(pickled_data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[key] = pickled_data
+            self.current_bytes += len(pickled_data)
+            while self.current_bytes > self.max_bytes:
+                __, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+# dict(setting name, (max_bytes, PickledLRUCache))
+_PROCESS_CACHES = {}
+
+
+def _get_process_cache(setting_name):
+    """
+    Return the process-wide :class:`PickledLRUCache` sized by the given
+    setting, or None if the setting is not a positive number of bytes.
+    """
+    if not DJANGO_AVAILABLE:
+        return None
+    max_bytes = getattr(settings, setting_name, 0)
+    if not max_bytes:
+        return None
+    if setting_name not in _PROCESS_CACHES or _PROCESS_CACHES[setting_name][0] != max_bytes:
+        _PROCESS_CACHES[setting_name] = (max_bytes, PickledLRUCache(max_bytes))
+    return _PROCESS_CACHES[setting_name][1]
+
+
+def get_process_structure_cache():
+    """
+    Return the process-wide :class:`PickledLRUCache` of course structures, or
+    None if it is disabled.
+
+    The cache is enabled by setting ``COURSE_STRUCTURE_PROCESS_CACHE_MAX_BYTES``
+    to a positive number of bytes.
+    """
+    return _get_process_cache('COURSE_STRUCTURE_PROCESS_CACHE_MAX_BYTES')
+
+
+def get_process_definition_cache():
+    """
+    Return the process-wide cache of the definitions loaded by split modulestore
+    (see ``SplitBulkWriteMixin.get_definitions``), or None if it is disabled.
+
+    The cache is enabled by setting ``COURSE_DEFINITION_PROCESS_CACHE_MAX_BYTES``
+    to a positive number of bytes.
+    """
+    return _get_process_cache('COURSE_DEFINITION_PROCESS_CACHE_MAX_BYTES')
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
@@ -211,6 +336,11 @@ class CourseStructureCache(object):
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
+
+    If the process-level :class:`PickledLRUCache` is enabled, it is consulted
+    before the django cache, which saves fetching and decompressing the same
+    structure on every request. Its hits, misses and evictions are reported as
+    custom metrics.
     """
     def __init__(self):
         self.cache = None
@@ -219,9 +349,16 @@ class CourseStructureCache(object):
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+        self.process_cache = get_process_structure_cache()
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
+        if self.process_cache is not None:
+            structure = self.process_cache.get(key)
+            self._report_process_cache_metrics(hit=structure is not None)
+            if structure is not None:
+                return structure
+
         if self.cache is None:
             return None
 
@@ -241,24 +378,47 @@ class CourseStructureCache(object):
                 tagger.measure('uncompressed_size', len(pickled_data))
 
                 if six.PY2:
-                    return pickle.loads(pickled_data)
+                    structure = pickle.loads(pickled_data)
                 else:
-                    return pickle.loads(pickled_data, encoding='latin-1')
+                    structure = pickle.loads(pickled_data, encoding='latin-1')
+
+                if self.process_cache is not None:
+                    self.process_cache.set(key, pickled_data)
+                return structure
             except Exception:
                 # The cached data is corrupt in some way, get rid of it.
                 log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
                 self.cache.delete(key)
                 return None
 
+    def _report_process_cache_metrics(self, hit):
+        """
+        Report whether the structure was found in the process cache, and the
+        process cache's counters so far.
+        """
+        if set_custom_metric is None:
+            return
+        set_custom_metric('course_structure_process_cache_hit', hit)
+        set_custom_metric('course_structure_process_cache_hits', self.process_cache.hits)
+        set_custom_metric('course_structure_process_cache_misses', self.process_cache.misses)
+        set_custom_metric('course_structure_process_cache_evictions', self.process_cache.evictions)
+        set_custom_metric('course_structure_process_cache_bytes', self.process_cache.current_bytes)
+
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
-        if self.cache is None:
+        if self.cache is None and self.process_cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
             pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
             tagger.measure('uncompressed_size', len(pickled_data))
 
+            if self.process_cache is not None:
+                self.process_cache.set(key, pickled_data)
+
+            if self.cache is None:
+                return None
+
             # 1 = Fastest (slightly larger results)
             compressed_pickled_data = zlib.compress(pickled_data, 1)
             tagger.measure('compressed_size', len(compressed_pickled_data))
@@ -550,13 +710,25 @@ class MongoConnection(object):
             tagger.tag(block_type=definition['block_type'])
             return definition
 
-    def get_definitions(self, definitions, course_context=None):
+    def get_definitions(self, definitions, course_context=None, fields=None, exclude_fields=None):
         """
-        Retrieve all definitions listed in `definitions`.
+        Retrieve all definitions listed in `definitions`. If `fields` is given, only
+        those of the definitions' fields are retrieved; any of the definitions' fields
+        named in `exclude_fields` are left out.
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
+            if fields is not None:
+                projection = {'fields.' + field_name: 1 for field_name in fields}
+            elif exclude_fields:
+                projection = {'fields.' + field_name: 0 for field_name in exclude_fields}
+            else:
+                return self.definitions.find({'_id': {'$in': definitions}})
+
+            definitions = list(self.definitions.find({'_id': {'$in': definitions}}, projection))
+            for definition in definitions:
+                # a definition has no fields left if it has none of the projected ones
+                definition.setdefault('fields', {})
             return definitions
 
     def insert_definition(self, definition, course_context=None):
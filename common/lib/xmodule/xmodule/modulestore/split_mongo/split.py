@@ -78,6 +78,7 @@ from opaque_keys.edx.locator import (
 )
 from path import Path as path
 from pytz import UTC
+from six.moves import cPickle as pickle
 from xblock.core import XBlock
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict, Scope
 
@@ -104,7 +105,11 @@ from xmodule.modulestore.exceptions import (
     VersionConflictError
 )
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
-from xmodule.modulestore.split_mongo.mongo_connection import DuplicateKeyError, MongoConnection
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    DuplicateKeyError,
+    MongoConnection,
+    get_process_definition_cache
+)
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
 
@@ -426,7 +431,7 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             definition_guid = course_key.as_object_id(definition_guid)
             return self.db_connection.get_definition(definition_guid, course_key)
 
-    def get_definitions(self, course_key, ids):
+    def get_definitions(self, course_key, ids, fields=None, exclude_fields=None):
         """
         Return all definitions that specified in ``ids``.
 
@@ -437,6 +442,11 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             course_key (:class:`.CourseKey`): The course that these definitions are being loaded
                 for (to respect bulk operations).
             ids (list): A list of definition ids
+            fields (list): Names of the only definition fields that the caller needs, if given
+            exclude_fields (list): Names of definition fields that the caller doesn't need
+
+        Definitions loaded from the database are left without the fields the caller doesn't
+        need, and are then not cached. Cached definitions are always complete.
         """
         definitions = []
         ids = set(ids)
@@ -450,13 +460,30 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
                     ids.remove(definition_id)
                     definitions.append(definition)
 
+        process_cache = get_process_definition_cache()
+        if len(ids) and process_cache is not None:
+            # Saved definitions never change, so they can be shared between requests.
+            for definition_id in list(ids):
+                definition = process_cache.get(definition_id)
+                if definition is not None:
+                    ids.remove(definition_id)
+                    definitions.append(definition)
+                    bulk_write_record.definitions_in_db.add(definition_id)
+                    bulk_write_record.definitions[definition_id] = definition
+
         if len(ids):
             # Query the db for the definitions.
-            defs_from_db = list(self.db_connection.get_definitions(list(ids), course_key))
-            defs_dict = {d.get('_id'): d for d in defs_from_db}
-            # Add the retrieved definitions to the cache.
-            bulk_write_record.definitions_in_db.update(six.iterkeys(defs_dict))
-            bulk_write_record.definitions.update(defs_dict)
+            defs_from_db = list(self.db_connection.get_definitions(
+                list(ids), course_key, fields=fields, exclude_fields=exclude_fields,
+            ))
+            # Add the retrieved definitions to the cache, unless they're incomplete.
+            if fields is None and not exclude_fields:
+                defs_dict = {d.get('_id'): d for d in defs_from_db}
+                bulk_write_record.definitions_in_db.update(six.iterkeys(defs_dict))
+                bulk_write_record.definitions.update(defs_dict)
+                if process_cache is not None:
+                    for definition_id, definition in six.iteritems(defs_dict):
+                        process_cache.set(definition_id, pickle.dumps(definition, pickle.HIGHEST_PROTOCOL))
             definitions.extend(defs_from_db)
         return definitions
 
@@ -769,7 +796,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         self.db_connection._drop_database(database, collections, connections)  # pylint: disable=protected-access
 
-    def cache_items(self, system, base_block_ids, course_key, depth=0, lazy=True):
+    def cache_items(self, system, base_block_ids, course_key, depth=0, lazy=True, exclude_definition_fields=None):
         """
         Handles caching of items once inheritance and any other one time
         per course per fetch operations are done.
@@ -780,7 +807,10 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             course_key: the destination course providing the context
             depth: how deep below these to prefetch
             lazy: whether to load definitions now or later
+            exclude_definition_fields: names of definition fields (such as 'data') to leave
+                out when loading definitions now; they're loaded later if accessed
         """
+        exclude_definition_fields = tuple(exclude_definition_fields) if exclude_definition_fields else None
         with self.bulk_operations(course_key, emit_signals=False):
             new_module_data = {}
             for block_id in base_block_ids:
@@ -795,23 +825,32 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             # until they're actually needed.
             if not lazy:
                 # Non-lazy loading: Load all descendants by id.
+                blocks_to_load = [
+                    block
+                    for block in six.itervalues(new_module_data)
+                    if not block.definition_loaded and (
+                        exclude_definition_fields is None or
+                        getattr(block, 'excluded_definition_fields', None) != exclude_definition_fields
+                    )
+                ]
                 descendent_definitions = self.get_definitions(
                     course_key,
-                    [
-                        block.definition
-                        for block in six.itervalues(new_module_data)
-                    ]
+                    [block.definition for block in blocks_to_load],
+                    exclude_fields=exclude_definition_fields,
                 )
                 # Turn definitions into a map.
                 definitions = {definition['_id']: definition
                                for definition in descendent_definitions}
 
-                for block in six.itervalues(new_module_data):
+                for block in blocks_to_load:
                     if block.definition in definitions:
                         definition = definitions[block.definition]
                         # convert_fields gets done later in the runtime's xblock_from_json
                         block.fields.update(definition.get('fields'))
-                        block.definition_loaded = True
+                        # Partially loaded definitions are completed on access
+                        # by the runtime's DefinitionLazyLoader.
+                        block.definition_loaded = exclude_definition_fields is None
+                        block.excluded_definition_fields = exclude_definition_fields
 
             system.module_data.update(new_module_data)
             return system.module_data
@@ -823,8 +862,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         Load the definitions into each block if lazy is in kwargs and is False;
         otherwise, do not load the definitions - they'll be loaded later when needed.
+        Any definition fields named in the exclude_definition_fields kwarg are left
+        out when loading definitions, and loaded later if needed.
         """
         lazy = kwargs.pop('lazy', True)
+        exclude_definition_fields = kwargs.pop('exclude_definition_fields', None)
         should_cache_items = not lazy
 
         runtime = self._get_cache(course_entry.structure['_id'])
@@ -834,7 +876,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             should_cache_items = True
 
         if should_cache_items:
-            self.cache_items(runtime, block_keys, course_entry.course_key, depth, lazy)
+            self.cache_items(runtime, block_keys, course_entry.course_key, depth, lazy, exclude_definition_fields)
 
         with self.bulk_operations(course_entry.course_key, emit_signals=False):
             return [runtime.load_item(block_key, course_entry, **kwargs) for block_key in block_keys]
@@ -1260,6 +1302,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 if present in the course.
                 False - if we want only those items which are in the course tree. This would ensure no orphans are
                 fetched.
+            kwargs: passed on to load the matching items; e.g. lazy=False together with
+                exclude_definition_fields=['data'] loads all of their definitions but their data.
         """
         if not isinstance(course_locator, CourseKey) or course_locator.deprecated:
             # The supplied courselike key is of the wrong type, so it can't possibly be stored in this modulestore.
@@ -1268,18 +1312,34 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         course = self._lookup_course(course_locator)
         items = []
         qualifiers = qualifiers.copy() if qualifiers else {}  # copy the qualifiers (destructively manipulated here)
+        content_definitions = {}
+
+        def _block_matches_settings(block_data):
+            """
+            Check that the block matches the criteria which don't require loading any additional data
+            """
+            return self._block_matches(block_data, qualifiers) and self._block_matches(block_data.fields, settings)
 
         def _block_matches_all(block_data):
             """
             Check that the block matches all the criteria
             """
             # do the checks which don't require loading any additional data
-            if (  # pylint: disable=bad-continuation
-                self._block_matches(block_data, qualifiers) and
-                self._block_matches(block_data.fields, settings)
-            ):
+            if _block_matches_settings(block_data):
                 if content:
-                    definition_block = self.get_definition(course_locator, block_data.definition)
+                    if not content_definitions:
+                        # load the content fields to match of all of the candidate blocks at once
+                        content_definitions.update(
+                            (definition['_id'], definition)
+                            for definition in self.get_definitions(course_locator, [
+                                block.definition
+                                for block in six.itervalues(course.structure['blocks'])
+                                if block.definition is not None and _block_matches_settings(block)
+                            ], fields=list(content))
+                        )
+                    definition_block = content_definitions.get(block_data.definition)
+                    if definition_block is None:
+                        definition_block = self.get_definition(course_locator, block_data.definition)
                     return self._block_matches(definition_block['fields'], content)
                 else:
                     return True
@@ -1624,6 +1684,40 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             return usage_key, block.edit_info.original_usage_version
         return None, None
 
+    def get_blocks_changed_since(self, course_key, version_guid):
+        """
+        Returns the usage keys of the blocks that were added, removed or
+        modified in the course's current structure since the structure with
+        the given version_guid. A block whose children changed is considered
+        modified.
+
+        Returns None if the structure with the given version_guid is not found.
+        """
+        course_key = course_key.for_version(None) if course_key.version_guid else course_key
+        current_blocks = self._lookup_course(course_key).structure['blocks']
+        previous_structure = self.get_structure(course_key, course_key.as_object_id(version_guid))
+        if previous_structure is None:
+            return None
+        previous_blocks = previous_structure['blocks']
+
+        changed_block_keys = set(current_blocks).symmetric_difference(previous_blocks)
+        for block_key, block_data in six.iteritems(current_blocks):
+            previous_block_data = previous_blocks.get(block_key)
+            if previous_block_data is None or previous_block_data is block_data:
+                continue
+            if (
+                    block_data.definition != previous_block_data.definition or
+                    block_data.fields != previous_block_data.fields or
+                    block_data.defaults != previous_block_data.defaults or
+                    block_data.get_asides() != previous_block_data.get_asides()
+            ):
+                changed_block_keys.add(block_key)
+
+        return [
+            course_key.make_usage_key(block_key.type, block_key.id)
+            for block_key in changed_block_keys
+        ]
+
     def create_definition_from_data(self, course_key, new_def_data, category, user_id):
         """
         Pull the definition fields out of descriptor and save to the db as a new definition
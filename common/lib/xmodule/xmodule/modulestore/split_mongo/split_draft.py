@@ -308,6 +308,14 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         location = self._map_revision_to_branch(location, revision=revision)
         return super(DraftVersioningModuleStore, self).get_parent_location(location, **kwargs)
 
+    def get_blocks_changed_since(self, course_key, version_guid):
+        """
+        Returns the usage keys of the blocks that were added, removed or
+        modified in the course since the structure with the given version_guid.
+        """
+        course_key = self._map_revision_to_branch(course_key)
+        return super(DraftVersioningModuleStore, self).get_blocks_changed_since(course_key, version_guid)
+
     def get_block_original_usage(self, usage_key):
         """
         If a block was inherited into another structure using copy_from_template,
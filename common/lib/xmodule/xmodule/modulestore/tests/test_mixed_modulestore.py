@@ -607,6 +607,40 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
         component = self.store.publish(component.location, self.user_id)
         self.assertFalse(self.store.has_changes(component))
 
+    def test_get_blocks_changed_since(self):
+        """
+        Tests that get_blocks_changed_since() returns the blocks that were
+        added, modified or removed since the given published version.
+        """
+        self.initdb(ModuleStoreEnum.Type.split)
+        test_course = self.store.create_course('testx', 'GreekHero', 'test_run', self.user_id)
+        chapter = self.store.create_child(self.user_id, test_course.location, 'chapter', block_id='chapter')
+        sequential = self.store.create_child(self.user_id, chapter.location, 'sequential', block_id='sequential')
+        other_chapter = self.store.create_child(self.user_id, test_course.location, 'chapter', block_id='other')
+        self.store.publish(test_course.location, self.user_id)
+
+        with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, test_course.id):
+            previous_version = self.store.get_course(test_course.id).course_version
+            self.assertEqual(self.store.get_blocks_changed_since(test_course.id, previous_version), [])
+
+        sequential.display_name = 'Changed Display Name'
+        self.store.update_item(sequential, self.user_id)
+        vertical = self.store.create_child(self.user_id, sequential.location, 'vertical', block_id='vertical')
+        self.store.delete_item(other_chapter.location, self.user_id)
+        self.store.publish(test_course.location, self.user_id)
+
+        with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, test_course.id):
+            changed_block_keys = self.store.get_blocks_changed_since(test_course.id, previous_version)
+        self.assertEqual(
+            set(changed_block_keys),
+            {test_course.location, sequential.location, vertical.location, other_chapter.location},
+        )
+
+    def test_get_blocks_changed_since_old_mongo(self):
+        self.initdb(ModuleStoreEnum.Type.mongo)
+        test_course = self.store.create_course('testx', 'GreekHero', 'test_run', self.user_id)
+        self.assertIsNone(self.store.get_blocks_changed_since(test_course.id, 'version'))
+
     @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
     def test_unit_stuck_in_draft_mode(self, default_ms):
         """
@@ -36,6 +36,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import PickledLRUCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -1013,6 +1014,56 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.set_custom_metric')
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_process_structure_cache')
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_process_structure_cache(self, mock_get_cache, mock_get_process_cache, mock_set_custom_metric):
+        mock_get_cache.side_effect = InvalidCacheBackendError
+        process_cache = PickledLRUCache(max_bytes=10 * 1024 * 1024)
+        mock_get_process_cache.return_value = process_cache
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # the structure is served from the process cache without hitting mongo
+        # or the django cache
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+
+        self.assertEqual(cached_structure, not_cached_structure)
+        self.assertEqual(len(process_cache), 1)
+        self.assertEqual((process_cache.hits, process_cache.misses), (1, 1))
+        mock_set_custom_metric.assert_any_call('course_structure_process_cache_hit', True)
+        mock_set_custom_metric.assert_any_call('course_structure_process_cache_hits', 1)
+        mock_set_custom_metric.assert_any_call('course_structure_process_cache_misses', 1)
+
+        # each caller gets its own copy, which it may edit
+        self.assertIsNot(cached_structure, not_cached_structure)
+        block_key = cached_structure['root']
+        cached_structure['blocks'][block_key].fields['edited'] = True
+        self.assertNotIn('edited', self._get_structure(self.new_course)['blocks'][block_key].fields)
+
+    @patch('xmodule.modulestore.split_mongo.split.get_process_definition_cache')
+    def test_process_definition_cache(self, mock_get_process_cache):
+        process_cache = PickledLRUCache(max_bytes=10 * 1024 * 1024)
+        mock_get_process_cache.return_value = process_cache
+        store = modulestore()
+
+        with patch.object(
+            store.db_connection, 'get_definitions', wraps=store.db_connection.get_definitions
+        ) as mock_get_definitions:
+            course = store.get_course(self.new_course.id, depth=None, lazy=False)
+            self.assertEqual(mock_get_definitions.call_count, 1)
+            self.assertGreater(len(process_cache), 0)
+
+            # the definitions are loaded from the process cache in the next request
+            store._clear_cache()  # pylint: disable=protected-access
+            cached_course = store.get_course(self.new_course.id, depth=None, lazy=False)
+            self.assertEqual(mock_get_definitions.call_count, 1)
+
+        self.assertIsNot(cached_course, course)
+        self.assertEqual(cached_course.grading_policy, course.grading_policy)
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1776,6 +1827,77 @@ class TestItemCrud(SplitModuleTest):
             store.delete_course(refetch_course.id, user)
 
 
+class TestDefinitionLoading(SplitModuleTest):
+    """
+    Test loading only the parts of definitions that are needed, in batches.
+    """
+    def setUp(self):
+        super(TestDefinitionLoading, self).setUp()
+        self.store = modulestore()
+        course = self.store.create_course(
+            'testx', 'definitions', 'run', 'testbot', BRANCH_NAME_DRAFT,
+        )
+        vertical = self.store.create_child('testbot', course.location, 'vertical', block_id='vertical1')
+        self.payloads = ['<problem>one</problem>', '<problem>two</problem>']
+        for index, payload in enumerate(self.payloads):
+            self.store.create_child(
+                'testbot', vertical.location.version_agnostic(), 'problem',
+                block_id='problem{}'.format(index), fields={'data': payload},
+            )
+        self.vertical_location = vertical.location.version_agnostic()
+
+    def test_sibling_definitions_loaded_together(self):
+        with patch.object(self.store, 'get_definitions', wraps=self.store.get_definitions) as mock_get_definitions:
+            vertical = self.store.get_item(self.vertical_location, depth=None)
+            self.assertFalse(mock_get_definitions.called)
+
+            # the first access to a problem's data loads the definitions of
+            # both problems, in a single query
+            problems = vertical.get_children()
+            self.assertEqual([problem.data for problem in problems], self.payloads)
+            self.assertEqual(mock_get_definitions.call_count, 1)
+
+    def test_exclude_definition_fields(self):
+        fetched_definitions = []
+        get_definitions = self.store.db_connection.get_definitions
+
+        def record_definitions(*args, **kwargs):
+            """
+            Records the definitions fetched from the database.
+            """
+            definitions = list(get_definitions(*args, **kwargs))
+            fetched_definitions.append(definitions)
+            return definitions
+
+        with patch.object(self.store.db_connection, 'get_definitions', side_effect=record_definitions):
+            vertical = self.store.get_item(
+                self.vertical_location, depth=None, lazy=False, exclude_definition_fields=['data'],
+            )
+            problems = vertical.get_children()
+            self.assertEqual(len(fetched_definitions), 1)
+            for definition in fetched_definitions[0]:
+                self.assertNotIn('data', definition['fields'])
+
+            # the first access to a problem's data loads only the data of
+            # both problems, in a single query
+            self.assertEqual([problem.data for problem in problems], self.payloads)
+            self.assertEqual(len(fetched_definitions), 2)
+            for definition in fetched_definitions[1]:
+                self.assertEqual(list(definition['fields']), ['data'])
+
+    def test_get_items_by_content(self):
+        with patch.object(self.store, 'get_definition', wraps=self.store.get_definition) as mock_get_definition:
+            with patch.object(self.store, 'get_definitions', wraps=self.store.get_definitions) as mock_get_definitions:
+                items = self.store.get_items(
+                    self.vertical_location.course_key,
+                    qualifiers={'category': 'problem'},
+                    content={'data': self.payloads[1]},
+                )
+        self.assertEqual([item.location.block_id for item in items], ['problem1'])
+        self.assertEqual(mock_get_definitions.call_count, 1)
+        self.assertFalse(mock_get_definition.called)
+
+
 class TestCourseCreation(SplitModuleTest):
     """
     Test create_course
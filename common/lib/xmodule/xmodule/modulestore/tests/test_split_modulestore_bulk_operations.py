@@ -460,7 +460,9 @@ class TestBulkWriteMixinFindMethods(TestBulkWriteMixin):
         results = self.bulk.get_definitions(self.course_key, search_ids)
         definitions_gotten = list(set(search_ids) - set(active_ids))
         if len(definitions_gotten) > 0:
-            self.conn.get_definitions.assert_called_once_with(definitions_gotten, self.course_key)
+            self.conn.get_definitions.assert_called_once_with(
+                definitions_gotten, self.course_key, fields=None, exclude_fields=None,
+            )
         else:
             # If no definitions to get, then get_definitions() should *not* have been called.
             self.assertEqual(self.conn.get_definitions.call_count, 0)
@@ -486,6 +488,24 @@ class TestBulkWriteMixinFindMethods(TestBulkWriteMixin):
         self.bulk._end_bulk_operation(self.course_key)
         self.assertFalse(self.conn.insert_definition.called)
 
+    @ddt.data(
+        {'fields': ['data']},
+        {'exclude_fields': ['data']},
+    )
+    def test_get_partial_definitions_not_cached(self, projection):
+        db_definition = lambda _id: {'db': 'definition', '_id': _id}
+        self.conn.get_definitions.return_value = [db_definition(1)]
+        self.bulk._begin_bulk_operation(self.course_key)
+        self.bulk.get_definitions(self.course_key, [1], **projection)
+        self.conn.get_definitions.assert_called_once_with(
+            [1], self.course_key, **dict({'fields': None, 'exclude_fields': None}, **projection)
+        )
+
+        # the partial definition isn't returned in place of the complete one
+        self.conn.get_definitions.return_value = [db_definition(1)]
+        self.bulk.get_definitions(self.course_key, [1])
+        self.assertEqual(self.conn.get_definitions.call_count, 2)
+
     def test_no_bulk_find_structures_derived_from(self):
         ids = [Mock(name='id')]
         self.conn.find_structures_derived_from.return_value = [MagicMock(name='result')]
@@ -5,9 +5,10 @@ import unittest
 
 from mock import patch
 from pymongo.errors import ConnectionFailure
+from six.moves import cPickle as pickle
 
 from xmodule.exceptions import HeartbeatFailure
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, PickledLRUCache
 
 
 class TestHeartbeatFailureException(unittest.TestCase):
@@ -23,3 +24,55 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with self.assertRaises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestPickledLRUCache(unittest.TestCase):
+    """ Test the bounded, in-process cache of pickled values """
+
+    def setUp(self):
+        super(TestPickledLRUCache, self).setUp()
+        self.cache = PickledLRUCache(max_bytes=100)
+
+    def test_get_miss_and_hit(self):
+        self.assertIsNone(self.cache.get('a'))
+        structure = {'_id': 'a', 'blocks': {}}
+        self.cache.set('a', pickle.dumps(structure))
+        self.assertEqual(self.cache.get('a'), structure)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_get_returns_copies(self):
+        self.cache.set('a', pickle.dumps({'_id': 'a', 'blocks': {}}))
+        self.cache.get('a')['blocks']['block'] = 'edited'
+        self.assertEqual(self.cache.get('a'), {'_id': 'a', 'blocks': {}})
+        self.assertIsNot(self.cache.get('a'), self.cache.get('a'))
+
+    def test_evicts_least_recently_used(self):
+        structures = {key: pickle.dumps(key * 20) for key in ('a', 'b', 'c')}
+        self.cache.set('a', structures['a'])
+        self.cache.set('b', structures['b'])
+        # touch 'a' so that 'b' becomes the least recently used entry
+        self.cache.get('a')
+        self.cache.set('c', structures['c'])
+
+        self.assertIn('a', self.cache)
+        self.assertNotIn('b', self.cache)
+        self.assertIn('c', self.cache)
+        self.assertEqual(self.cache.current_bytes, len(structures['a']) + len(structures['c']))
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_replacing_entry_updates_size(self):
+        self.cache.set('a', b'a' * 40)
+        self.cache.set('a', b'a' * 60)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.current_bytes, 60)
+
+    def test_oversized_value_not_cached(self):
+        self.cache.set('a', b'a' * 101)
+        self.assertNotIn('a', self.cache)
+        self.assertEqual(self.cache.current_bytes, 0)
+
+    def test_clear(self):
+        self.cache.set('a', b'a' * 40)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.current_bytes, 0)
@@ -4,6 +4,7 @@ Common MongoDB connection functions.
 
 
 import logging
+import threading
 
 import pymongo
 from mongodb_proxy import MongoProxy
@@ -21,6 +22,36 @@ logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 MONGO_READ_PREFERENCE_MAP = dict(zip(_MONGOS_MODES, _MODES))
 
 
+class CommandCounter(pymongo.monitoring.CommandListener):
+    """
+    Counts the MongoDB commands started by each thread, so that callers can
+    measure how many commands a piece of code sends, by comparing the counts
+    before and after it runs.
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def count(self):
+        """
+        The number of commands started by the current thread.
+        """
+        return getattr(self._local, 'count', 0)
+
+    def started(self, event):
+        self._local.count = self.count + 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Listens to the commands of all the connections made by connect_to_mongodb
+COMMAND_COUNTER = CommandCounter()
+
+
 # pylint: disable=bad-continuation
 def connect_to_mongodb(
     db, host,
@@ -66,6 +97,8 @@ def connect_to_mongodb(
         if read_preference is not None:
             kwargs['read_preference'] = read_preference
 
+    kwargs['event_listeners'] = list(kwargs.get('event_listeners', [])) + [COMMAND_COUNTER]
+
     mongo_conn = pymongo.database.Database(
         mongo_client_class(
             host=host,
@@ -503,6 +503,11 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
         """
         render_items = not context.get('exclude_units', False)
         is_user_authenticated = self.is_user_authenticated(context)
+        # The unit view url format can be defined in the template context like so:
+        # context['unit_view_url'] = '/my/view/path/{usage_key}/student_view'
+        # in which case only the active unit is rendered here, and the others are
+        # fetched from that url when they are selected.
+        unit_view_url = context.get('unit_view_url') if view == STUDENT_VIEW and is_user_authenticated else None
         completion_service = self.runtime.service(self, 'completion')
         try:
             bookmarks_service = self.runtime.service(self, 'bookmarks')
@@ -514,8 +519,14 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             self.get_parent().display_name_with_default,
             self.display_name_with_default
         ]
+        bookmarked = {}
+        if is_user_authenticated and bookmarks_service:
+            bookmarked = bookmarks_service.are_bookmarked([item.scope_ids.usage_id for item in display_items])
+        completions = {}
+        if is_user_authenticated and completion_service:
+            completions = self._verticals_are_complete(completion_service, display_items)
         contents = []
-        for item in display_items:
+        for position, item in enumerate(display_items, start=1):
             # NOTE (CCB): This seems like a hack, but I don't see a better method of determining the type/category.
             item_type = item.get_icon_class()
             usage_id = item.scope_ids.usage_id
@@ -525,12 +536,13 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
 
             if is_user_authenticated and bookmarks_service:
                 show_bookmark_button = True
-                is_bookmarked = bookmarks_service.is_bookmarked(usage_key=usage_id)
+                is_bookmarked = bookmarked.get(usage_id, False)
 
             context['show_bookmark_button'] = show_bookmark_button
             context['bookmarked'] = is_bookmarked
 
-            if render_items:
+            render_item = render_items and (not unit_view_url or position == self.position)
+            if render_item:
                 rendered_item = item.render(view, context)
                 fragment.add_fragment_resources(rendered_item)
                 content = rendered_item.content
@@ -549,14 +561,27 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
                 # The item url format can be defined in the template context like so:
                 # context['item_url'] = '/my/item/path/{usage_key}/whatever'
                 iteminfo['href'] = context.get('item_url', '').format(usage_key=usage_id)
-            if is_user_authenticated:
-                if item.location.block_type == 'vertical' and completion_service:
-                    iteminfo['complete'] = completion_service.vertical_is_complete(item)
+            elif not render_item:
+                iteminfo['content_url'] = unit_view_url.format(usage_key=usage_id)
+            if item.location in completions:
+                iteminfo['complete'] = completions[item.location]
 
             contents.append(iteminfo)
 
         return contents
 
+    @staticmethod
+    def _verticals_are_complete(completion_service, display_items):
+        """
+        Returns a dict mapping the location of each vertical in display_items
+        to whether it is complete, in a single lookup when the completion
+        service supports it.
+        """
+        verticals = [item for item in display_items if item.location.block_type == 'vertical']
+        if hasattr(completion_service, 'verticals_are_complete'):
+            return completion_service.verticals_are_complete(verticals)
+        return {vertical.location: completion_service.vertical_is_complete(vertical) for vertical in verticals}
+
     def _locations_in_subtree(self, node):
         """
         The usage keys for all descendants of an XBlock/XModule as a flat list.
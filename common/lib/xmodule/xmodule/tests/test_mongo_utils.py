@@ -10,7 +10,7 @@ from uuid import uuid4
 import ddt
 from pymongo import ReadPreference
 
-from xmodule.mongo_utils import connect_to_mongodb
+from xmodule.mongo_utils import COMMAND_COUNTER, connect_to_mongodb
 
 
 @ddt.ddt
@@ -37,3 +37,14 @@ class MongoUtilsTests(TestCase):
         # Support for read_preference given as mongos name.
         connection = connect_to_mongodb(db, host, read_preference=mongos_name)
         self.assertEqual(connection.client.read_preference, expected_read_preference)
+
+    def test_connect_to_mongo_counts_commands(self):
+        """
+        Test that the commands sent through the connection are counted.
+        """
+        host = 'edx.devstack.mongo' if 'BOK_CHOY_HOSTNAME' in os.environ else 'localhost'
+        db = 'test_command_counter_%s' % uuid4().hex
+        connection = connect_to_mongodb(db, host)
+        count = COMMAND_COUNTER.count
+        connection.test.find_one()
+        self.assertEqual(COMMAND_COUNTER.count, count + 1)
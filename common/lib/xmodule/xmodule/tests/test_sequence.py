@@ -85,7 +85,8 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
 
         block.xmodule_runtime._services['bookmarks'] = Mock()  # pylint: disable=protected-access
         block.xmodule_runtime._services['completion'] = Mock(  # pylint: disable=protected-access
-            return_value=Mock(vertical_is_complete=Mock(return_value=True))
+            return_value=Mock(vertical_is_complete=Mock(return_value=True)),
+            verticals_are_complete=lambda items: {item.location: True for item in items},
         )
         block.xmodule_runtime._services['user'] = StubUserService()  # pylint: disable=protected-access
         block.xmodule_runtime.xmodule_instance = getattr(block, '_xmodule', None)
@@ -169,6 +170,17 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
         html = self._get_rendered_view(self.sequence_3_1, requested_child='last', view=view)
         self._assert_view_at_position(html, expected_position=3)
 
+    def test_student_view_lazy_units(self):
+        html = self._get_rendered_view(
+            self.sequence_3_1,
+            requested_child='last',
+            extra_context=dict(unit_view_url='/view/{usage_key}/student_view'),
+        )
+        children = self.sequence_3_1.children
+        for child in children[:-1]:
+            self.assertIn("'content_url': '/view/{}/student_view'".format(child), html)
+        self.assertNotIn("'content_url': '/view/{}/student_view'".format(children[-1]), html)
+
     def test_tooltip(self):
         html = self._get_rendered_view(self.sequence_3_1, requested_child=None)
         for child in self.sequence_3_1.children:
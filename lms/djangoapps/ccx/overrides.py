@@ -48,6 +48,20 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
             return get_override_for_ccx(ccx, block, name, default)
         return default
 
+    @classmethod
+    def prefetch(cls, user, course_key, blocks):
+        """
+        Loads the overrides of the ccx, if there is one, and the keys they
+        are stored under for each of the blocks.
+        """
+        if not isinstance(course_key, CCXLocator):
+            return
+        ccx = get_current_ccx(course_key)
+        if ccx:
+            _get_overrides_for_ccx(ccx)
+            for block in blocks:
+                _clean_ccx_key(block.location)
+
     @classmethod
     def enabled_for(cls, block):
         """
@@ -110,11 +124,14 @@ def _clean_ccx_key(block_location):
     branch information from the key.
     Returns the cleaned key.
     """
-    if isinstance(block_location, CCXBlockUsageLocator):
-        clean_key = block_location.to_block_locator()
-    else:
-        clean_key = block_location
-    return clean_key.version_agnostic().for_branch(None)
+    clean_keys_cache = get_cache('ccx-clean-keys')
+    if block_location not in clean_keys_cache:
+        if isinstance(block_location, CCXBlockUsageLocator):
+            clean_key = block_location.to_block_locator()
+        else:
+            clean_key = block_location
+        clean_keys_cache[block_location] = clean_key.version_agnostic().for_branch(None)
+    return clean_keys_cache[block_location]
 
 
 def _get_overrides_for_ccx(ccx):
@@ -248,7 +248,7 @@ class TestGetBlocksQueryCounts(TestGetBlocksQueryCountsBase):
 
     @ddt.data(
         *product(
-            ((ModuleStoreEnum.Type.mongo, 5), (ModuleStoreEnum.Type.split, 3)),
+            ((ModuleStoreEnum.Type.mongo, 5), (ModuleStoreEnum.Type.split, 4)),
             (True, False),
         )
     )
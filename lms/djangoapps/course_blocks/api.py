@@ -4,15 +4,19 @@ get_course_blocks function.
 """
 
 
+from ccx_keys.locator import CCXLocator
 from django.conf import settings
 from edx_when import field_data
 
 from lms.djangoapps.course_api.blocks.transformers.block_completion import BlockCompletionTransformer
+from lms.djangoapps.courseware.toggles import COURSEWARE_BLOCK_STRUCTURE_PATHS
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.features.content_type_gating.block_transformers import ContentTypeGateTransformer
+from xmodule.modulestore.search import includes_staff_only_children, location_from_path
 
 from .transformers import library_content, load_override_data, start_date, user_partitions, visibility
+from .transformers.block_path import BlockPathTransformer
 from .usage_info import CourseUsageInfo
 
 INDIVIDUAL_STUDENT_OVERRIDE_PROVIDER = (
@@ -103,3 +107,44 @@ def get_course_blocks(
         starting_block_usage_key,
         collected_block_structure,
     )
+
+
+def path_to_location_in_block_structure(usage_key, request=None, full_path=False):
+    """
+    Returns the same as xmodule.modulestore.search.path_to_location, looked
+    up in the parent and position index collected with the course's block
+    structure, without loading any blocks from the modulestore.
+
+    Only the stored block structure is read, with just the data collected by
+    BlockPathTransformer. Returns None if this isn't enabled for the course,
+    if the block structure isn't stored, or if the block isn't in it, for
+    example because it was published since the block structure was last
+    collected. Callers should then use path_to_location.
+
+    Arguments:
+        usage_key (UsageKey) - The block to find the path to.
+
+        request - Request object containing information about the user
+            and their masquerade settings, used to find the block's position.
+
+        full_path (bool) - If True, return the full path to the block.
+    """
+    course_key = usage_key.course_key
+    if isinstance(course_key, CCXLocator) or not COURSEWARE_BLOCK_STRUCTURE_PATHS.is_enabled(course_key):
+        return None
+
+    block_structure = get_block_structure_manager(course_key).get_collected_if_stored([BlockPathTransformer])
+    if block_structure is None:
+        return None
+
+    path = BlockPathTransformer.get_path(block_structure, usage_key)
+    if path is None or full_path:
+        return path
+
+    include_staff_only = includes_staff_only_children(request, course_key)
+    return location_from_path(
+        path,
+        lambda section_key, child_key: BlockPathTransformer.get_position(
+            block_structure, child_key, include_staff_only
+        ),
+    )
@@ -0,0 +1,70 @@
+"""
+Tests for the incremental collection of course blocks with the platform's
+registered transformers.
+"""
+
+
+from mock import patch
+
+from lms.djangoapps.course_api.blocks.transformers.blocks_api import BlocksAPITransformer
+from lms.djangoapps.course_blocks.transformers.block_path import BlockPathTransformer
+from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache, get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.config import (
+    INCREMENTAL_COLLECTION,
+    STORAGE_BACKING_FOR_CACHE,
+    waffle
+)
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.djangoapps.content.block_structure.transformer_registry import TransformerRegistry
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+
+class IncrementalCollectionTestCase(ModuleStoreTestCase):
+    """
+    Tests that course blocks are collected incrementally with the
+    transformers registered in setup.py.
+    """
+    def setUp(self):
+        super(IncrementalCollectionTestCase, self).setUp()
+        self.course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        self.chapter = ItemFactory.create(parent=self.course, category='chapter')
+        self.sequential = ItemFactory.create(parent=self.chapter, category='sequential')
+        self.vertical = ItemFactory.create(parent=self.sequential, category='vertical')
+        ItemFactory.create(parent=self.vertical, category='problem')
+        clear_course_from_cache(self.course.id)
+
+    def test_registered_transformers_support_incremental_collect(self):
+        registered_transformers = TransformerRegistry.get_registered_transformers()
+        self.assertIn(BlocksAPITransformer, registered_transformers)
+        self.assertIn(BlockPathTransformer, registered_transformers)
+        for transformer in registered_transformers:
+            self.assertTrue(transformer.SUPPORTS_INCREMENTAL_COLLECT, transformer.name())
+
+    def test_collect_incrementally(self):
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=True):
+            with waffle().override(INCREMENTAL_COLLECTION, active=True):
+                manager = get_block_structure_manager(self.course.id)
+                previous_block_structure = manager.get_collected()
+                self.assertTrue(BlockStructureTransformers.supports_incremental_collect(previous_block_structure))
+
+                new_vertical = ItemFactory.create(parent=self.sequential, category='vertical')
+                with patch.object(
+                    BlockStructureFactory,
+                    'create_from_modulestore',
+                    wraps=BlockStructureFactory.create_from_modulestore,
+                ) as mock_create_from_modulestore:
+                    with patch.object(
+                        BlockStructureFactory,
+                        'create_from_modulestore_changes',
+                        wraps=BlockStructureFactory.create_from_modulestore_changes,
+                    ) as mock_create_from_modulestore_changes:
+                        manager.update_collected_if_needed()
+                block_structure = manager.get_collected()
+
+        self.assertFalse(mock_create_from_modulestore.called)
+        self.assertTrue(mock_create_from_modulestore_changes.called)
+        self.assertIn(new_vertical.location, block_structure)
+        self.assertEqual(BlockPathTransformer.get_position(block_structure, new_vertical.location, False), '2')
@@ -0,0 +1,101 @@
+"""
+Block Path Transformer implementation.
+"""
+
+
+from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+
+# Block types whose children are navigated to by their position
+POSITIONAL_BLOCK_TYPES = ('sequential', 'videosequence')
+
+
+class BlockPathTransformer(BlockStructureTransformer):
+    """
+    A transformer that collects, for every block in the course, its parent
+    and its position within a sequence, so that the path to a block can be
+    found without loading any blocks from the modulestore.
+
+    Positions are collected both counting and not counting the sequence's
+    children that are visible to staff only, since that is what staff and
+    learners are respectively shown.
+
+    It doesn't transform the block structure.
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
+    PARENT = 'parent'
+    POSITION = 'position'
+    LEARNER_POSITION = 'learner_position'
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return "block_path"
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects any information that's necessary to execute this
+        transformer's transform method.
+        """
+        for block_key in block_structure.topological_traversal():
+            parents = block_structure.get_parents(block_key)
+            block_structure.set_transformer_block_field(
+                block_key, cls, cls.PARENT, parents[0] if parents else None
+            )
+
+            if block_key.block_type not in POSITIONAL_BLOCK_TYPES:
+                continue
+
+            # positions are 1-indexed, and strings to be consistent with url parsing.
+            # A block's position is only needed within the parent its path goes through.
+            learner_position = 0
+            for position, child_key in enumerate(block_structure.get_children(block_key), start=1):
+                shown_to_learners = not getattr(block_structure.get_xblock(child_key), 'visible_to_staff_only', False)
+                if shown_to_learners:
+                    learner_position += 1
+                if block_structure.get_parents(child_key)[0] != block_key:
+                    continue
+                block_structure.set_transformer_block_field(child_key, cls, cls.POSITION, str(position))
+                if shown_to_learners:
+                    block_structure.set_transformer_block_field(
+                        child_key, cls, cls.LEARNER_POSITION, str(learner_position)
+                    )
+
+    def transform(self, usage_info, block_structure):
+        """
+        Does nothing; the collected data is read by path_to_location_in_block_structure.
+        """
+        pass
+
+    @classmethod
+    def get_path(cls, block_structure, usage_key):
+        """
+        Returns the list of keys from the course root to the given block, or
+        None if the block isn't reachable from the root, or its path wasn't
+        collected.
+        """
+        if usage_key not in block_structure:
+            return None
+
+        path = [usage_key]
+        while path[0].block_type != 'course':
+            parent_key = block_structure.get_transformer_block_field(path[0], cls, cls.PARENT)
+            if parent_key is None:
+                return None
+            path.insert(0, parent_key)
+        return path
+
+    @classmethod
+    def get_position(cls, block_structure, block_key, include_staff_only):
+        """
+        Returns the position of the given block within its sequence, or None if
+        it isn't shown.
+        """
+        return block_structure.get_transformer_block_field(
+            block_key, cls, cls.POSITION if include_staff_only else cls.LEARNER_POSITION
+        )
@@ -14,6 +14,7 @@ class HideEmptyTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
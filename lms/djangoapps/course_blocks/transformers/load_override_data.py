@@ -60,6 +60,7 @@ class OverrideDataTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     def __init__(self, user):
         self.user = user
@@ -0,0 +1,133 @@
+"""
+Tests for BlockPathTransformer.
+"""
+
+
+import ddt
+from mock import Mock, patch
+
+from lms.djangoapps.course_blocks.api import path_to_location_in_block_structure
+from lms.djangoapps.course_blocks.transformers.block_path import BlockPathTransformer
+from lms.djangoapps.courseware.toggles import COURSEWARE_BLOCK_STRUCTURE_PATHS
+from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache, get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.djangoapps.waffle_utils.testutils import override_waffle_flag
+from xmodule.modulestore.search import location_from_path, path_to_location
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+
+@ddt.ddt
+class BlockPathTransformerTestCase(ModuleStoreTestCase):
+    """
+    Tests that paths found with BlockPathTransformer match path_to_location.
+    """
+    def setUp(self):
+        super(BlockPathTransformerTestCase, self).setUp()
+        self.course = CourseFactory.create()
+        self.chapter = ItemFactory.create(parent=self.course, category='chapter')
+        self.sequential = ItemFactory.create(parent=self.chapter, category='sequential')
+        self.staff_only_vertical = ItemFactory.create(
+            parent=self.sequential, category='vertical', visible_to_staff_only=True
+        )
+        self.vertical = ItemFactory.create(parent=self.sequential, category='vertical')
+        self.problem = ItemFactory.create(parent=self.vertical, category='problem')
+        self.orphan = ItemFactory.create(category='html', parent_location=None, course=self.course)
+
+        self.block_structure = BlockStructureFactory.create_from_modulestore(self.course.location, self.store)
+        BlockPathTransformer.collect(self.block_structure)
+
+    def test_get_path(self):
+        for block in (self.course, self.chapter, self.sequential, self.vertical, self.problem):
+            self.assertEqual(
+                BlockPathTransformer.get_path(self.block_structure, block.location),
+                path_to_location(self.store, block.location, full_path=True),
+            )
+
+    def test_get_path_not_collected(self):
+        self.assertIsNone(BlockPathTransformer.get_path(self.block_structure, self.orphan.location))
+
+    @ddt.data(
+        (True, '2'),
+        (False, '1'),
+    )
+    @ddt.unpack
+    def test_get_position(self, include_staff_only, expected_position):
+        self.assertEqual(
+            BlockPathTransformer.get_position(self.block_structure, self.vertical.location, include_staff_only),
+            expected_position,
+        )
+        path = BlockPathTransformer.get_path(self.block_structure, self.problem.location)
+        location = location_from_path(
+            path,
+            lambda section_key, child_key: BlockPathTransformer.get_position(
+                self.block_structure, child_key, include_staff_only
+            ),
+        )
+        self.assertEqual(location[4], expected_position)
+
+    def test_staff_only_position_for_learners(self):
+        self.assertIsNone(
+            BlockPathTransformer.get_position(self.block_structure, self.staff_only_vertical.location, False)
+        )
+
+    @ddt.data(True, False)
+    def test_path_to_location_in_block_structure(self, enabled):
+        clear_course_from_cache(self.course.id)
+        get_block_structure_manager(self.course.id).get_collected()
+        request = Mock(user=self.user, session={})
+        with override_waffle_flag(COURSEWARE_BLOCK_STRUCTURE_PATHS, active=enabled):
+            location = path_to_location_in_block_structure(self.problem.location, request)
+        if enabled:
+            self.assertEqual(location, path_to_location(self.store, self.problem.location, request))
+        else:
+            self.assertIsNone(location)
+
+    def test_path_to_location_not_in_store(self):
+        clear_course_from_cache(self.course.id)
+        with override_waffle_flag(COURSEWARE_BLOCK_STRUCTURE_PATHS, active=True):
+            with patch.object(BlockStructureFactory, 'create_from_modulestore') as mock_create_from_modulestore:
+                location = path_to_location_in_block_structure(self.problem.location, full_path=True)
+        self.assertIsNone(location)
+        self.assertFalse(mock_create_from_modulestore.called)
+
+    @ddt.data(True, False)
+    def test_collect_incrementally(self, reorder):
+        if reorder:
+            # only the sequential changes
+            sequential = self.store.get_item(self.sequential.location)
+            sequential.children.reverse()
+            self.store.update_item(sequential, self.user.id)
+            changed_block_keys = [self.sequential.location]
+        else:
+            # only the staff only vertical changes, which moves its sibling's learner position
+            staff_only_vertical = self.store.get_item(self.staff_only_vertical.location)
+            staff_only_vertical.visible_to_staff_only = False
+            self.store.update_item(staff_only_vertical, self.user.id)
+            changed_block_keys = [self.staff_only_vertical.location]
+
+        affected_structure, block_relations = BlockStructureFactory.create_from_modulestore_changes(
+            self.block_structure, changed_block_keys, self.store,
+        )
+        self.assertIn(self.vertical.location, affected_structure)
+        BlockPathTransformer.collect(affected_structure)
+        merged_structure = BlockStructureFactory.merge_collected(
+            self.block_structure, affected_structure, block_relations,
+        )
+
+        full_structure = BlockStructureFactory.create_from_modulestore(self.course.location, self.store)
+        BlockPathTransformer.collect(full_structure)
+        for block in (self.chapter, self.sequential, self.staff_only_vertical, self.vertical, self.problem):
+            self.assertEqual(
+                BlockPathTransformer.get_path(merged_structure, block.location),
+                BlockPathTransformer.get_path(full_structure, block.location),
+            )
+            for include_staff_only in (True, False):
+                self.assertEqual(
+                    BlockPathTransformer.get_position(merged_structure, block.location, include_staff_only),
+                    BlockPathTransformer.get_position(full_structure, block.location, include_staff_only),
+                )
+        self.assertEqual(
+            BlockPathTransformer.get_position(merged_structure, self.vertical.location, False),
+            '1' if reorder else '2',
+        )
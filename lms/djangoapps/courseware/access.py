@@ -15,9 +15,11 @@ Note: The access control logic in this file does NOT check for enrollment in
 import logging
 from datetime import datetime
 
+import crum
 import six
 from django.conf import settings  # pylint: disable=unused-import
 from django.contrib.auth.models import AnonymousUser
+from edx_django_utils.cache import RequestCache
 from edx_django_utils.monitoring import function_trace
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from pytz import UTC
@@ -41,6 +43,7 @@ from lms.djangoapps.courseware.access_utils import (
     in_preview_mode
 )
 from lms.djangoapps.courseware.masquerade import get_masquerade_role, is_masquerading_as_student
+from lms.djangoapps.courseware.toggles import COURSEWARE_ACCESS_DECISION_CACHE
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.ccx.models import CustomCourseForEdX
 from mobile_api.models import IgnoreMobileAvailableFlagConfig
@@ -71,6 +74,8 @@ from xmodule.x_module import XModule
 
 log = logging.getLogger(__name__)
 
+ACCESS_DECISION_CACHE_NAMESPACE = u'courseware.access.decisions'
+
 
 def has_ccx_coach_role(user, course_key):
     """
@@ -136,6 +141,21 @@ def has_access(user, action, obj, course_key=None):
     if not user:
         user = AnonymousUser()
 
+    decisions = _access_decision_cache()
+    if decisions is not None:
+        decision_key = _access_decision_key(user, action, obj, course_key)
+        if decision_key is not None:
+            if decision_key not in decisions:
+                decisions[decision_key] = _has_access(user, action, obj, course_key)
+            return decisions[decision_key]
+
+    return _has_access(user, action, obj, course_key)
+
+
+def _has_access(user, action, obj, course_key):
+    """
+    Computes the access decision for has_access, without memoization.
+    """
     # Preview mode is only accessible by staff.
     if in_preview_mode() and course_key:
         if not has_staff_access_to_preview_mode(user, course_key):
@@ -174,6 +194,60 @@ def has_access(user, action, obj, course_key=None):
                     .format(type(obj)))
 
 
+def _access_decision_cache():
+    """
+    Returns the dict of access decisions made during the current request, or
+    None if decisions should not be memoized.
+
+    Decisions are only memoized while serving a request, so that the cache is
+    discarded along with the request cache once the response is sent.
+    """
+    if crum.get_current_request() is None:
+        return None
+
+    request_cache = RequestCache(ACCESS_DECISION_CACHE_NAMESPACE)
+    if u'enabled' not in request_cache.data:
+        request_cache.data[u'enabled'] = COURSEWARE_ACCESS_DECISION_CACHE.is_enabled()
+        request_cache.data[u'decisions'] = {}
+    return request_cache.data[u'decisions'] if request_cache.data[u'enabled'] else None
+
+
+def _access_decision_key(user, action, obj, course_key):
+    """
+    Returns the key under which the access decision for the given arguments is
+    memoized, or None if the decision should not be memoized.
+
+    Objects are identified by their key rather than by instance, since the same
+    block is loaded more than once while rendering a page. The user's masquerade
+    settings are part of the key, so that a change of masquerade is never
+    answered with a decision made for the previous one.
+    """
+    if isinstance(obj, (CourseDescriptor, CourseOverview)):
+        obj_key = obj.id
+    elif isinstance(obj, XModule):
+        # Access to an XModule is decided by its descriptor, which is memoized
+        return None
+    elif isinstance(obj, XBlock):
+        obj_key = obj.location
+    elif isinstance(obj, (CourseKey, UsageKey, six.string_types)):
+        obj_key = obj
+    else:
+        return None
+
+    masquerade_settings = getattr(user, 'masquerade_settings', None) or {}
+    masquerade_state = tuple(sorted(
+        (
+            text_type(masquerade_course_key),
+            masquerade.role,
+            masquerade.user_partition_id,
+            masquerade.group_id,
+            masquerade.user_name,
+        )
+        for masquerade_course_key, masquerade in six.iteritems(masquerade_settings)
+    ))
+    return (user.id, action, obj.__class__, obj_key, course_key, masquerade_state)
+
+
 def has_staff_access_to_preview_mode(user, course_key):
     """
     Checks if given user can access course in preview mode.
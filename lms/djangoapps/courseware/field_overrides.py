@@ -118,6 +118,18 @@ class FieldOverrideProvider(six.with_metaclass(ABCMeta, object)):
         """
         raise NotImplementedError
 
+    @classmethod
+    def prefetch(cls, user, course_key, blocks):
+        """
+        Loads the overrides for `user` of all of `blocks` in the course at
+        once, ahead of the field lookups made while the blocks are rendered or
+        graded.
+
+        Providers which would otherwise look up overrides one block at a time
+        should implement this.  By default, nothing is prefetched.
+        """
+        pass
+
     @abstractmethod
     def enabled_for(self, course):  # pragma no cover
         """
@@ -160,10 +172,7 @@ class OverrideFieldData(FieldData):
         any performance impact of this feature if no override providers are
         configured.
         """
-        if cls.provider_classes is None:
-            cls.provider_classes = tuple(
-                (resolve_dotted(name) for name in
-                 settings.FIELD_OVERRIDE_PROVIDERS))
+        cls._load_provider_classes()
 
         enabled_providers = cls._providers_for_course(course)
         if enabled_providers:
@@ -175,6 +184,25 @@ class OverrideFieldData(FieldData):
 
         return wrapped
 
+    @classmethod
+    def has_providers_for_course(cls, course):
+        """
+        Returns whether any override providers are enabled for the given course.
+        """
+        cls._load_provider_classes()
+        return bool(cls._providers_for_course(course))
+
+    @classmethod
+    def _load_provider_classes(cls):
+        """
+        Resolves the configured provider classes, the first time they are needed.
+        """
+        if cls.provider_classes is None:
+            cls.provider_classes = tuple(
+                (resolve_dotted(name) for name in
+                 settings.FIELD_OVERRIDE_PROVIDERS))
+        return cls.provider_classes
+
     @classmethod
     def _providers_for_course(cls, course):
         """
@@ -275,10 +303,7 @@ class OverrideModulestoreFieldData(OverrideFieldData):
             block: An XBlock
             field_data: An instance of FieldData to be wrapped
         """
-        if cls.provider_classes is None:
-            cls.provider_classes = [
-                resolve_dotted(name) for name in settings.MODULESTORE_FIELD_OVERRIDE_PROVIDERS
-            ]
+        cls._load_provider_classes()
 
         enabled_providers = cls._providers_for_block(block)
         if enabled_providers:
@@ -286,6 +311,17 @@ class OverrideModulestoreFieldData(OverrideFieldData):
 
         return field_data
 
+    @classmethod
+    def _load_provider_classes(cls):
+        """
+        Resolves the configured provider classes, the first time they are needed.
+        """
+        if cls.provider_classes is None:
+            cls.provider_classes = [
+                resolve_dotted(name) for name in settings.MODULESTORE_FIELD_OVERRIDE_PROVIDERS
+            ]
+        return cls.provider_classes
+
     @classmethod
     def _providers_for_block(cls, block):
         """
@@ -312,3 +348,25 @@ class OverrideModulestoreFieldData(OverrideFieldData):
 
     def __init__(self, fallback, providers):
         super(OverrideModulestoreFieldData, self).__init__(None, fallback, providers)
+
+
+def prefetch_overrides(user, course_key, blocks):
+    """
+    Lets every configured override provider load the overrides for `user` of
+    all of `blocks` at once, so that the field lookups made while the blocks
+    are rendered or graded don't each go to the database.
+
+    Arguments:
+        user: The user the blocks are about to be bound for
+        course_key: The key of the course containing the blocks
+        blocks: The blocks about to be rendered or graded
+    """
+    provider_classes = (
+        tuple(OverrideFieldData._load_provider_classes()) +  # pylint: disable=protected-access
+        tuple(OverrideModulestoreFieldData._load_provider_classes())  # pylint: disable=protected-access
+    )
+    for provider_class in provider_classes:
+        # Providers aren't required to derive from FieldOverrideProvider
+        prefetch = getattr(provider_class, 'prefetch', None)
+        if prefetch is not None:
+            prefetch(user, course_key, blocks)
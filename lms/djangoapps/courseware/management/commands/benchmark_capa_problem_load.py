@@ -0,0 +1,156 @@
+"""
+Command to measure how long capa problems take to load, with and without the
+trees of their XML preprocessed for the previous learners.
+"""
+
+
+import gettext
+import logging
+import os
+from timeit import default_timer
+
+import fs.osfs
+import six
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from lxml import etree
+
+from capa.capa_problem import LoncapaProblem, LoncapaSystem, problem_templates
+
+log = logging.getLogger(__name__)
+
+
+def _problem_files(paths):
+    """
+    Yields the paths of the XML files of capa problems in the given files and
+    directories.
+    """
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for dirpath, __, filenames in sorted(os.walk(path)):
+            for filename in sorted(filenames):
+                if filename.endswith('.xml') and os.path.basename(dirpath) == 'problem':
+                    yield os.path.join(dirpath, filename)
+
+
+def _capa_system(filestore):
+    """
+    Returns a LoncapaSystem for loading problems outside of a course.
+    """
+    return LoncapaSystem(
+        ajax_url='/benchmark',
+        anonymous_student_id='benchmark',
+        cache=None,
+        can_execute_unsafe_code=lambda: False,
+        get_python_lib_zip=lambda: None,
+        DEBUG=True,
+        filestore=filestore,
+        i18n=gettext.NullTranslations(),
+        node_path=settings.NODE_PATH,
+        render_template=None,
+        seed=1,
+        STATIC_URL=settings.STATIC_URL,
+        xqueue={
+            'interface': None,
+            'construct_callback': lambda dispatch='score_update': dispatch,
+            'default_queuename': 'benchmark',
+            'waittime': 5,
+        },
+    )
+
+
+class Command(BaseCommand):
+    """
+    Loads each problem, as a problem is loaded to be shown, checked or rescored,
+    for a number of learners, first parsing and preprocessing its XML for each
+    learner, then sharing the tree preprocessed for the first learner.
+
+    The HTML of the problems isn't rendered.
+
+    Example usage:
+        $ ./manage.py lms benchmark_capa_problem_load --settings=devstack
+        $ ./manage.py lms benchmark_capa_problem_load common/test/data/toy --learners 50 --settings=devstack
+    """
+    help = u'Compares the time taken to load capa problems with and without the shared trees of their XML.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            help=u'Problem XML files, or directories containing them in "problem" directories. '
+                 u'Defaults to common/test/data.',
+        )
+        parser.add_argument(
+            '--learners',
+            help=u'Number of learners, with different seeds, to load each problem for.',
+            default=20,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or [settings.COMMON_ROOT / 'test' / 'data']
+        learners = options['learners']
+        total_uncached = total_cached = 0
+
+        for problem_path in _problem_files(paths):
+            with open(problem_path, 'rb') as problem_file:
+                problem_text = problem_file.read().decode('utf-8')
+            try:
+                if etree.XML(problem_text.encode('utf-8')).tag != 'problem':
+                    continue
+                uncached, cached = self._benchmark_problem(problem_path, problem_text, learners)
+            except Exception as ex:  # pylint: disable=broad-except
+                log.warning(u'Could not load %s: %s', problem_path, six.text_type(ex))
+                continue
+
+            total_uncached += uncached
+            total_cached += cached
+            self.stdout.write(
+                u'{path}  uncached: {uncached:8.2f} ms  cached: {cached:8.2f} ms'.format(
+                    path=problem_path, uncached=uncached * 1000, cached=cached * 1000,
+                )
+            )
+
+        if total_cached:
+            self.stdout.write(
+                u'Total  uncached: {uncached:8.1f} ms  cached: {cached:8.1f} ms  speedup: {speedup:.2f}x'.format(
+                    uncached=total_uncached * 1000,
+                    cached=total_cached * 1000,
+                    speedup=total_uncached / total_cached,
+                )
+            )
+
+    def _benchmark_problem(self, problem_path, problem_text, learners):
+        """
+        Returns the average time taken to load the problem for a learner,
+        without and with the shared preprocessed tree of its XML.
+        """
+        capa_system = _capa_system(fs.osfs.OSFS(os.path.dirname(os.path.abspath(problem_path))))
+
+        def load_problem(seed):
+            """
+            Loads the problem for a learner.
+            """
+            # the problems' responses don't use the module while loading
+            LoncapaProblem(
+                problem_text, 'benchmark', capa_system, capa_module=None, seed=seed, extract_tree=False
+            )
+
+        # load once to import the modules used
+        load_problem(0)
+
+        start = default_timer()
+        for seed in range(learners):
+            problem_templates.clear()
+            load_problem(seed)
+        uncached = (default_timer() - start) / learners
+
+        problem_templates.clear()
+        start = default_timer()
+        for seed in range(learners):
+            load_problem(seed)
+        cached = (default_timer() - start) / learners
+
+        return uncached, cached
@@ -0,0 +1,23 @@
+"""
+Tests for the benchmark_capa_problem_load management command.
+"""
+
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from six import StringIO
+
+
+class BenchmarkCapaProblemLoadTests(TestCase):
+    """
+    Tests for the benchmark_capa_problem_load management command.
+    """
+    def test_benchmark(self):
+        out = StringIO()
+        call_command(
+            'benchmark_capa_problem_load', settings.COMMON_TEST_DATA_ROOT / 'simple', learners=2, stdout=out
+        )
+        lines = out.getvalue().splitlines()
+        self.assertIn('L1_Problem_1.xml', lines[0])
+        self.assertTrue(lines[-1].startswith('Total'))
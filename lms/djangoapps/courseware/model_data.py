@@ -32,13 +32,16 @@ from contracts import contract, new_contract
 from django.db import DatabaseError, IntegrityError, transaction
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
-from opaque_keys.edx.keys import LearningContextKey
+from opaque_keys.edx.keys import CourseKey, LearningContextKey
 from xblock.core import XBlockAside
 from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
 from xblock.fields import Scope, UserScope
 from xblock.runtime import KeyValueStore
 
+from lms.djangoapps.courseware.field_overrides import prefetch_overrides
+from lms.djangoapps.courseware.toggles import COURSEWARE_PREFETCH_FIELD_OVERRIDES
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
+from openedx.core.lib.cache_utils import get_cache
 from xmodule.modulestore.django import modulestore
 
 from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
@@ -737,6 +740,13 @@ class FieldDataCache(object):
 
                 self.cache[scope].cache_fields(fields, descriptors, self.asides)
 
+            if (
+                descriptors and
+                isinstance(self.course_id, CourseKey) and
+                COURSEWARE_PREFETCH_FIELD_OVERRIDES.is_enabled(self.course_id)
+            ):
+                prefetch_overrides(self.user, self.course_id, descriptors)
+
     def add_descriptor_descendents(self, descriptor, depth=None, descriptor_filter=lambda descriptor: True):
         """
         Add all descendants of `descriptor` to this FieldDataCache.
@@ -940,6 +950,8 @@ class ScoresClient(object):
     """
     Score = namedtuple('Score', 'correct total created')
 
+    _CACHE_NAMESPACE = u"courseware.model_data.ScoresClient"
+
     def __init__(self, course_key, user_id):
         self.course_key = course_key
         self.user_id = user_id
@@ -984,11 +996,52 @@ class ScoresClient(object):
 
     @classmethod
     def create_for_locations(cls, course_id, user_id, scorable_locations):
-        """Create a ScoresClient with pre-fetched data for the given locations."""
+        """
+        Create a ScoresClient with pre-fetched data for the given locations.
+
+        Returns the client prefetched for the user with prefetch(), if any.
+        """
+        prefetched = get_cache(cls._CACHE_NAMESPACE).get(six.text_type(course_id), {})
+        if user_id in prefetched:
+            return prefetched[user_id]
+
         client = cls(course_id, user_id)
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def prefetch(cls, course_id, user_ids, scorable_locations):
+        """
+        Fetches the scores of the given locations for all of the given
+        users in a single query, and caches a ScoresClient for each user
+        in the RequestCache, for use by create_for_locations.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=list(clients),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total, created in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade', 'created'
+        ):
+            scores = clients[user_id]._locations_to_scores  # pylint: disable=protected-access
+            scores[location.map_into_course(course_id)] = cls.Score(correct, total, created)
+        for client in six.itervalues(clients):
+            client._has_fetched = True  # pylint: disable=protected-access
+        get_cache(cls._CACHE_NAMESPACE)[six.text_type(course_id)] = clients
+
+    @classmethod
+    def clear_prefetched_data(cls, course_id, user_id=None):
+        """
+        Clears the scores prefetched for the given course from the RequestCache,
+        or only those of the given user.
+        """
+        if user_id is None:
+            get_cache(cls._CACHE_NAMESPACE).pop(six.text_type(course_id), None)
+        else:
+            get_cache(cls._CACHE_NAMESPACE).get(six.text_type(course_id), {}).pop(user_id, None)
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
@@ -8,7 +8,7 @@ import json
 import logging
 import textwrap
 import pytz
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 from functools import partial
 from datetime import datetime
 
@@ -48,6 +48,7 @@ from xblock.runtime import KvsFieldData
 
 import static_replace
 from capa.xqueue_interface import XQueueInterface
+from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.courseware.access import get_user_role, has_access
 from lms.djangoapps.courseware.entrance_exams import user_can_skip_entrance_exam, user_has_passed_entrance_exam
 from lms.djangoapps.courseware.masquerade import (
@@ -59,7 +60,13 @@ from lms.djangoapps.courseware.masquerade import (
 from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from edxmako.shortcuts import render_to_string
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
-from lms.djangoapps.courseware.services import UserStateService
+from lms.djangoapps.courseware.render_metrics import (
+    RenderMetricsRecorder,
+    RequestRenderMetricsSink,
+    get_render_metrics_sinks
+)
+from lms.djangoapps.courseware.services import UserStateService, XBlockFragmentCacheService
+from lms.djangoapps.courseware.toggles import COURSEWARE_XBLOCK_FRAGMENT_CACHE, COURSEWARE_XBLOCK_RENDER_METRICS
 from lms.djangoapps.grades.api import GradesUtilService
 from lms.djangoapps.grades.api import signals as grades_signals
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
@@ -81,9 +88,7 @@ from openedx.core.lib.xblock_utils import (
     get_aside_from_xblock,
     hash_resource,
     is_xblock_aside,
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls
+    replace_urls
 )
 from openedx.core.lib.xblock_utils import request_token as xblock_request_token
 from openedx.core.lib.xblock_utils import wrap_xblock
@@ -179,81 +184,161 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
         if course_module is None:
             return None, None, None
 
-        toc_chapters = list()
-        chapters = course_module.get_display_items()
+        def _toc_entry(block):
+            """
+            Returns the _TocEntry for the given bound XModule.
+            """
+            return _TocEntry(
+                location=block.location,
+                url_name=block.url_name,
+                # xss-lint: disable=python-deprecated-display-name
+                display_name=block.display_name_with_default_escaped,
+                format=block.format,
+                due=block.due,
+                graded=block.graded,
+                hide_from_toc=block.hide_from_toc,
+                is_time_limited=getattr(block, 'is_time_limited', False),
+            )
 
-        # Check for content which needs to be completed
-        # before the rest of the content is made available
-        required_content = milestones_helpers.get_required_content(course.id, user)
+        def _sections(chapter):
+            """
+            Lazily binds the sections of the given chapter.
+            """
+            for section in chapter.get_display_items():
+                yield _toc_entry(section)
 
-        # The user may not actually have to complete the entrance exam, if one is required
-        if user_can_skip_entrance_exam(user, course):
-            required_content = [content for content in required_content if not content == course.entrance_exam_id]
+        chapters = (
+            (_toc_entry(chapter), _sections(chapter))
+            for chapter in course_module.get_display_items()
+        )
+        return _build_toc(user, course, chapters, active_chapter, active_section)
 
-        previous_of_active_section, next_of_active_section = None, None
-        last_processed_section, last_processed_chapter = None, None
-        found_active_section = False
-        for chapter in chapters:
-            # Only show required content, if there is required content
-            # chapter.hide_from_toc is read-only (bool)
-            # xss-lint: disable=python-deprecated-display-name
-            display_id = slugify(chapter.display_name_with_default_escaped)
-            local_hide_from_toc = False
-            if required_content:
-                if six.text_type(chapter.location) not in required_content:
-                    local_hide_from_toc = True
-
-            # Skip the current chapter if a hide flag is tripped
-            if chapter.hide_from_toc or local_hide_from_toc:
+
+def toc_for_course_blocks(user, course, active_chapter, active_section):
+    """
+    Create a table of contents from the course's collected block structure.
+
+    Returns the same format as toc_for_course, but reads the chapters and
+    sections from the block structure transformed for the user instead of
+    binding an XModule for each of them.  Callers should use toc_for_course
+    for CCX courses, since CCX field overrides are not applied to block
+    structures.
+    """
+    course_blocks = get_course_blocks(user, course.location)
+
+    def _toc_entry(block_key):
+        """
+        Returns the _TocEntry for the given block in the course's block structure.
+        """
+        display_name = course_blocks.get_xblock_field(block_key, 'display_name')
+        if display_name is None:
+            display_name = block_key.block_id.replace('_', ' ')
+        return _TocEntry(
+            location=block_key,
+            url_name=block_key.block_id,
+            display_name=display_name.replace('<', '&lt;').replace('>', '&gt;'),
+            format=course_blocks.get_xblock_field(block_key, 'format'),
+            due=course_blocks.get_xblock_field(block_key, 'due'),
+            graded=course_blocks.get_xblock_field(block_key, 'graded', False),
+            hide_from_toc=course_blocks.get_xblock_field(block_key, 'hide_from_toc', False),
+            is_time_limited=course_blocks.get_xblock_field(block_key, 'is_time_limited', False),
+        )
+
+    chapters = (
+        (
+            _toc_entry(chapter_key),
+            (_toc_entry(section_key) for section_key in course_blocks.get_children(chapter_key)),
+        )
+        for chapter_key in course_blocks.get_children(course_blocks.root_block_usage_key)
+    )
+    return _build_toc(user, course, chapters, active_chapter, active_section)
+
+
+_TocEntry = namedtuple(
+    '_TocEntry',
+    ['location', 'url_name', 'display_name', 'format', 'due', 'graded', 'hide_from_toc', 'is_time_limited'],
+)
+
+
+def _build_toc(user, course, chapters, active_chapter, active_section):
+    """
+    Builds the table of contents described in toc_for_course.
+
+    chapters is an iterable of (chapter, sections) pairs, where chapter is a
+    _TocEntry and sections is an iterable of _TocEntry.  The sections of a
+    chapter are only iterated if the chapter is shown.
+    """
+    toc_chapters = list()
+
+    # Check for content which needs to be completed
+    # before the rest of the content is made available
+    required_content = milestones_helpers.get_required_content(course.id, user)
+
+    # The user may not actually have to complete the entrance exam, if one is required
+    if user_can_skip_entrance_exam(user, course):
+        required_content = [content for content in required_content if not content == course.entrance_exam_id]
+
+    previous_of_active_section, next_of_active_section = None, None
+    last_processed_section, last_processed_chapter = None, None
+    found_active_section = False
+    for chapter, chapter_sections in chapters:
+        # Only show required content, if there is required content
+        # chapter.hide_from_toc is read-only (bool)
+        display_id = slugify(chapter.display_name)
+        local_hide_from_toc = False
+        if required_content:
+            if six.text_type(chapter.location) not in required_content:
+                local_hide_from_toc = True
+
+        # Skip the current chapter if a hide flag is tripped
+        if chapter.hide_from_toc or local_hide_from_toc:
+            continue
+
+        sections = list()
+        for section in chapter_sections:
+            # skip the section if it is hidden from the user
+            if section.hide_from_toc:
                 continue
 
-            sections = list()
-            for section in chapter.get_display_items():
-                # skip the section if it is hidden from the user
-                if section.hide_from_toc:
-                    continue
-
-                is_section_active = (chapter.url_name == active_chapter and section.url_name == active_section)
-                if is_section_active:
-                    found_active_section = True
-
-                section_context = {
-                    # xss-lint: disable=python-deprecated-display-name
-                    'display_name': section.display_name_with_default_escaped,
-                    'url_name': section.url_name,
-                    'format': section.format if section.format is not None else '',
-                    'due': section.due,
-                    'active': is_section_active,
-                    'graded': section.graded,
-                }
-                _add_timed_exam_info(user, course, section, section_context)
-
-                # update next and previous of active section, if applicable
-                if is_section_active:
-                    if last_processed_section:
-                        previous_of_active_section = last_processed_section.copy()
-                        previous_of_active_section['chapter_url_name'] = last_processed_chapter.url_name
-                elif found_active_section and not next_of_active_section:
-                    next_of_active_section = section_context.copy()
-                    next_of_active_section['chapter_url_name'] = chapter.url_name
-
-                sections.append(section_context)
-                last_processed_section = section_context
-                last_processed_chapter = chapter
-
-            toc_chapters.append({
-                # xss-lint: disable=python-deprecated-display-name
-                'display_name': chapter.display_name_with_default_escaped,
-                'display_id': display_id,
-                'url_name': chapter.url_name,
-                'sections': sections,
-                'active': chapter.url_name == active_chapter
-            })
-        return {
-            'chapters': toc_chapters,
-            'previous_of_active_section': previous_of_active_section,
-            'next_of_active_section': next_of_active_section,
-        }
+            is_section_active = (chapter.url_name == active_chapter and section.url_name == active_section)
+            if is_section_active:
+                found_active_section = True
+
+            section_context = {
+                'display_name': section.display_name,
+                'url_name': section.url_name,
+                'format': section.format if section.format is not None else '',
+                'due': section.due,
+                'active': is_section_active,
+                'graded': section.graded,
+            }
+            _add_timed_exam_info(user, course, section, section_context)
+
+            # update next and previous of active section, if applicable
+            if is_section_active:
+                if last_processed_section:
+                    previous_of_active_section = last_processed_section.copy()
+                    previous_of_active_section['chapter_url_name'] = last_processed_chapter.url_name
+            elif found_active_section and not next_of_active_section:
+                next_of_active_section = section_context.copy()
+                next_of_active_section['chapter_url_name'] = chapter.url_name
+
+            sections.append(section_context)
+            last_processed_section = section_context
+            last_processed_chapter = chapter
+
+        toc_chapters.append({
+            'display_name': chapter.display_name,
+            'display_id': display_id,
+            'url_name': chapter.url_name,
+            'sections': sections,
+            'active': chapter.url_name == active_chapter
+        })
+    return {
+        'chapters': toc_chapters,
+        'previous_of_active_section': previous_of_active_section,
+        'next_of_active_section': next_of_active_section,
+    }
 
 
 def _add_timed_exam_info(user, course, section, section_context):
@@ -261,7 +346,7 @@ def _add_timed_exam_info(user, course, section, section_context):
     Add in rendering context if exam is a timed exam (which includes proctored)
     """
     section_is_time_limited = (
-        getattr(section, 'is_time_limited', False) and
+        section.is_time_limited and
         settings.FEATURES.get('ENABLE_SPECIAL_EXAMS', False)
     )
     if section_is_time_limited:
@@ -733,29 +818,23 @@ def get_module_system_for_user(
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
+    # Rewrite, in a single pass over the fragment:
+    #  - urls beginning in /static to point to course-specific content
+    #  - urls of the form '/course/' to refer to the root of multicourse directory
+    #    hierarchy of this course
+    #  - intra-courseware links (/jump_to_id/<id>). This format is an improvement over
+    #    the /course/... format for studio authored courses, because it is agnostic to
+    #    course-hierarchy.
+    # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
+    # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_static_urls,
+        replace_urls,
         getattr(descriptor, 'data_dir', None),
         course_id=course_id,
+        jump_to_id_base_url=reverse('jump_to_id', kwargs={'course_id': text_type(course_id), 'module_id': ''}),
         static_asset_path=static_asset_path or descriptor.static_asset_path
     ))
 
-    # Allow URLs of the form '/course/' refer to the root of multicourse directory
-    #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
-    # is an improvement over the /course/... format for studio authored courses,
-    # because it is agnostic to course-hierarchy.
-    # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
-    # function, we just need to specify something to get the reverse() to work.
-    block_wrappers.append(partial(
-        replace_jump_to_id_urls,
-        course_id,
-        reverse('jump_to_id', kwargs={'course_id': text_type(course_id), 'module_id': ''}),
-    ))
-
     block_wrappers.append(partial(display_access_messages, user))
     block_wrappers.append(partial(course_expiration_wrapper, user))
     block_wrappers.append(partial(offer_banner_wrapper, user))
@@ -816,6 +895,18 @@ def get_module_system_for_user(
             "notifications": NotificationsService(),
         })
 
+    if COURSEWARE_XBLOCK_FRAGMENT_CACHE.is_enabled(course_id):
+        services_list['fragment_cache'] = XBlockFragmentCacheService(user, course_id, course=course)
+
+    render_metrics_recorder = None
+    if COURSEWARE_XBLOCK_RENDER_METRICS.is_enabled(course_id):
+        render_metrics_sinks = get_render_metrics_sinks()
+        if user_is_staff:
+            # for the staff-only render metrics panel
+            render_metrics_sinks.append(RequestRenderMetricsSink())
+        if render_metrics_sinks:
+            render_metrics_recorder = RenderMetricsRecorder(render_metrics_sinks)
+
     system = LmsModuleSystem(
         track_function=track_function,
         render_template=render_to_string,
@@ -862,6 +953,7 @@ def get_module_system_for_user(
         rebind_noauth_module_to_user=rebind_noauth_module_to_user,
         user_location=user_location,
         request_token=request_token,
+        render_metrics_recorder=render_metrics_recorder,
     )
 
     # pass position specified in URL to module through ModuleSystem
@@ -0,0 +1,206 @@
+"""
+Measures how long each XBlock takes to render, and how many queries it makes.
+
+When the courseware.xblock_render_metrics waffle flag is enabled for a course,
+the runtime of each block in it records, for every view of the block that is
+rendered, a BlockRenderMetrics in each of the sinks listed in the
+XBLOCK_RENDER_METRICS_SINKS setting, and, for staff, in the request's
+RequestRenderMetricsSink, which is shown in the courseware's staff-only
+render metrics panel.
+
+Blocks render their children while they render, so the duration and query
+counts of a block include those of its children. own_duration is the time
+spent rendering the block itself.
+"""
+
+
+import logging
+import time
+from abc import ABCMeta, abstractmethod
+from collections import namedtuple
+from contextlib import contextmanager
+
+import six
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import set_custom_metric
+
+from xmodule.mongo_utils import COMMAND_COUNTER
+
+log = logging.getLogger(__name__)
+
+RENDER_METRICS_CACHE_NAMESPACE = 'courseware.render_metrics'
+
+BlockRenderMetrics = namedtuple('BlockRenderMetrics', [
+    'usage_key',
+    'block_type',
+    'view_name',
+    'duration',
+    'own_duration',
+    'sql_queries',
+    'mongo_queries',
+    'fragment_size',
+])
+
+
+class RenderMetricsSink(six.with_metaclass(ABCMeta, object)):
+    """
+    Receives the metrics of the blocks rendered.
+    """
+    @abstractmethod
+    def record(self, metrics):
+        """
+        Records the BlockRenderMetrics of a rendered view of a block.
+        """
+        pass
+
+
+class LogRenderMetricsSink(RenderMetricsSink):
+    """
+    Logs the metrics of each block rendered.
+    """
+    def record(self, metrics):
+        log.info(
+            u'Rendered %s %s of %s in %.3fs (%.3fs own), %d SQL queries, %d Mongo queries, %d bytes',
+            metrics.block_type,
+            metrics.view_name,
+            metrics.usage_key,
+            metrics.duration,
+            metrics.own_duration,
+            metrics.sql_queries,
+            metrics.mongo_queries,
+            metrics.fragment_size,
+        )
+
+
+class MonitoringRenderMetricsSink(RenderMetricsSink):
+    """
+    Sets custom metrics on the request's monitoring transaction, totalling the
+    time spent rendering each block type, and the queries made while doing so.
+    """
+    FIELDS = ('own_duration', 'sql_queries', 'mongo_queries', 'fragment_size')
+
+    def record(self, metrics):
+        totals = RequestCache(RENDER_METRICS_CACHE_NAMESPACE).data.setdefault('monitoring_totals', {})
+        for field in self.FIELDS:
+            name = u'xblock_render.{}.{}'.format(metrics.block_type, field)
+            totals[name] = totals.get(name, 0) + getattr(metrics, field)
+            set_custom_metric(name, totals[name])
+
+
+class RequestRenderMetricsSink(RenderMetricsSink):
+    """
+    Keeps the metrics of the blocks rendered during the current request in memory.
+    """
+    def record(self, metrics):
+        self.recorded().append(metrics)
+
+    @staticmethod
+    def recorded():
+        """
+        Returns the list of BlockRenderMetrics recorded during the current request.
+        """
+        return RequestCache(RENDER_METRICS_CACHE_NAMESPACE).data.setdefault('recorded', [])
+
+
+def get_render_metrics_sinks():
+    """
+    Returns instances of the sinks listed in the XBLOCK_RENDER_METRICS_SINKS setting.
+    """
+    return [import_string(sink_path)() for sink_path in getattr(settings, 'XBLOCK_RENDER_METRICS_SINKS', [])]
+
+
+def summarize_by_block_type(metrics_list):
+    """
+    Returns a list of (block_type, number of views rendered, total own duration,
+    total fragment size) tuples, sorted by decreasing own duration.
+
+    Only the own duration is totalled, as the other measurements of a block
+    include those of its children.
+    """
+    totals = {}
+    for metrics in metrics_list:
+        count, own_duration, fragment_size = totals.get(metrics.block_type, (0, 0, 0))
+        totals[metrics.block_type] = (
+            count + 1, own_duration + metrics.own_duration, fragment_size + metrics.fragment_size
+        )
+    return sorted(
+        (
+            (block_type, count, own_duration, fragment_size)
+            for block_type, (count, own_duration, fragment_size) in totals.items()
+        ),
+        key=lambda summary: summary[2],
+        reverse=True,
+    )
+
+
+class _SqlQueryCounter(object):
+    """
+    A database execute wrapper that counts the queries executed.
+    """
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def _count_sql_queries(counter):
+    """
+    Counts the queries made on any of the databases with counter.
+    """
+    databases = connections.all()
+    for connection in databases:
+        connection.execute_wrappers.append(counter)
+    try:
+        yield
+    finally:
+        for connection in databases:
+            connection.execute_wrappers.remove(counter)
+
+
+class RenderMetricsRecorder(object):
+    """
+    Measures the rendering of blocks by a runtime, and records the measurements
+    in sinks.
+    """
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def render(self, block, view_name, render):
+        """
+        Calls render, the function that renders the view of the block, and
+        records its measurements. Returns the rendered Fragment.
+        """
+        # The stack of the total durations of the children of the blocks being rendered
+        children_durations = RequestCache(RENDER_METRICS_CACHE_NAMESPACE).data.setdefault('children_durations', [])
+        children_durations.append(0)
+        sql_counter = _SqlQueryCounter()
+        mongo_queries = COMMAND_COUNTER.count
+        start_time = time.time()
+        try:
+            with _count_sql_queries(sql_counter):
+                fragment = render()
+        finally:
+            duration = time.time() - start_time
+            own_duration = duration - children_durations.pop()
+            if children_durations:
+                children_durations[-1] += duration
+
+        metrics = BlockRenderMetrics(
+            usage_key=block.scope_ids.usage_id,
+            block_type=block.scope_ids.block_type,
+            view_name=view_name,
+            duration=duration,
+            own_duration=own_duration,
+            sql_queries=sql_counter.count,
+            mongo_queries=COMMAND_COUNTER.count - mongo_queries,
+            fragment_size=len(fragment.content or u''),
+        )
+        for sink in self.sinks:
+            sink.record(metrics)
+        return fragment
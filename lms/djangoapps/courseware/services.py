@@ -3,12 +3,25 @@ Courseware services.
 """
 
 
+import hashlib
 import json
 
+import six
+from completion.services import CompletionService
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.translation import get_language
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
+from web_fragments.fragment import Fragment
 
+from lms.djangoapps.courseware.field_overrides import OverrideFieldData
+from lms.djangoapps.courseware.masquerade import get_course_masquerade
 from lms.djangoapps.courseware.models import StudentModule
+from openedx.core.djangoapps.theming.helpers import get_current_theme
 from student.models import get_user_by_username_or_email
+from xmodule.modulestore.django import modulestore
+from xmodule.partitions.partitions_service import PartitionService
 
 
 class UserStateService(object):
@@ -39,3 +52,143 @@ class UserStateService(object):
             return json.loads(student_module.state)
         except StudentModule.DoesNotExist:
             return {}
+
+
+class CoursewareCompletionService(CompletionService):
+    """
+    Completion service that can look up the completion of several verticals at once.
+    """
+
+    def verticals_are_complete(self, items):
+        """
+        Returns a dict mapping the location of each of the given verticals to
+        whether it is complete, following the same rules as vertical_is_complete,
+        with the completions of all of their children fetched in a single query.
+        """
+        if any(item.location.block_type != 'vertical' for item in items):
+            raise ValueError('The passed in xblocks are not all of vertical type!')
+
+        if not self.completion_tracking_enabled():
+            return {item.location: None for item in items}
+
+        child_locations_by_vertical = {
+            item.location: [
+                child.location for child in item.get_children() if child.location.block_type != 'discussion'
+            ]
+            for item in items
+        }
+        completions = self.get_completions([
+            child_location
+            for child_locations in child_locations_by_vertical.values()
+            for child_location in child_locations
+        ])
+        return {
+            vertical_location: all(completions[child_location] >= 1.0 for child_location in child_locations)
+            for vertical_location, child_locations in child_locations_by_vertical.items()
+        }
+
+
+class XBlockFragmentCacheService(object):
+    """
+    Shares the fragments of XBlock views that do not depend on the user between users.
+
+    Fragments are cached per usage key, content version, view, language, theme
+    and the user's groups in the partitions the block is restricted to.  The
+    content version is the version of the course structure the block was loaded
+    from, or the block's edit time for courses without versioned structures, so
+    publishing new content makes the old fragments unreachable.
+
+    XBlocks use this service by declaring that they want the 'fragment_cache'
+    service, and only for views whose output is the same for all users.
+
+    Nothing is cached for users whose views of the course's blocks may differ
+    from those of other users in the same groups: when field overrides (such
+    as CCX or individual due dates) are enabled for the course, while the
+    user is masquerading, or when student notes are enabled, since annotatable
+    blocks then embed the user's notes token in their views.
+    """
+    CACHE_KEY_PREFIX = u'xblock_fragment_cache'
+
+    def __init__(self, user, course_id, course=None):
+        self._user = user
+        self._course_id = course_id
+        self._course = course
+        self._is_user_cacheable = None
+        self._partition_service = PartitionService(course_id, cache=DEFAULT_REQUEST_CACHE.data)
+
+    def get(self, block, view_name):
+        """
+        Returns the cached Fragment of the given view of the block, or None.
+        """
+        cache_key = self._cache_key(block, view_name)
+        if cache_key is None:
+            return None
+        fragment_data = cache.get(cache_key)
+        if fragment_data is None:
+            return None
+        return Fragment.from_dict(fragment_data)
+
+    def set(self, block, view_name, fragment):
+        """
+        Caches the Fragment rendered by the given view of the block.
+        """
+        cache_key = self._cache_key(block, view_name)
+        if cache_key is not None:
+            cache.set(cache_key, fragment.to_dict(), settings.XBLOCK_FRAGMENT_CACHE_TIMEOUT)
+
+    def _cache_key(self, block, view_name):
+        """
+        Returns the cache key of the given view of the block, or None if the
+        version of the block's content is unknown or the view is not to be
+        cached for the user.
+        """
+        if not self._is_cacheable_for_user():
+            return None
+        content_version = self._content_version(block)
+        if content_version is None:
+            return None
+        theme = get_current_theme()
+        key_parts = [
+            six.text_type(block.scope_ids.usage_id),
+            six.text_type(content_version),
+            view_name,
+            get_language() or u'',
+            theme.theme_dir_name if theme else u'',
+        ]
+        for partition_id in sorted(getattr(block, 'group_access', None) or {}):
+            try:
+                group_id = self._partition_service.get_user_group_id_for_partition(self._user, partition_id)
+            except ValueError:
+                group_id = None
+            key_parts.append(u'{}:{}'.format(partition_id, group_id))
+        key_hash = hashlib.md5(u'|'.join(key_parts).encode('utf-8')).hexdigest()
+        return u'{}.{}'.format(self.CACHE_KEY_PREFIX, key_hash)
+
+    def _is_cacheable_for_user(self):
+        """
+        Returns whether the user's views of the course's blocks can be
+        shared with other users.
+        """
+        if self._is_user_cacheable is None:
+            # Import is placed here to avoid model import at project startup.
+            from edxnotes.helpers import is_feature_enabled as is_edxnotes_enabled
+
+            real_user = getattr(self._user, 'real_user', self._user)
+            course = self._course or modulestore().get_course(self._course_id)
+            self._is_user_cacheable = not (
+                get_course_masquerade(real_user, self._course_id) or
+                OverrideFieldData.has_providers_for_course(course) or
+                is_edxnotes_enabled(course, self._user)
+            )
+        return self._is_user_cacheable
+
+    @staticmethod
+    def _content_version(block):
+        """
+        Returns the version of the course structure the block was loaded from,
+        or the block's edit time if its modulestore does not version structures.
+        """
+        course_entry = getattr(block.runtime, 'course_entry', None)
+        if course_entry is not None:
+            return course_entry.structure['_id']
+        return getattr(block, 'edited_on', None)
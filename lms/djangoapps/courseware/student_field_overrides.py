@@ -6,11 +6,16 @@ by the individual due dates feature.
 
 import json
 
+import six
+
 from lms.djangoapps.courseware.models import StudentFieldOverride
+from openedx.core.lib.cache_utils import get_cache
 from openedx.core.lib.xblock_utils import is_xblock_aside
 
 from .field_overrides import FieldOverrideProvider
 
+PREFETCHED_OVERRIDES_CACHE_NAME = 'student-field-overrides'
+
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
     """
@@ -21,6 +26,10 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
+    @classmethod
+    def prefetch(cls, user, course_key, blocks):
+        prefetch_overrides_for_user(user, course_key)
+
     @classmethod
     def enabled_for(cls, course):
         """This simple override provider is always enabled"""
@@ -42,6 +51,47 @@ def get_override_for_user(user, block, name, default=None):
     return overrides.get(name, default)
 
 
+def prefetch_overrides_for_user(user, course_key):
+    """
+    Loads all of the individual student overrides for the given user in the
+    given course with a single query, so that getting the overrides of each
+    block the user views doesn't need a query of its own.
+
+    Does nothing if the overrides are already prefetched in this request.
+    """
+    cache = get_cache(PREFETCHED_OVERRIDES_CACHE_NAME)
+    cache_key = _prefetch_cache_key(user, course_key)
+    if cache_key in cache:
+        return
+
+    overrides_by_location = {}
+    query = StudentFieldOverride.objects.filter(
+        course_id=course_key,
+        student_id=user.id,
+    )
+    for override in query:
+        block_overrides = overrides_by_location.setdefault(_clean_key(override.location), {})
+        block_overrides[override.field] = override.value
+    cache[cache_key] = overrides_by_location
+
+
+def _prefetch_cache_key(user, course_key):
+    """
+    Returns the key of the prefetched overrides of a user in a course.
+    """
+    return user.id, six.text_type(_clean_key(course_key))
+
+
+def _clean_key(key):
+    """
+    Strips any version and branch information from the given course or usage
+    key, as is done when it is stored.
+    """
+    if hasattr(key, 'version_agnostic') and hasattr(key, 'for_branch'):
+        return key.for_branch(None).version_agnostic()
+    return key
+
+
 def _get_overrides_for_user(user, block):
     """
     Gets all of the individual student overrides for given user and block.
@@ -56,16 +106,24 @@ def _get_overrides_for_user(user, block):
     else:
         location = block.location
 
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=location,
-        student_id=user.id,
+    prefetched_overrides = get_cache(PREFETCHED_OVERRIDES_CACHE_NAME).get(
+        _prefetch_cache_key(user, block.runtime.course_id)
     )
+    if prefetched_overrides is not None:
+        serialized_overrides = six.iteritems(prefetched_overrides.get(_clean_key(location), {}))
+    else:
+        query = StudentFieldOverride.objects.filter(
+            course_id=block.runtime.course_id,
+            location=location,
+            student_id=user.id,
+        )
+        serialized_overrides = ((override.field, override.value) for override in query)
+
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, serialized_value in serialized_overrides:
+        field = block.fields[field_name]
+        value = field.from_json(json.loads(serialized_value))
+        overrides[field_name] = value
     return overrides
 
 
@@ -83,6 +141,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _discard_prefetched_overrides(user, block)
 
 
 def clear_override_for_user(user, block, name):
@@ -100,3 +159,12 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _discard_prefetched_overrides(user, block)
+
+
+def _discard_prefetched_overrides(user, block):
+    """
+    Discards the prefetched overrides of the user in the block's course, once
+    they have been changed.
+    """
+    get_cache(PREFETCHED_OVERRIDES_CACHE_NAME).pop(_prefetch_cache_key(user, block.runtime.course_id), None)
@@ -0,0 +1,108 @@
+"""
+Asynchronous tasks for the courseware app.
+"""
+
+
+import logging
+
+import six
+from celery import task
+from django.conf import settings
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
+from xmodule.capa_base import randomization_seeds
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore
+from xmodule.util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
+
+log = logging.getLogger(__name__)
+
+
+@task(name=u'lms.djangoapps.courseware.tasks.flush_coalesced_user_state')
+def flush_coalesced_user_state(username, usage_key_string):
+    """
+    Saves the user state buffered by DjangoXBlockUserStateClient for the given
+    user and block to its StudentModule.
+    """
+    DjangoXBlockUserStateClient().flush_buffered_state(username, UsageKey.from_string(usage_key_string))
+
+
+class ProblemContextCache(object):
+    """
+    The cache of the contexts of problems, as used by capa, that keeps the
+    contexts for PROBLEM_CONTEXT_CACHE_TIMEOUT seconds.
+    """
+    def get(self, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.touch(key, settings.PROBLEM_CONTEXT_CACHE_TIMEOUT)
+        return value
+
+    def set(self, key, value):
+        cache.set(key, value, settings.PROBLEM_CONTEXT_CACHE_TIMEOUT)
+
+
+def _problem_capa_system(problem, context_cache):
+    """
+    Returns a LoncapaSystem for computing the contexts of the problem for any
+    learner.
+    """
+    course_key = problem.location.course_key
+    return LoncapaSystem(
+        ajax_url=None,
+        anonymous_student_id=None,
+        cache=context_cache,
+        can_execute_unsafe_code=lambda: can_execute_unsafe_code(course_key),
+        get_python_lib_zip=lambda: get_python_lib_zip(contentstore, course_key),
+        DEBUG=settings.DEBUG,
+        filestore=problem.runtime.resources_fs,
+        i18n=problem.runtime.service(problem, 'i18n'),
+        node_path=settings.NODE_PATH,
+        render_template=None,
+        seed=None,
+        STATIC_URL=settings.STATIC_URL,
+        xqueue=None,
+    )
+
+
+@task(name=u'lms.djangoapps.courseware.tasks.precompute_problem_contexts')
+def precompute_problem_contexts(course_key_string):
+    """
+    Executes the scripts of the course's problems for each seed their learners
+    can get, and caches the resulting contexts, so that the learners load them
+    from the cache instead of executing the scripts when they first see the
+    problems.
+
+    The contexts of the problems whose scripts use the learner's id, and of
+    the problems randomized "always" or "on reset", aren't computed.
+    """
+    course_key = CourseKey.from_string(course_key_string)
+    store = modulestore()
+    context_cache = ProblemContextCache()
+    computed = 0
+    with store.bulk_operations(course_key):
+        for problem in store.get_items(course_key, qualifiers={'category': 'problem'}):
+            seeds = randomization_seeds(problem.rerandomize)
+            if not seeds or '<script' not in problem.data or 'anonymous_student_id' in problem.data:
+                continue
+            capa_system = _problem_capa_system(problem, context_cache)
+            try:
+                for seed in seeds:
+                    LoncapaProblem(
+                        problem.data,
+                        problem.location.html_id(),
+                        capa_system,
+                        capa_module=problem,
+                        seed=seed,
+                        extract_tree=False,
+                    )
+            except Exception as ex:  # pylint: disable=broad-except
+                log.warning(
+                    u'Could not compute the contexts of problem %s: %s', problem.location, six.text_type(ex)
+                )
+                continue
+            computed += 1
+    log.info(u'Computed the contexts of %d problems of course %s', computed, course_key)
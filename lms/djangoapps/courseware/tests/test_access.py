@@ -7,14 +7,18 @@ Test the access control framework
 import datetime
 import itertools
 
+import crum
 import ddt
 import pytz
 import six
 from ccx_keys.locator import CCXLocator
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from edx_django_utils.cache import RequestCache
 from milestones.tests.utils import MilestonesTestCaseMixin
 from mock import Mock, patch
 from opaque_keys.edx.locator import CourseLocator
@@ -30,9 +34,10 @@ from lms.djangoapps.courseware.tests.factories import (
     UserFactory
 )
 from lms.djangoapps.courseware.tests.helpers import LoginEnrollmentTestCase, masquerade_as_group_member
+from lms.djangoapps.courseware.toggles import COURSEWARE_ACCESS_DECISION_CACHE
 from lms.djangoapps.ccx.models import CustomCourseForEdX
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
-from openedx.core.djangoapps.waffle_utils.testutils import WAFFLE_TABLES
+from openedx.core.djangoapps.waffle_utils.testutils import WAFFLE_TABLES, override_waffle_flag
 from openedx.features.content_type_gating.models import ContentTypeGatingConfig
 from student.models import CourseEnrollment
 from student.roles import CourseCcxCoachRole, CourseStaffRole
@@ -868,3 +873,101 @@ class CourseOverviewAccessTestCase(ModuleStoreTestCase):
         course_overview = CourseOverview.get_from_id(course.id)
         with self.assertNumQueries(num_queries, table_blacklist=QUERY_COUNT_TABLE_BLACKLIST):
             bool(access.has_access(user, action, course_overview, course_key=course.id))
+
+
+class AccessDecisionCacheTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
+    """
+    Tests for the request-scoped memoization of access decisions.
+    """
+    MODULESTORE = TEST_DATA_SPLIT_MODULESTORE
+
+    def setUp(self):
+        super(AccessDecisionCacheTestCase, self).setUp()
+        self.course = CourseFactory.create(org='edX', course='toy', run='test_run')
+        with self.store.bulk_operations(self.course.id):
+            self.chapter = ItemFactory.create(parent=self.course, category='chapter')
+            self.sequential = ItemFactory.create(parent=self.chapter, category='sequential')
+            for _ in range(3):
+                vertical = ItemFactory.create(parent=self.sequential, category='vertical')
+                ItemFactory.create(parent=vertical, category='html')
+        self.course_staff = StaffFactory(course_key=self.course.id)
+
+        crum.set_current_request(RequestFactory().get('/'))
+        self.addCleanup(crum.set_current_request, None)
+        RequestCache.clear_all_namespaces()
+
+    def _count_evaluations(self, user, action, obj, times):
+        """
+        Calls has_access the given number of times and returns how many of
+        the calls evaluated the access rules.
+        """
+        with patch.object(access, '_has_access', wraps=access._has_access) as mock_has_access:
+            for _ in range(times):
+                access.has_access(user, action, obj, self.course.id)
+        return mock_has_access.call_count
+
+    @override_waffle_flag(COURSEWARE_ACCESS_DECISION_CACHE, active=True)
+    def test_decisions_memoized(self):
+        self.assertEqual(self._count_evaluations(self.course_staff, 'staff', self.sequential, 3), 1)
+        with self.assertNumQueries(0, table_blacklist=QUERY_COUNT_TABLE_BLACKLIST):
+            self.assertTrue(access.has_access(self.course_staff, 'staff', self.sequential, self.course.id))
+
+    @override_waffle_flag(COURSEWARE_ACCESS_DECISION_CACHE, active=False)
+    def test_decisions_not_memoized_when_disabled(self):
+        self.assertEqual(self._count_evaluations(self.course_staff, 'staff', self.sequential, 3), 3)
+
+    @override_waffle_flag(COURSEWARE_ACCESS_DECISION_CACHE, active=True)
+    def test_decisions_not_memoized_outside_request(self):
+        crum.set_current_request(None)
+        self.assertEqual(self._count_evaluations(self.course_staff, 'staff', self.sequential, 3), 3)
+
+    @override_waffle_flag(COURSEWARE_ACCESS_DECISION_CACHE, active=True)
+    def test_masquerade_change(self):
+        self.assertTrue(access.has_access(self.course_staff, 'staff', self.sequential, self.course.id))
+
+        self.course_staff.masquerade_settings = {
+            self.course.id: CourseMasquerade(self.course.id, role='student')
+        }
+        self.assertFalse(access.has_access(self.course_staff, 'staff', self.sequential, self.course.id))
+
+        self.course_staff.masquerade_settings[self.course.id] = CourseMasquerade(self.course.id, role='staff')
+        self.assertTrue(access.has_access(self.course_staff, 'staff', self.sequential, self.course.id))
+
+    def _courseware_page_cost(self):
+        """
+        Loads the courseware page of the sequential, and returns the number
+        of has_access calls made, the number of them that evaluated the access
+        rules, and the number of database queries.
+        """
+        url = reverse(
+            'courseware_section',
+            kwargs={
+                'course_id': six.text_type(self.course.id),
+                'chapter': self.chapter.location.block_id,
+                'section': self.sequential.location.block_id,
+            }
+        )
+        # Every has_access call looks up the decision cache, whether or not it is enabled
+        with patch.object(access, '_access_decision_cache', wraps=access._access_decision_cache) as mock_has_access:
+            with patch.object(access, '_has_access', wraps=access._has_access) as mock_evaluate:
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return mock_has_access.call_count, mock_evaluate.call_count, len(queries)
+
+    def test_courseware_page_benchmark(self):
+        """
+        Compares the cost of access checks on a courseware page with and
+        without memoized access decisions.
+        """
+        self.setup_user()
+        self.enroll(self.course)
+
+        with override_waffle_flag(COURSEWARE_ACCESS_DECISION_CACHE, active=False):
+            calls, uncached_evaluations, uncached_queries = self._courseware_page_cost()
+        with override_waffle_flag(COURSEWARE_ACCESS_DECISION_CACHE, active=True):
+            cached_calls, cached_evaluations, cached_queries = self._courseware_page_cost()
+
+        self.assertEqual(calls, cached_calls)
+        self.assertLess(cached_evaluations, uncached_evaluations)
+        self.assertLessEqual(cached_queries, uncached_queries)
@@ -1,22 +1,32 @@
 """
 Tests for `field_overrides` module.
 """
+import datetime
 import unittest
 
-from django.test.utils import override_settings
+import pytz
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from xblock.field_data import DictFieldData
 
-from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
-from xmodule.modulestore.tests.factories import CourseFactory
+from openedx.core.djangoapps.waffle_utils.testutils import override_waffle_flag
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 from ..field_overrides import (
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
     disable_overrides,
+    prefetch_overrides,
     resolve_dotted
 )
+from ..model_data import FieldDataCache
+from ..models import StudentFieldOverride
+from ..student_field_overrides import clear_override_for_user, get_override_for_user, override_field_for_user
 from ..testutils import FieldOverrideTestMixin
+from ..toggles import COURSEWARE_PREFETCH_FIELD_OVERRIDES
 
 TESTUSER = "testuser"
 
@@ -145,6 +155,88 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+class TestPrefetchingOverrideProvider(TestOverrideProvider):
+    """
+    A `FieldOverrideProvider` which records the blocks it is asked to prefetch.
+    """
+    prefetched = []
+
+    @classmethod
+    def prefetch(cls, user, course_key, blocks):
+        cls.prefetched.append((user, course_key, list(blocks)))
+
+
+@override_settings(
+    FIELD_OVERRIDE_PROVIDERS=(
+        'lms.djangoapps.courseware.tests.test_field_overrides.TestPrefetchingOverrideProvider',
+        'lms.djangoapps.courseware.student_field_overrides.IndividualStudentOverrideProvider',
+    ),
+    MODULESTORE_FIELD_OVERRIDE_PROVIDERS=[],
+)
+class PrefetchOverridesTests(FieldOverrideTestMixin, ModuleStoreTestCase):
+    """
+    Tests for `prefetch_overrides`.
+    """
+
+    def setUp(self):
+        super(PrefetchOverridesTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+        self.addCleanup(setattr, OverrideFieldData, 'provider_classes', None)
+        TestPrefetchingOverrideProvider.prefetched = []
+
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        self.sequentials = [
+            ItemFactory.create(parent=chapter, category='sequential')
+            for _ in range(3)
+        ]
+        self.user = UserFactory.create()
+        self.due = datetime.datetime(2030, 1, 1, tzinfo=pytz.UTC)
+        override_field_for_user(self.user, self.sequentials[0], 'due', self.due)
+
+    def _get_due_dates(self):
+        """
+        Returns the overridden due dates of the sequentials, read from
+        freshly loaded blocks.
+        """
+        return [
+            get_override_for_user(self.user, self.store.get_item(sequential.location), 'due')
+            for sequential in self.sequentials
+        ]
+
+    def test_providers_prefetch(self):
+        prefetch_overrides(self.user, self.course.id, self.sequentials)
+        self.assertEqual(TestPrefetchingOverrideProvider.prefetched, [(self.user, self.course.id, self.sequentials)])
+
+    def test_overrides_read_from_prefetch(self):
+        with self.assertNumQueries(1):
+            prefetch_overrides(self.user, self.course.id, self.sequentials)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_due_dates(), [self.due, None, None])
+
+    @override_waffle_flag(COURSEWARE_PREFETCH_FIELD_OVERRIDES, active=True)
+    def test_successive_field_data_cache_adds_prefetch_once(self):
+        field_data_cache = FieldDataCache([], self.course.id, self.user)
+        with CaptureQueriesContext(connection) as queries:
+            field_data_cache.add_descriptors_to_cache(self.sequentials[:1])
+            field_data_cache.add_descriptors_to_cache(self.sequentials[1:])
+        override_queries = [
+            query for query in queries.captured_queries
+            if StudentFieldOverride._meta.db_table in query['sql']  # pylint: disable=protected-access
+        ]
+        self.assertEqual(len(override_queries), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_due_dates(), [self.due, None, None])
+
+    def test_changed_overrides_discard_prefetch(self):
+        prefetch_overrides(self.user, self.course.id, self.sequentials)
+        self.assertEqual(self._get_due_dates(), [self.due, None, None])
+
+        clear_override_for_user(self.user, self.sequentials[0], 'due')
+        override_field_for_user(self.user, self.sequentials[1], 'due', self.due)
+        self.assertEqual(self._get_due_dates(), [None, self.due, None])
+
+
 class ResolveDottedTests(unittest.TestCase):
     """
     Tests for `resolve_dotted`.
@@ -1157,6 +1157,18 @@ class TestTOC(ModuleStoreTestCase):
             self.assertEqual(actual['previous_of_active_section']['url_name'], 'Toy_Videos')
             self.assertEqual(actual['next_of_active_section']['url_name'], 'video_123456789012')
 
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0), (ModuleStoreEnum.Type.split, 2, 0))
+    @ddt.unpack
+    def test_toc_from_course_blocks(self, default_ms, setup_finds, setup_sends):
+        with self.store.default_store(default_ms):
+            self.setup_request_and_course(setup_finds, setup_sends)
+            section = 'Welcome'
+            expected = render.toc_for_course(
+                self.request.user, self.request, self.toy_course, self.chapter, section, self.field_data_cache
+            )
+            actual = render.toc_for_course_blocks(self.request.user, self.toy_course, self.chapter, section)
+            self.assertEqual(actual, expected)
+
 
 @ddt.ddt
 @patch.dict('django.conf.settings.FEATURES', {'ENABLE_SPECIAL_EXAMS': True})
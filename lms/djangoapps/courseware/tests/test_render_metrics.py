@@ -0,0 +1,123 @@
+"""
+Tests for the measurement of XBlock rendering.
+"""
+
+
+from django.test import TestCase
+from edx_django_utils.cache import RequestCache
+from mock import Mock, patch
+from web_fragments.fragment import Fragment
+
+from lms.djangoapps.courseware import module_render as render
+from lms.djangoapps.courseware.model_data import FieldDataCache
+from lms.djangoapps.courseware.render_metrics import (
+    RENDER_METRICS_CACHE_NAMESPACE,
+    BlockRenderMetrics,
+    RenderMetricsRecorder,
+    RequestRenderMetricsSink,
+    summarize_by_block_type
+)
+from lms.djangoapps.courseware.toggles import COURSEWARE_XBLOCK_RENDER_METRICS
+from openedx.core.djangoapps.waffle_utils.testutils import override_waffle_flag
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.x_module import STUDENT_VIEW
+
+
+def _block(block_type, block_id):
+    """
+    Returns a mock block of the given type.
+    """
+    return Mock(scope_ids=Mock(usage_id=u'{}/{}'.format(block_type, block_id), block_type=block_type))
+
+
+class RenderMetricsRecorderTestCase(TestCase):
+    """
+    Tests for RenderMetricsRecorder.
+    """
+    def setUp(self):
+        super(RenderMetricsRecorderTestCase, self).setUp()
+        RequestCache.clear_all_namespaces()
+        self.recorder = RenderMetricsRecorder([RequestRenderMetricsSink()])
+
+    @patch('lms.djangoapps.courseware.render_metrics.time.time')
+    def test_own_duration_excludes_children(self, mock_time):
+        # vertical starts at 0, html 1 renders from 1 to 3, html 2 from 4 to 5, vertical ends at 10
+        mock_time.side_effect = [0, 1, 3, 4, 5, 10]
+
+        def render_vertical():
+            self.recorder.render(_block('html', '1'), STUDENT_VIEW, lambda: Fragment(u'12345'))
+            self.recorder.render(_block('html', '2'), STUDENT_VIEW, lambda: Fragment(u'123'))
+            return Fragment(u'1234567890')
+
+        fragment = self.recorder.render(_block('vertical', '1'), STUDENT_VIEW, render_vertical)
+        self.assertEqual(fragment.content, u'1234567890')
+        self.assertEqual(
+            [(metrics.usage_key, metrics.duration, metrics.own_duration, metrics.fragment_size)
+             for metrics in RequestRenderMetricsSink.recorded()],
+            [(u'html/1', 2, 2, 5), (u'html/2', 1, 1, 3), (u'vertical/1', 10, 7, 10)],
+        )
+
+    def test_failed_render(self):
+        def render_failure():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            self.recorder.render(_block('html', '1'), STUDENT_VIEW, render_failure)
+        self.assertEqual(RequestRenderMetricsSink.recorded(), [])
+        self.assertEqual(RequestCache(RENDER_METRICS_CACHE_NAMESPACE).data['children_durations'], [])
+
+    def test_summarize_by_block_type(self):
+        metrics_list = [
+            BlockRenderMetrics(u'html/1', 'html', STUDENT_VIEW, 2, 2, 0, 0, 5),
+            BlockRenderMetrics(u'html/2', 'html', STUDENT_VIEW, 1, 1, 0, 0, 3),
+            BlockRenderMetrics(u'vertical/1', 'vertical', STUDENT_VIEW, 10, 7, 0, 0, 10),
+        ]
+        self.assertEqual(
+            summarize_by_block_type(metrics_list),
+            [('vertical', 1, 7, 10), ('html', 2, 3, 8)],
+        )
+
+
+class RenderMetricsModuleRenderTestCase(ModuleStoreTestCase):
+    """
+    Tests that the blocks rendered for staff are measured.
+    """
+    def setUp(self):
+        super(RenderMetricsModuleRenderTestCase, self).setUp()
+        RequestCache.clear_all_namespaces()
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        sequential = ItemFactory.create(parent=chapter, category='sequential')
+        self.vertical = ItemFactory.create(parent=sequential, category='vertical')
+        self.html_blocks = [ItemFactory.create(parent=self.vertical, category='html') for __ in range(2)]
+
+    def _render_vertical(self, user):
+        """
+        Renders the student view of the vertical for the user.
+        """
+        request = Mock(user=user, session={})
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(self.course.id, user, self.vertical)
+        module = render.get_module(user, request, self.vertical.location, field_data_cache)
+        module.render(STUDENT_VIEW)
+
+    @override_waffle_flag(COURSEWARE_XBLOCK_RENDER_METRICS, active=True)
+    def test_staff(self):
+        self._render_vertical(self.user)
+        self.assertEqual(
+            [metrics.usage_key for metrics in RequestRenderMetricsSink.recorded()],
+            [block.location for block in self.html_blocks] + [self.vertical.location],
+        )
+
+    @override_waffle_flag(COURSEWARE_XBLOCK_RENDER_METRICS, active=True)
+    def test_learner(self):
+        learner = UserFactory.create()
+        CourseEnrollmentFactory.create(user=learner, course_id=self.course.id)
+        self._render_vertical(learner)
+        self.assertEqual(RequestRenderMetricsSink.recorded(), [])
+
+    @override_waffle_flag(COURSEWARE_XBLOCK_RENDER_METRICS, active=False)
+    def test_disabled(self):
+        self._render_vertical(self.user)
+        self.assertEqual(RequestRenderMetricsSink.recorded(), [])
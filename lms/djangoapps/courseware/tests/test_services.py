@@ -7,9 +7,14 @@ import itertools
 import json
 
 import ddt
+from mock import patch
+from web_fragments.fragment import Fragment
 
-from lms.djangoapps.courseware.services import UserStateService
+from lms.djangoapps.courseware.field_overrides import OverrideFieldData
+from lms.djangoapps.courseware.masquerade import CourseMasquerade
+from lms.djangoapps.courseware.services import UserStateService, XBlockFragmentCacheService
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory, UserFactory
+from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
@@ -123,3 +128,65 @@ class TestUserStateService(ModuleStoreTestCase):
         self._create_student_module({'key_1': 'value_1'})
         state = UserStateService().get_state_as_dict(**params)
         self.assertFalse(state)
+
+
+@ddt.ddt
+class TestXBlockFragmentCacheService(ModuleStoreTestCase):
+    """
+    Test suite for the XBlock fragment cache service.
+    """
+    def setUp(self):
+        super(TestXBlockFragmentCacheService, self).setUp()
+        self.user = UserFactory.create()
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_cache_per_content_version(self, default_store):
+        with self.store.default_store(default_store):
+            course = CourseFactory.create()
+            html = ItemFactory.create(category='html', parent=course, data=u'<p>Original</p>')
+        fragment_cache = XBlockFragmentCacheService(self.user, course.id)
+
+        block = self.store.get_item(html.location)
+        self.assertIsNone(fragment_cache.get(block, 'student_view'))
+        fragment_cache.set(block, 'student_view', Fragment(block.data))
+        self.assertEqual(fragment_cache.get(block, 'student_view').content, u'<p>Original</p>')
+        self.assertIsNone(fragment_cache.get(block, 'public_view'))
+
+        # The same content is shared with other users
+        other_user_cache = XBlockFragmentCacheService(UserFactory.create(), course.id)
+        self.assertEqual(other_user_cache.get(block, 'student_view').content, u'<p>Original</p>')
+
+        # Publishing new content makes the cached fragment unreachable
+        html.data = u'<p>Updated</p>'
+        self.store.update_item(html, self.user.id)
+        self.store.publish(html.location, self.user.id)
+        self.assertIsNone(fragment_cache.get(self.store.get_item(html.location), 'student_view'))
+
+    def _assert_not_cached(self, fragment_cache, course):
+        """
+        Asserts that the given fragment cache doesn't cache the student view
+        of an html block of the course, or share it with other users.
+        """
+        html = ItemFactory.create(category='html', parent=course, data=u'<p>Content</p>')
+        block = self.store.get_item(html.location)
+        fragment_cache.set(block, 'student_view', Fragment(block.data))
+        self.assertIsNone(fragment_cache.get(block, 'student_view'))
+
+        other_user_cache = XBlockFragmentCacheService(UserFactory.create(), course.id)
+        other_user_cache.set(block, 'student_view', Fragment(block.data))
+        self.assertIsNone(fragment_cache.get(block, 'student_view'))
+
+    def test_not_cached_while_masquerading(self):
+        course = CourseFactory.create()
+        self.user.masquerade_settings = {course.id: CourseMasquerade(course.id, role='student')}
+        self._assert_not_cached(XBlockFragmentCacheService(self.user, course.id), course)
+
+    def test_not_cached_with_field_overrides(self):
+        course = CourseFactory.create()
+        with patch.object(OverrideFieldData, 'has_providers_for_course', return_value=True):
+            self._assert_not_cached(XBlockFragmentCacheService(self.user, course.id, course=course), course)
+
+    @patch('edxnotes.helpers.is_feature_enabled', return_value=True)
+    def test_not_cached_with_edxnotes(self, _mock_is_edxnotes_enabled):
+        course = CourseFactory.create()
+        self._assert_not_cached(XBlockFragmentCacheService(self.user, course.id), course)
@@ -0,0 +1,74 @@
+"""
+Tests for the asynchronous tasks of the courseware app.
+"""
+
+
+import textwrap
+
+import ddt
+import six
+from mock import patch
+
+from capa.tests.response_xml_factory import CustomResponseXMLFactory
+from lms.djangoapps.courseware.tasks import precompute_problem_contexts
+from xmodule.capa_base import NUM_RANDOMIZATION_BINS
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+SCRIPT = textwrap.dedent("""
+    x = random.randint(0, 100)
+""")
+
+
+@ddt.ddt
+class PrecomputeProblemContextsTestCase(ModuleStoreTestCase):
+    """
+    Tests for the precompute_problem_contexts task.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(PrecomputeProblemContextsTestCase, self).setUp()
+        self.course = CourseFactory.create()
+        self.vertical = ItemFactory.create(parent=self.course, category='vertical')
+
+    def create_problem(self, rerandomize, script=SCRIPT):
+        """
+        Creates a problem of the course with the script.
+        """
+        return ItemFactory.create(
+            parent=self.vertical,
+            category='problem',
+            rerandomize=rerandomize,
+            data=CustomResponseXMLFactory().build_xml(script=script, cfn='check', expect='$x'),
+        )
+
+    def precomputed_seeds(self):
+        """
+        Returns the seeds of the contexts computed by the task.
+        """
+        with patch('capa.capa_problem.safe_exec') as mock_safe_exec:
+            precompute_problem_contexts(six.text_type(self.course.id))
+        return sorted(call[1]['random_seed'] for call in mock_safe_exec.call_args_list)
+
+    @ddt.data(
+        ('per_student', list(range(NUM_RANDOMIZATION_BINS))),
+        ('never', [1]),
+        ('always', []),
+        ('onreset', []),
+    )
+    @ddt.unpack
+    def test_seeds(self, rerandomize, seeds):
+        self.create_problem(rerandomize)
+        self.assertEqual(self.precomputed_seeds(), seeds)
+
+    def test_script_using_learner(self):
+        self.create_problem('per_student', script='x = len(anonymous_student_id)')
+        self.assertEqual(self.precomputed_seeds(), [])
+
+    def test_precomputed_contexts_found(self):
+        self.create_problem('never')
+        precompute_problem_contexts(six.text_type(self.course.id))
+
+        # the precomputed context is found without executing the script again
+        self.assertEqual(self.precomputed_seeds(), [])
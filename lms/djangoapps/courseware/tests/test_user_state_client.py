@@ -4,10 +4,15 @@ defined in edx_user_state_client.
 """
 
 
+import json
 from collections import defaultdict
 
+from django.test import override_settings
 from edx_user_state_client.tests import UserStateClientTestBase
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
 
+from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.tests.factories import UserFactory
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -34,3 +39,60 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
         super(TestDjangoUserStateClient, self).setUp()
         self.client = DjangoXBlockUserStateClient()
         self.users = defaultdict(UserFactory.create)
+
+
+@override_settings(COALESCED_USER_STATE_FIELDS={'video': ['saved_video_position']})
+class TestCoalescedUserState(ModuleStoreTestCase):
+    """
+    Tests of the buffering of coalesced user state fields in DjangoUserStateClient.
+    """
+    def setUp(self):
+        super(TestCoalescedUserState, self).setUp()
+        self.user = UserFactory.create()
+        self.client = DjangoXBlockUserStateClient(self.user)
+        self.video_key = CourseLocator('org', 'course', 'run').make_usage_key('video', 'video')
+        flush_patcher = patch('lms.djangoapps.courseware.tasks.flush_coalesced_user_state.apply_async')
+        self.mock_flush = flush_patcher.start()
+        self.addCleanup(flush_patcher.stop)
+
+    def _stored_state(self):
+        """
+        Returns the state stored in the StudentModule of the video, or None.
+        """
+        student_module = StudentModule.objects.filter(student=self.user, module_state_key=self.video_key).first()
+        return json.loads(student_module.state) if student_module else None
+
+    def test_coalesced_writes(self):
+        self.client.set(self.user.username, self.video_key, {'saved_video_position': '00:00:10'})
+        self.client.set(self.user.username, self.video_key, {'saved_video_position': '00:00:20'})
+
+        self.assertEqual(self.mock_flush.call_count, 1)
+        self.assertIsNone(self._stored_state())
+        self.assertEqual(
+            self.client.get(self.user.username, self.video_key).state,
+            {'saved_video_position': '00:00:20'},
+        )
+
+        self.client.flush_buffered_state(self.user.username, self.video_key)
+        self.assertEqual(self._stored_state(), {'saved_video_position': '00:00:20'})
+        self.assertEqual(
+            self.client.get(self.user.username, self.video_key).state,
+            {'saved_video_position': '00:00:20'},
+        )
+
+    def test_other_fields_are_saved_with_buffered_state(self):
+        self.client.set(self.user.username, self.video_key, {'saved_video_position': '00:00:10'})
+        self.client.set(self.user.username, self.video_key, {'transcript_language': 'en'})
+
+        expected_state = {'saved_video_position': '00:00:10', 'transcript_language': 'en'}
+        self.assertEqual(self._stored_state(), expected_state)
+
+        # The buffered state was saved along with the other fields, so flushing changes nothing
+        self.client.flush_buffered_state(self.user.username, self.video_key)
+        self.assertEqual(self._stored_state(), expected_state)
+
+    def test_delete_discards_buffered_state(self):
+        self.client.set(self.user.username, self.video_key, {'saved_video_position': '00:00:10'})
+        self.client.delete(self.user.username, self.video_key)
+        self.client.flush_buffered_state(self.user.username, self.video_key)
+        self.assertIsNone(self._stored_state())
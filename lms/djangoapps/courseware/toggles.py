@@ -4,7 +4,7 @@ Toggles for courseware in-course experience.
 
 from django.conf import settings
 from lms.djangoapps.experiments.flags import ExperimentWaffleFlag
-from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag, WaffleFlagNamespace
+from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag, WaffleFlag, WaffleFlagNamespace
 
 # Namespace for courseware waffle flags.
 WAFFLE_FLAG_NAMESPACE = WaffleFlagNamespace(name='courseware')
@@ -39,6 +39,148 @@ REDIRECT_TO_COURSEWARE_MICROFRONTEND = ExperimentWaffleFlag(WAFFLE_FLAG_NAMESPAC
 COURSEWARE_MICROFRONTEND_COURSE_TEAM_PREVIEW = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'microfrontend_course_team_preview')
 
 
+# Waffle flag to build the courseware table of contents from the course's block structure.
+#
+# .. toggle_name: courseware.block_structure_toc
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Builds the courseware accordion from the collected block structure of the course instead of
+#   binding an XModule for every chapter and sequence on each courseware page load.
+# .. toggle_category: courseware
+# .. toggle_use_cases: incremental_release
+# .. toggle_creation_date: 2020-06-01
+# .. toggle_expiration_date: 2020-12-31
+# .. toggle_warnings: CCX courses always use the XModule-based table of contents.
+# .. toggle_tickets: None
+# .. toggle_status: supported
+COURSEWARE_BLOCK_STRUCTURE_TOC = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'block_structure_toc')
+
+
+# Waffle flag to render only the active unit of a sequence on the courseware page.
+#
+# .. toggle_name: courseware.lazy_unit_rendering
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Renders only the active unit of a sequence for authenticated learners. The other units are
+#   fetched from the xblock_view endpoint when they are selected.
+# .. toggle_category: courseware
+# .. toggle_use_cases: incremental_release
+# .. toggle_creation_date: 2020-06-01
+# .. toggle_expiration_date: 2020-12-31
+# .. toggle_warnings: Has no effect unless FEATURES['ENABLE_XBLOCK_VIEW_ENDPOINT'] is enabled.
+# .. toggle_tickets: None
+# .. toggle_status: supported
+COURSEWARE_LAZY_UNIT_RENDERING = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'lazy_unit_rendering')
+
+
+# Waffle flag to share the rendered fragments of user-independent XBlock views between learners.
+#
+# .. toggle_name: courseware.xblock_fragment_cache
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Provides the 'fragment_cache' XBlock service, which caches the fragments of views that
+#   render the same output for every learner, such as the student view of most HTML blocks.
+# .. toggle_category: courseware
+# .. toggle_use_cases: incremental_release
+# .. toggle_creation_date: 2020-06-01
+# .. toggle_expiration_date: 2020-12-31
+# .. toggle_warnings: Fragments are cached for settings.XBLOCK_FRAGMENT_CACHE_TIMEOUT seconds.
+# .. toggle_tickets: None
+# .. toggle_status: supported
+COURSEWARE_XBLOCK_FRAGMENT_CACHE = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'xblock_fragment_cache')
+
+
+# Waffle flag to memoize access decisions for the duration of a request.
+#
+# .. toggle_name: courseware.access_decision_cache
+# .. toggle_implementation: WaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Memoizes the result of has_access for repeated (user, action, object) checks made while
+#   serving a single request, such as the access checks made for every block rendered on a courseware page.
+# .. toggle_category: courseware
+# .. toggle_use_cases: incremental_release
+# .. toggle_creation_date: 2020-06-01
+# .. toggle_expiration_date: 2020-12-31
+# .. toggle_warnings: Decisions are only memoized within a request. Changes made to a user's roles, enrollments or to
+#   course content later in the same request are not reflected in decisions that were already made.
+# .. toggle_tickets: None
+# .. toggle_status: supported
+COURSEWARE_ACCESS_DECISION_CACHE = WaffleFlag(WAFFLE_FLAG_NAMESPACE, 'access_decision_cache')
+
+
+# Waffle flag to load the field overrides of all the blocks about to be rendered at once.
+#
+# .. toggle_name: courseware.prefetch_field_overrides
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Loads the individual due date and CCX field overrides for all of the blocks added to a
+#   FieldDataCache up front, instead of querying for the overrides of each block as its fields are read.
+# .. toggle_category: courseware
+# .. toggle_use_cases: incremental_release
+# .. toggle_creation_date: 2020-06-01
+# .. toggle_expiration_date: 2020-12-31
+# .. toggle_warnings: None
+# .. toggle_tickets: None
+# .. toggle_status: supported
+COURSEWARE_PREFETCH_FIELD_OVERRIDES = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'prefetch_field_overrides')
+
+
+# Waffle flag to find the paths to blocks, for jump_to links and bookmarks, in the collected block structure.
+#
+# .. toggle_name: courseware.block_structure_paths
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Resolves the chapter, section and position of a block from the parent and position index
+#   collected with the course's block structure, instead of walking up the modulestore from the block.
+# .. toggle_category: courseware
+# .. toggle_use_cases: incremental_release
+# .. toggle_creation_date: 2020-06-01
+# .. toggle_expiration_date: 2020-12-31
+# .. toggle_warnings: Blocks missing from the collected block structure, such as those published since it was last
+#   collected, and CCX courses still use the modulestore.
+# .. toggle_tickets: None
+# .. toggle_status: supported
+COURSEWARE_BLOCK_STRUCTURE_PATHS = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'block_structure_paths')
+
+
+# Waffle flag to measure the rendering of each XBlock.
+#
+# .. toggle_name: courseware.xblock_render_metrics
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Records the time taken to render each XBlock view, the SQL and Mongo queries made while
+#   rendering it and the size of the rendered fragment in the sinks listed in the XBLOCK_RENDER_METRICS_SINKS setting,
+#   and shows them to course staff in a panel below the courseware.
+# .. toggle_category: courseware
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2020-06-01
+# .. toggle_expiration_date: None
+# .. toggle_warnings: Adds some overhead to the rendering of every block in the course.
+# .. toggle_tickets: None
+# .. toggle_status: supported
+COURSEWARE_XBLOCK_RENDER_METRICS = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'xblock_render_metrics')
+
+
+# Waffle flag to compute the contexts of randomized problems when their course is published.
+#
+# .. toggle_name: courseware.precompute_problem_contexts
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When the course is published, executes the scripts of its problems randomized "per student"
+#   or "never" for each seed their learners can get, in a celery task, and caches the resulting contexts for
+#   PROBLEM_CONTEXT_CACHE_TIMEOUT seconds, so that learners don't wait for the scripts to be executed in the sandbox
+#   when they first see the problems.
+# .. toggle_category: courseware
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2020-06-01
+# .. toggle_expiration_date: None
+# .. toggle_warnings: Problems whose scripts use the learner's anonymous_student_id, and problems randomized "always"
+#   or "on reset", still execute their scripts for each learner.
+# .. toggle_tickets: None
+# .. toggle_status: supported
+COURSEWARE_PRECOMPUTE_PROBLEM_CONTEXTS = CourseWaffleFlag(WAFFLE_FLAG_NAMESPACE, 'precompute_problem_contexts')
+
+
 def should_redirect_to_courseware_microfrontend(course_key):
     return (
         settings.FEATURES.get('ENABLE_COURSEWARE_MICROFRONTEND') and
@@ -8,6 +8,7 @@ from django.conf import settings
 from django.urls import reverse
 from six.moves.urllib.parse import urlencode
 
+from lms.djangoapps.course_blocks.api import path_to_location_in_block_structure
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.search import navigation_index, path_to_location
 
@@ -29,7 +30,10 @@ def get_redirect_url(course_key, usage_key, request=None):
     (
         course_key, chapter, section, vertical_unused,
         position, final_target_id
-    ) = path_to_location(modulestore(), usage_key, request)
+    ) = (
+        path_to_location_in_block_structure(usage_key, request) or
+        path_to_location(modulestore(), usage_key, request)
+    )
 
     # choose the appropriate view (and provide the necessary args) based on the
     # args provided by the redirect.
@@ -4,6 +4,7 @@ data in a Django ORM model.
 """
 
 
+import hashlib
 import itertools
 import logging
 from operator import attrgetter
@@ -12,6 +13,7 @@ from time import time
 import six
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.paginator import Paginator
 from django.db import transaction
 from django.db.utils import IntegrityError
@@ -177,13 +179,17 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         # keep track of blocks requested
         self._nr_stat_accumulate('get_many', 'blocks_requested', len(block_keys))
 
+        buffered_states = self._get_buffered_states(username, block_keys)
         modules = self._get_student_modules(username, block_keys)
-        for module, usage_key in modules:
-            if module.state is None:
+        for module, usage_key in itertools.chain(modules, self._unsaved_modules(buffered_states)):
+            buffered_state = buffered_states.pop(usage_key, None)
+            if module.state is None and buffered_state is None:
                 continue
 
-            state = json.loads(module.state)
-            state_length = len(module.state)
+            state = json.loads(module.state) if module.state is not None else {}
+            state_length = len(module.state or '')
+            if buffered_state:
+                state.update(buffered_state)
 
             # If the state is the empty dict, then it has been deleted, and so
             # conformant UserStateClients should treat it as if it doesn't exist.
@@ -243,6 +249,18 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         evt_time = time()
 
+        block_keys_to_state = self._buffer_coalesced_states(username, block_keys_to_state)
+        self._save_states(user, block_keys_to_state)
+
+        # Events for the entire set_many call.
+        finish_time = time()
+        duration = (finish_time - evt_time) * 1000  # milliseconds
+        self._nr_stat_accumulate('set_many', 'duration', duration)
+
+    def _save_states(self, user, block_keys_to_state):
+        """
+        Overlays the given states over the StudentModules of the user.
+        """
         for usage_key, state in block_keys_to_state.items():
             try:
                 student_module, created = StudentModule.objects.get_or_create(
@@ -306,10 +324,121 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             # Event to record number of existing fields updated in set/set_many.
             num_fields_updated = max(0, len(state) - num_new_fields_set)
 
-        # Events for the entire set_many call.
-        finish_time = time()
-        duration = (finish_time - evt_time) * 1000  # milliseconds
-        self._nr_stat_accumulate('set_many', 'duration', duration)
+    @staticmethod
+    def _buffer_cache_key(username, usage_key):
+        """
+        Returns the cache key of the buffered state of the given user and block.
+        """
+        key_hash = hashlib.md5(u'{}.{}'.format(username, usage_key).encode('utf-8')).hexdigest()
+        return u'courseware.user_state_buffer.{}'.format(key_hash)
+
+    @staticmethod
+    def _is_coalesced(usage_key, state):
+        """
+        Returns whether writes of the given state for the given block can be
+        buffered, which is the case if it only sets the fields configured for
+        its block type in settings.COALESCED_USER_STATE_FIELDS.
+        """
+        coalesced_fields = settings.COALESCED_USER_STATE_FIELDS.get(usage_key.block_type)
+        return bool(coalesced_fields) and bool(state) and set(state).issubset(coalesced_fields)
+
+    def _get_buffered_states(self, username, block_keys):
+        """
+        Returns a dict mapping the given block keys to their buffered state, for
+        the blocks that have one.
+        """
+        buffer_cache_keys = {
+            self._buffer_cache_key(username, usage_key): usage_key
+            for usage_key in block_keys
+            if settings.COALESCED_USER_STATE_FIELDS.get(usage_key.block_type)
+        }
+        if not buffer_cache_keys:
+            return {}
+        return {
+            buffer_cache_keys[cache_key]: state
+            for cache_key, state in cache.get_many(list(buffer_cache_keys)).items()
+        }
+
+    @staticmethod
+    def _unsaved_modules(buffered_states):
+        """
+        Yields unsaved StudentModules for the blocks left in buffered_states,
+        whose state was buffered before their StudentModule was first saved.
+
+        get_many chains this after the stored StudentModules, popping their
+        blocks from buffered_states, so it only runs once they are consumed.
+        """
+        for usage_key in list(buffered_states):
+            yield StudentModule(module_state_key=usage_key, state=None), usage_key
+
+    def _buffer_coalesced_states(self, username, block_keys_to_state):
+        """
+        Buffers the states that only set coalesced fields in the cache, and
+        schedules a flush of each of them in COALESCED_USER_STATE_FLUSH_DELAY
+        seconds. Writes of the same block within that window are merged into a
+        single update of its StudentModule.
+
+        Returns the remaining states, which must be saved right away. Those
+        absorb any buffered state of their block, so that an older buffered
+        value can't later overwrite them.
+        """
+        if not settings.COALESCED_USER_STATE_FIELDS:
+            return block_keys_to_state
+
+        buffered_states = self._get_buffered_states(username, list(block_keys_to_state))
+        states_to_save = {}
+        for usage_key, state in block_keys_to_state.items():
+            buffer_cache_key = self._buffer_cache_key(username, usage_key)
+            merged_state = dict(buffered_states.get(usage_key) or {})
+            merged_state.update(state)
+            if self._is_coalesced(usage_key, state):
+                cache.set(buffer_cache_key, merged_state, settings.COALESCED_USER_STATE_FLUSH_DELAY * 10)
+                self._schedule_flush(username, usage_key)
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_coalesced')
+            else:
+                if usage_key in buffered_states:
+                    cache.delete(buffer_cache_key)
+                states_to_save[usage_key] = merged_state
+        return states_to_save
+
+    def _schedule_flush(self, username, usage_key):
+        """
+        Schedules a flush of the buffered state of the given user and block,
+        unless one is already scheduled.
+        """
+        # Imported here to avoid a circular import, since the task uses this client.
+        from lms.djangoapps.courseware.tasks import flush_coalesced_user_state
+
+        scheduled_cache_key = self._buffer_cache_key(username, usage_key) + u'.scheduled'
+        delay = settings.COALESCED_USER_STATE_FLUSH_DELAY
+        if cache.add(scheduled_cache_key, True, delay * 10):
+            flush_coalesced_user_state.apply_async(
+                args=(username, six.text_type(usage_key)),
+                countdown=delay,
+            )
+
+    def flush_buffered_state(self, username, usage_key):
+        """
+        Saves the buffered state of the given user and block to its StudentModule.
+
+        This is a best effort for low-value fields: a write buffered while the
+        flush is saving is kept and flushed later, but one buffered in between
+        the flush reading and clearing the buffer can be lost.
+        """
+        buffer_cache_key = self._buffer_cache_key(username, usage_key)
+        state = cache.get(buffer_cache_key)
+        if state:
+            if self.user is not None and self.user.username == username:
+                user = self.user
+            else:
+                user = User.objects.get(username=username)
+            self._save_states(user, {usage_key: state})
+            self._nr_stat_increment('flush_buffered_state', 'calls')
+        if cache.get(buffer_cache_key) == state:
+            cache.delete(buffer_cache_key)
+        cache.delete(buffer_cache_key + u'.scheduled')
+        if cache.get(buffer_cache_key) is not None:
+            self._schedule_flush(username, usage_key)
 
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
@@ -325,6 +454,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             raise ValueError("Only Scope.user_state is supported")
 
         evt_time = time()
+        if settings.COALESCED_USER_STATE_FIELDS:
+            # Buffered state would otherwise be written back over the deleted fields.
+            cache.delete_many([self._buffer_cache_key(username, usage_key) for usage_key in block_keys])
         student_modules = self._get_student_modules(username, block_keys)
         for student_module, _ in student_modules:
             if fields is None:
@@ -9,6 +9,7 @@ import logging
 
 import six
 from six.moves import urllib
+from ccx_keys.locator import CCXLocator
 from django.conf import settings
 from django.contrib.auth.views import redirect_to_login
 from django.db import transaction
@@ -69,10 +70,14 @@ from ..entrance_exams import (
 )
 from ..masquerade import check_content_start_date_for_masquerade_user, setup_masquerade
 from ..model_data import FieldDataCache
-from ..module_render import get_module_for_descriptor, toc_for_course
+from ..module_render import get_module_for_descriptor, toc_for_course, toc_for_course_blocks
 from ..permissions import MASQUERADE_AS_STUDENT
+from ..render_metrics import RequestRenderMetricsSink, summarize_by_block_type
 from ..toggles import (
+    COURSEWARE_BLOCK_STRUCTURE_TOC,
+    COURSEWARE_LAZY_UNIT_RENDERING,
     COURSEWARE_MICROFRONTEND_COURSE_TEAM_PREVIEW,
+    COURSEWARE_XBLOCK_RENDER_METRICS,
     REDIRECT_TO_COURSEWARE_MICROFRONTEND,
     should_redirect_to_courseware_microfrontend,
 )
@@ -453,6 +458,8 @@ class CoursewareIndex(View):
             'sequence_title': None,
             'disable_accordion': COURSE_OUTLINE_PAGE_FLAG.is_enabled(self.course.id),
             'show_search': show_search,
+            'render_metrics': None,
+            'render_metrics_by_block_type': None,
         }
         courseware_context.update(
             get_experiment_user_metadata_context(
@@ -460,14 +467,22 @@ class CoursewareIndex(View):
                 self.effective_user,
             )
         )
-        table_of_contents = toc_for_course(
-            self.effective_user,
-            self.request,
-            self.course,
-            self.chapter_url_name,
-            self.section_url_name,
-            self.field_data_cache,
-        )
+        if COURSEWARE_BLOCK_STRUCTURE_TOC.is_enabled(self.course.id) and not isinstance(self.course.id, CCXLocator):
+            table_of_contents = toc_for_course_blocks(
+                self.effective_user,
+                self.course,
+                self.chapter_url_name,
+                self.section_url_name,
+            )
+        else:
+            table_of_contents = toc_for_course(
+                self.effective_user,
+                self.request,
+                self.course,
+                self.chapter_url_name,
+                self.section_url_name,
+                self.field_data_cache,
+            )
         courseware_context['accordion'] = render_accordion(
             self.request,
             self.course,
@@ -501,6 +516,13 @@ class CoursewareIndex(View):
             )
             courseware_context['fragment'] = self.section.render(self.view, section_context)
 
+            if staff_access and COURSEWARE_XBLOCK_RENDER_METRICS.is_enabled(self.course.id):
+                render_metrics = sorted(
+                    RequestRenderMetricsSink.recorded(), key=lambda metrics: metrics.own_duration, reverse=True
+                )
+                courseware_context['render_metrics'] = render_metrics
+                courseware_context['render_metrics_by_block_type'] = summarize_by_block_type(render_metrics)
+
             if self.section.position and self.section.has_children:
                 self._add_sequence_title_to_context(courseware_context)
 
@@ -568,10 +590,31 @@ class CoursewareIndex(View):
             section_context['prev_url'] = _compute_section_url(previous_of_active_section, 'last')
         if next_of_active_section:
             section_context['next_url'] = _compute_section_url(next_of_active_section, 'first')
+        if self._render_units_lazily():
+            section_context['unit_view_url'] = reverse(
+                'xblock_view',
+                kwargs={
+                    'course_id': six.text_type(self.course_key),
+                    'usage_id': 'usage_key_placeholder',
+                    'view_name': STUDENT_VIEW,
+                },
+            ).replace('usage_key_placeholder', '{usage_key}')
         # sections can hide data that masquerading staff should see when debugging issues with specific students
         section_context['specific_masquerade'] = self._is_masquerading_as_specific_student()
         return section_context
 
+    def _render_units_lazily(self):
+        """
+        Returns whether only the active unit of the section should be rendered,
+        leaving the others to be fetched from the xblock_view endpoint.
+        """
+        return (
+            self.view == STUDENT_VIEW and
+            self.request.user.is_authenticated and
+            settings.FEATURES.get('ENABLE_XBLOCK_VIEW_ENDPOINT', False) and
+            COURSEWARE_LAZY_UNIT_RENDERING.is_enabled(self.course_key)
+        )
+
 
 def render_accordion(request, course, table_of_contents):
     """
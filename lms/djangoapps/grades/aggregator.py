@@ -0,0 +1,254 @@
+"""
+Aggregation of the grades of a batch of users with NumPy.
+
+CourseGrade aggregates a single user's problem scores into subsection
+grades, assignment type averages and a course grade, using the course's
+grader (see xmodule.graders). BatchGradeAggregator computes the same
+values for many users at once, from a matrix of the users' weighted
+problem scores, as is needed by grade reports.
+
+The results are identical to those of the course's grader, not merely
+close: every sum is accumulated in the same order as the grader would
+accumulate it, vectorized only across users.
+"""
+
+
+from collections import OrderedDict, namedtuple
+
+import numpy
+
+from xmodule.graders import AssignmentFormatGrader, WeightedSubsectionsGrader, grader_from_conf
+
+# The definition of a subsection for aggregation:
+#   format - The subsection's assignment type.
+#   graded - Whether the subsection is graded.
+#   block_indices - Indices of the subsection's scorable blocks, in the
+#       order that their scores are aggregated in the subsection's grade.
+AggregatedSubsection = namedtuple('AggregatedSubsection', ['format', 'graded', 'block_indices'])
+
+
+class BatchGradeResult(object):
+    """
+    The aggregated grades of a batch of users. All attributes are NumPy
+    arrays with a row for each user.
+
+    subsection_earned, subsection_possible - The total weighted earned and
+        possible scores of each subsection (the all_total of a SubsectionGrade).
+    subsection_graded_earned, subsection_graded_possible - The total weighted
+        earned and possible scores of each subsection's graded blocks (the
+        graded_total of a SubsectionGrade).
+    assignment_type_percents - OrderedDict of each of the grader's assignment
+        types to the percent computed by its AssignmentFormatGrader.
+    grader_percent - The percent computed by the course's grader.
+    percent - The course grade percent, rounded as by CourseGrade.
+    letter_grade - The course letter grade, or None.
+    passed - Whether the course grade is passing.
+    """
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class BatchGradeAggregator(object):
+    """
+    Aggregates the scores of batches of users in a course, given:
+
+        grader - The course's grader, or its grading policy GRADER
+            configuration, as accepted by xmodule.graders.grader_from_conf.
+            Only AssignmentFormatGraders weighted by a
+            WeightedSubsectionsGrader are supported.
+
+        grade_cutoffs - The course's grade cutoffs.
+
+        subsections - A list of AggregatedSubsection, for each of the
+            course's subsections, in course order.
+
+        blocks_graded - A sequence with, for each scorable block, whether
+            the block is graded.
+    """
+    def __init__(self, grader, grade_cutoffs, subsections, blocks_graded):
+        grader = grader_from_conf(grader)
+        if not isinstance(grader, WeightedSubsectionsGrader) or not all(
+                isinstance(subgrader, AssignmentFormatGrader) for subgrader, __, __ in grader.subgraders
+        ):
+            raise ValueError(u'Only AssignmentFormatGraders weighted by a WeightedSubsectionsGrader are supported.')
+
+        self.grader = grader
+        self.grade_cutoffs = grade_cutoffs
+        self.subsections = list(subsections)
+        self.blocks_graded = numpy.asarray(blocks_graded, dtype=bool)
+
+    def aggregate(self, earned, possible):
+        """
+        Returns the BatchGradeResult for the given weighted scores.
+
+        Arguments:
+            earned - Array of the weighted earned score of each scorable
+                block (columns), for each user (rows).
+            possible - Array of the weighted possible score of each
+                scorable block, either for each user, as for earned, or
+                the same for all users.
+        """
+        earned = numpy.asarray(earned, dtype=float)
+        possible = numpy.broadcast_to(numpy.asarray(possible, dtype=float), earned.shape)
+
+        subsection_totals = [
+            self._sum_scores(earned, possible, subsection.block_indices)
+            for subsection in self.subsections
+        ]
+        subsection_graded_totals = [
+            self._sum_scores(
+                earned,
+                possible,
+                [index for index in subsection.block_indices if self.blocks_graded[index]],
+            )
+            for subsection in self.subsections
+        ]
+
+        # Sums accumulate in place of python's sum(), which starts with 0.
+        grader_percent = numpy.zeros(earned.shape[0])
+        assignment_type_percents = OrderedDict()
+        for subgrader, assignment_type, weight in self.grader.subgraders:
+            subgrader_percent = self._assignment_type_percent(subgrader, subsection_graded_totals, earned.shape[0])
+            assignment_type_percents[assignment_type] = subgrader_percent
+            grader_percent = grader_percent + subgrader_percent * weight
+
+        percent = self._round_away_from_zero(grader_percent * 100 + 0.05) / 100
+        return BatchGradeResult(
+            subsection_earned=self._columns(subsection_totals, 0, earned.shape[0]),
+            subsection_possible=self._columns(subsection_totals, 1, earned.shape[0]),
+            subsection_graded_earned=self._columns(subsection_graded_totals, 0, earned.shape[0]),
+            subsection_graded_possible=self._columns(subsection_graded_totals, 1, earned.shape[0]),
+            assignment_type_percents=assignment_type_percents,
+            grader_percent=grader_percent,
+            percent=percent,
+            letter_grade=self._letter_grade(percent),
+            passed=self._passed(percent),
+        )
+
+    @staticmethod
+    def _sum_scores(earned, possible, block_indices):
+        """
+        Returns the total earned and possible scores of the given blocks,
+        as summed by xmodule.graders.aggregate_scores.
+        """
+        total_earned = numpy.zeros(earned.shape[0])
+        total_possible = numpy.zeros(earned.shape[0])
+        for index in block_indices:
+            total_earned = total_earned + earned[:, index]
+            total_possible = total_possible + possible[:, index]
+        return total_earned, total_possible
+
+    @staticmethod
+    def _columns(totals, total_index, num_users):
+        """
+        Returns an array of the given totals of each subsection.
+        """
+        if not totals:
+            return numpy.zeros((num_users, 0))
+        return numpy.column_stack([total[total_index] for total in totals])
+
+    def _assignment_type_percent(self, subgrader, subsection_graded_totals, num_users):
+        """
+        Returns the percent computed by the given AssignmentFormatGrader for
+        each user, as AssignmentFormatGrader.grade does.
+        """
+        # The grader is given each graded subsection of its type in which
+        # the user can earn points, and pads them with placeholder scores
+        # of 0 up to min_count.
+        subsection_percents = []
+        subsection_present = []
+        for subsection, (graded_earned, graded_possible) in zip(self.subsections, subsection_graded_totals):
+            if subsection.graded and subsection.format == subgrader.type:
+                present = graded_possible > 0
+                subsection_present.append(present)
+                subsection_percents.append(
+                    numpy.where(present, graded_earned / numpy.where(present, graded_possible, 1.0), 0.0)
+                )
+
+        min_count = int(float(subgrader.min_count))
+        num_slots = max(min_count, len(subsection_percents))
+        if num_slots == 0:
+            return numpy.zeros(num_users)
+
+        percents = numpy.zeros((num_users, num_slots))
+        present = numpy.zeros((num_users, num_slots), dtype=bool)
+        if subsection_percents:
+            percents[:, :len(subsection_percents)] = numpy.column_stack(subsection_percents)
+            present[:, :len(subsection_present)] = numpy.column_stack(subsection_present)
+
+        # Move each user's present subsections to the front, keeping their order.
+        order = numpy.argsort(~present, axis=1, kind='stable')
+        percents = numpy.take_along_axis(percents, order, axis=1)
+        num_present = present.sum(axis=1)
+        present = numpy.arange(num_slots) < num_present[:, numpy.newaxis]
+        percents = numpy.where(present, percents, 0.0)
+        return self._average_with_drops(percents, numpy.maximum(num_present, min_count), subgrader.drop_count)
+
+    @classmethod
+    def average_with_drops(cls, percents, subgrader):
+        """
+        Returns the average of each user's percents, dropping the lowest
+        ones, as subgrader.total_with_drops does for each user.
+
+        Arguments:
+            percents - Array of the percent of each subsection (columns),
+                for each user (rows).
+            subgrader - The AssignmentFormatGrader of the subsections.
+        """
+        percents = numpy.asarray(percents, dtype=float)
+        lengths = numpy.full(percents.shape[0], percents.shape[1])
+        return cls._average_with_drops(percents, lengths, subgrader.drop_count)
+
+    @staticmethod
+    def _average_with_drops(percents, lengths, drop_count):
+        """
+        Returns the average of the first lengths[user] percents of each
+        user, dropping the lowest drop_count of them, as
+        AssignmentFormatGrader.total_with_drops.
+        """
+        num_users, num_slots = percents.shape
+        positions = numpy.arange(num_slots)
+        valid = positions < lengths[:, numpy.newaxis]
+
+        # Like the grader's stable sort, of equal scores, the later ones are dropped first.
+        kept = valid
+        if drop_count > 0:
+            sort_keys = numpy.where(valid, -percents, -numpy.inf)
+            order = numpy.lexsort((numpy.broadcast_to(positions, percents.shape), sort_keys), axis=1)
+            dropped = numpy.zeros_like(valid)
+            numpy.put_along_axis(dropped, order[:, max(num_slots - drop_count, 0):], True, axis=1)
+            kept = valid & ~dropped
+
+        # Sums accumulate in place of the grader's loop, which starts with 0.
+        total = numpy.zeros(num_users)
+        for position in range(num_slots):
+            total = total + numpy.where(kept[:, position], percents[:, position], 0.0)
+
+        num_averaged = lengths - drop_count
+        return numpy.where(num_averaged > 0, total / numpy.maximum(num_averaged, 1), total)
+
+    @staticmethod
+    def _round_away_from_zero(number):
+        """
+        Rounds each of the numbers as openedx.core.lib.grade_utils.round_away_from_zero.
+        """
+        return numpy.where(number >= 0, numpy.floor(number + 0.5), numpy.ceil(number - 0.5))
+
+    def _letter_grade(self, percent):
+        """
+        Returns the letter grade for each percent, as computed by CourseGrade.
+        """
+        letter_grades = numpy.full(percent.shape, None, dtype=object)
+        descending_grades = sorted(self.grade_cutoffs, key=lambda x: self.grade_cutoffs[x], reverse=True)
+        for possible_grade in reversed(descending_grades):
+            letter_grades[percent >= self.grade_cutoffs[possible_grade]] = possible_grade
+        return letter_grades
+
+    def _passed(self, percent):
+        """
+        Returns whether each percent is passing, as computed by CourseGrade.
+        """
+        nonzero_cutoffs = [cutoff for cutoff in self.grade_cutoffs.values() if cutoff > 0]
+        if not nonzero_cutoffs:
+            return numpy.zeros(percent.shape, dtype=bool)
+        return percent >= min(nonzero_cutoffs)
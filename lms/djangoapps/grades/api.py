@@ -19,6 +19,7 @@ from lms.djangoapps.grades.config.waffle import is_writable_gradebook_enabled, g
 # Public Grades Factories
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.grades.models_api import *
+from lms.djangoapps.grades.prefetch import clear_prefetched_scores, prefetch_scores
 from lms.djangoapps.grades.signals import signals
 # TODO exposing functionality from Grades handlers seems fishy.
 from lms.djangoapps.grades.signals.handlers import disconnect_submissions_signal_receiver
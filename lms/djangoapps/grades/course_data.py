@@ -69,7 +69,9 @@ class CourseData(object):
     @property
     def collected_structure(self):
         if self._collected_block_structure is None:
-            self._collected_block_structure = get_block_structure_manager(self.course_key).get_collected()
+            self._collected_block_structure = get_block_structure_manager(self.course_key).get_collected(
+                transformers=[GradesTransformer],
+            )
         return self._collected_block_structure
 
     @property
@@ -4,9 +4,11 @@ Course Grade Factory Class
 
 
 from collections import namedtuple
+from functools import partial
 from logging import getLogger
 
 import six
+from django.conf import settings
 from six import text_type
 
 from openedx.core.djangoapps.signals.signals import (
@@ -20,6 +22,7 @@ from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
 from .models import PersistentCourseGrade
 from .models_api import prefetch_grade_overrides_and_visible_blocks
+from .parallel import can_fork_workers, imap_in_processes
 
 log = getLogger(__name__)
 
@@ -90,6 +93,7 @@ class CourseGradeFactory(object):
             collected_block_structure=None,
             course_key=None,
             force_update=False,
+            workers=None,
     ):
         """
         Given a course and an iterable of students (User), yield a GradeResult
@@ -99,6 +103,11 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        If workers is greater than 1 (defaults to the COURSE_GRADE_ITER_WORKERS
+        setting), the students are sharded across that many forked processes,
+        which share the collected course_structure, and the results are still
+        yielded in the order of the given students.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -109,10 +118,43 @@ class CourseGradeFactory(object):
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
         stats_tags = [u'action:{}'.format(course_data.course_key)]
-        for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+        if workers is None:
+            workers = getattr(settings, 'COURSE_GRADE_ITER_WORKERS', 1)
+
+        if workers > 1 and can_fork_workers():
+            results = self._iter_grade_results_in_processes(users, course_data, force_update, workers)
+        else:
+            results = (self._iter_grade_result(user, course_data, force_update) for user in users)
+
+        for result in results:
+            yield result
+
+    def _iter_grade_results_in_processes(self, users, course_data, force_update, workers):
+        """
+        Yields the GradeResult of each of the given users, computed in a
+        pool of the given number of worker processes.
+        """
+        # Load everything the workers share before they are forked, so
+        # that it is loaded only once. Fully load the collected structure,
+        # since the structures of each user's grade are copied from it.
+        collected_structure = course_data.collected_structure
+        collected_structure.load_transformer_data(collected_structure.unloaded_transformers())
+        course = course_data.course
+
+        return imap_in_processes(
+            partial(self._iter_grade_result, course_data=course_data, force_update=force_update, in_worker=True),
+            users,
+            workers,
+            shard_size=getattr(settings, 'COURSE_GRADE_ITER_SHARD_SIZE', 20),
+            shared_objects=[collected_structure, course],
+            fallback=partial(self._iter_grade_result, course_data=course_data, force_update=force_update),
+            reload_result=partial(
+                self._iter_grade_result, course_data=course_data, force_update=force_update, reload_grade=True,
+            ),
+            timeout=getattr(settings, 'COURSE_GRADE_ITER_SHARD_TIMEOUT', None),
+        )
 
-    def _iter_grade_result(self, user, course_data, force_update):
+    def _iter_grade_result(self, user, course_data, force_update, in_worker=False, reload_grade=False):
         try:
             kwargs = {
                 'user': user,
@@ -120,11 +162,18 @@ class CourseGradeFactory(object):
                 'collected_block_structure': course_data.collected_structure,
                 'course_key': course_data.course_key,
             }
-            if force_update:
-                kwargs['force_update_subsections'] = True
+            if reload_grade:
+                course_grade = self._reload(user, CourseData(**kwargs), force_update)
+            else:
+                if force_update:
+                    kwargs['force_update_subsections'] = True
 
-            method = CourseGradeFactory().update if force_update else CourseGradeFactory().read
-            course_grade = method(**kwargs)
+                method = CourseGradeFactory().update if force_update else CourseGradeFactory().read
+                course_grade = method(**kwargs)
+            if in_worker:
+                # Compute the subsection grades in the worker, rather than
+                # lazily once the grade is sent back to the calling process.
+                course_grade.chapter_grades  # pylint: disable=pointless-statement
             return self.GradeResult(user, course_grade, None)
         except Exception as exc:  # pylint: disable=broad-except
             # Keep marching on even if this student couldn't be graded for
@@ -137,6 +186,21 @@ class CourseGradeFactory(object):
             )
             return self.GradeResult(user, None, exc)
 
+    @classmethod
+    def _reload(cls, user, course_data, force_update):
+        """
+        Returns the CourseGrade for the given user and course that was
+        just read or updated in a worker process, without updating it a
+        second time, which would send the grade signals again.
+        """
+        try:
+            return cls._read(user, course_data)
+        except PersistentCourseGrade.DoesNotExist:
+            if not force_update and assume_zero_if_absent(course_data.course_key):
+                return cls._create_zero(user, course_data)
+            # The grade wasn't persisted, so compute it again without saving it.
+            return CourseGrade(user, course_data).update()
+
     @staticmethod
     def _create_zero(user, course_data):
         """
@@ -0,0 +1,200 @@
+"""
+Utilities for sharding grade computations across a pool of processes.
+
+Worker processes are forked from the calling process, so objects that
+were loaded before the pool is created - such as a prefetched collected
+block structure - are shared with them copy-on-write, rather than being
+serialized for each task. Those same objects are also excluded when the
+results are sent back to the calling process, which substitutes its own
+instances.
+
+Pools are created with billiard, the fork of multiprocessing that Celery
+uses for its worker pool, since unlike multiprocessing it allows daemonic
+processes to have children. So grades are also computed in parallel
+within the tasks run by Celery's pool processes, such as grade reports.
+"""
+
+
+import itertools
+from collections import deque
+from io import BytesIO
+from logging import getLogger
+
+import billiard
+from django.core.cache import caches
+from django.db import connections
+from six.moves import cPickle as pickle
+
+log = getLogger(__name__)
+
+
+# State of a worker process, set when the worker starts: the function
+# to call for each item and the objects shared with the calling process.
+_worker_state = {}
+
+
+def can_fork_workers():
+    """
+    Returns whether worker processes can be safely forked from the
+    current process.
+
+    Database connections are closed before forking so that workers do
+    not share sockets with the calling process, which isn't possible
+    while a transaction is in progress.
+    """
+    return not any(connection.in_atomic_block for connection in connections.all())
+
+
+def imap_in_processes(
+        func, items, workers, shard_size, shared_objects=(), fallback=None, reload_result=None, timeout=None,
+):
+    """
+    Yields func(item) for each of the given items, in order, computing
+    the results in a pool of the given number of forked worker processes.
+
+    The items are read as they are sent to the workers, so that no more
+    than a couple of shards per worker are held in memory at a time.
+
+    Arguments:
+        func (callable) - Function to call with each item, in a worker.
+        items (iterable) - Items to process; must be picklable.
+        workers (int) - Number of worker processes.
+        shard_size (int) - Number of items sent to a worker at a time.
+        shared_objects (iterable) - Objects that results may reference and
+            that are not to be copied back to the calling process.
+        fallback (callable) - Function to call with an item, in the calling
+            process, if it wasn't processed by a worker. Defaults to func.
+        reload_result (callable) - Function to call with an item, in the
+            calling process, if func was called with it in a worker but its
+            result cannot be sent back. It should return the result without
+            repeating func's side effects. Defaults to fallback.
+        timeout (float) - Number of seconds to wait for the results of a
+            shard. Once exceeded, for instance because a worker died, the
+            pool is terminated and the remaining items are processed with
+            fallback. Defaults to waiting indefinitely.
+    """
+    fallback = fallback or func
+    reload_result = reload_result or fallback
+    shared_objects = list(shared_objects)
+    shards = _iter_shards(items, shard_size)
+
+    _prepare_to_fork()
+    pool = _create_pool(workers, func, shared_objects)
+    try:
+        # Keep a shard queued for each worker besides the one it is
+        # processing, so that workers don't wait for the caller.
+        pending = deque(
+            (shard, pool.apply_async(_call_in_worker, (shard,)))
+            for shard in itertools.islice(shards, 2 * workers)
+        )
+        while pending:
+            shard, async_result = pending.popleft()
+            try:
+                payloads = async_result.get(timeout)
+            except billiard.TimeoutError:
+                log.error(
+                    u'Grades: Timed out after %s seconds waiting for a worker process. '
+                    u'Processing the remaining items in the calling process.',
+                    timeout,
+                )
+                pool.terminate()
+                remaining_shards = itertools.chain([shard], (pending_shard for pending_shard, _ in pending), shards)
+                for item in itertools.chain.from_iterable(remaining_shards):
+                    yield fallback(item)
+                return
+
+            for next_shard in itertools.islice(shards, 1):
+                pending.append((next_shard, pool.apply_async(_call_in_worker, (next_shard,))))
+
+            for item, payload in zip(shard, payloads):
+                if payload is None:
+                    yield reload_result(item)
+                else:
+                    yield _loads(payload, shared_objects)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _iter_shards(items, shard_size):
+    """
+    Yields lists of up to shard_size of the given items, in order.
+    """
+    items = iter(items)
+    shard = list(itertools.islice(items, shard_size))
+    while shard:
+        yield shard
+        shard = list(itertools.islice(items, shard_size))
+
+
+def _prepare_to_fork():
+    """
+    Closes the connections that must not be shared with forked workers.
+    Each process reconnects when it next needs a connection.
+    """
+    connections.close_all()
+    for cache in caches.all():
+        cache.close()
+
+
+def _create_pool(workers, func, shared_objects):
+    """
+    Returns a billiard pool of the given number of forked worker
+    processes, each of which calls func with the items it is sent.
+
+    The arguments are inherited by the forked workers, rather than set in
+    module state of the calling process, so that pools can be used
+    concurrently.
+    """
+    return billiard.Pool(processes=workers, initializer=_init_worker, initargs=(func, shared_objects))
+
+
+def _init_worker(func, shared_objects):
+    """
+    Sets the state of a newly started worker process.
+    """
+    _worker_state.update(func=func, shared_objects=shared_objects)
+
+
+def _call_in_worker(shard):
+    """
+    Returns the pickled results of calling the worker's function with
+    each of the items in the given shard, with None in place of each
+    result that cannot be pickled.
+    """
+    return [_call_with_item(item) for item in shard]
+
+
+def _call_with_item(item):
+    """
+    Returns the pickled result of calling the worker's function with the
+    given item, or None if the result cannot be pickled.
+    """
+    result = _worker_state['func'](item)
+    try:
+        return _dumps(result, _worker_state['shared_objects'])
+    except Exception:  # pylint: disable=broad-except
+        log.exception(u'Grades: Could not send a result from a worker process.')
+        return None
+
+
+def _dumps(obj, shared_objects):
+    """
+    Pickles the given object, referencing any of the shared_objects by index.
+    """
+    shared_indices = {id(shared_object): index for index, shared_object in enumerate(shared_objects)}
+    output = BytesIO()
+    pickler = pickle.Pickler(output, pickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = lambda candidate: shared_indices.get(id(candidate))
+    pickler.dump(obj)
+    return output.getvalue()
+
+
+def _loads(data, shared_objects):
+    """
+    Unpickles data written by _dumps, resolving shared object references.
+    """
+    unpickler = pickle.Unpickler(BytesIO(data))
+    unpickler.persistent_load = lambda index: shared_objects[index]
+    return unpickler.load()
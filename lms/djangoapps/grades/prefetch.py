@@ -0,0 +1,82 @@
+"""
+Bulk prefetching of the raw scores that grades are computed from.
+
+Computing a user's grades reads all of their scores in the course, from
+both the courseware StudentModule table and the Submissions API. When
+grading a batch of users, prefetch_scores reads the scores of all of the
+users at once, and SubsectionGradeFactory then uses each user's share of
+the prefetched scores in place of its own queries.
+"""
+
+
+import six
+from submissions import api as submissions_api
+from submissions.models import ScoreSummary
+from submissions.serializers import UnannotatedScoreSerializer
+
+from lms.djangoapps.courseware.model_data import ScoresClient
+from openedx.core.lib.cache_utils import get_cache
+from student.models import anonymous_id_for_user
+
+from .scores import possibly_scored
+
+_SUBMISSIONS_CACHE_NAMESPACE = u'grades.prefetch.submissions_scores'
+
+
+def prefetch_scores(course_key, users, course_structure):
+    """
+    Prefetches the StudentModule and Submissions API scores of the given
+    users for the scorable blocks in the given course_structure.
+    """
+    scorable_locations = [block_key for block_key in course_structure if possibly_scored(block_key)]
+    ScoresClient.prefetch(course_key, [user.id for user in users], scorable_locations)
+    _prefetch_submissions_scores(course_key, users)
+
+
+def clear_prefetched_scores(course_key, user_id=None):
+    """
+    Clears the scores prefetched for the given course, or only those of the
+    given user, whose scores are then read again when they're needed.
+    """
+    ScoresClient.clear_prefetched_data(course_key, user_id)
+    if user_id is None:
+        get_cache(_SUBMISSIONS_CACHE_NAMESPACE).pop(six.text_type(course_key), None)
+    else:
+        get_cache(_SUBMISSIONS_CACHE_NAMESPACE).get(six.text_type(course_key), {}).pop(user_id, None)
+
+
+def get_submissions_scores(course_key, user):
+    """
+    Returns the user's scores in the course from the Submissions API,
+    in the format of submissions_api.get_scores.
+    """
+    prefetched = get_cache(_SUBMISSIONS_CACHE_NAMESPACE).get(six.text_type(course_key), {})
+    try:
+        return prefetched[user.id]
+    except KeyError:
+        return submissions_api.get_scores(six.text_type(course_key), anonymous_id_for_user(user, course_key))
+
+
+def _prefetch_submissions_scores(course_key, users):
+    """
+    Reads the Submissions API scores of all of the given users in a single
+    query, and caches them in the RequestCache.
+
+    Equivalent to calling submissions_api.get_scores for each user.
+    """
+    # Users without a saved anonymous id have no submissions, so there's
+    # no need to save one for each user here.
+    user_ids_by_anonymous_id = {
+        anonymous_id_for_user(user, course_key, save=False): user.id
+        for user in users
+    }
+    scores = {user.id: {} for user in users}
+    score_summaries = ScoreSummary.objects.filter(
+        student_item__course_id=six.text_type(course_key),
+        student_item__student_id__in=list(user_ids_by_anonymous_id),
+    ).select_related('latest', 'latest__submission', 'student_item')
+    for summary in score_summaries:
+        if not summary.latest.is_hidden():
+            user_id = user_ids_by_anonymous_id[summary.student_item.student_id]
+            scores[user_id][summary.student_item.item_id] = UnannotatedScoreSerializer(summary.latest).data
+    get_cache(_SUBMISSIONS_CACHE_NAMESPACE)[six.text_type(course_key)] = scores
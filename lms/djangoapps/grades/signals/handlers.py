@@ -7,12 +7,14 @@ from contextlib import contextmanager
 from logging import getLogger
 
 import six
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from opaque_keys.edx.keys import LearningContextKey
 from submissions.models import score_reset, score_set
 from xblock.scorable import ScorableXBlockMixin, Score
 
 from lms.djangoapps.courseware.model_data import get_score, set_score
+from lms.djangoapps.courseware.models import StudentModule
 from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 from student.models import user_by_anonymous_id
@@ -23,6 +25,7 @@ from util.date_utils import to_timestamp
 from .. import events
 from ..constants import ScoreDatabaseTableEnum
 from ..course_grade_factory import CourseGradeFactory
+from ..prefetch import clear_prefetched_scores
 from ..scores import weighted_score
 from ..tasks import (
     RECALCULATE_GRADE_DELAY_SECONDS,
@@ -114,6 +117,28 @@ def submissions_score_reset_handler(sender, **kwargs):  # pylint: disable=unused
     )
 
 
+@receiver(post_save, sender=StudentModule, dispatch_uid='grades_student_module_saved')
+@receiver(post_delete, sender=StudentModule, dispatch_uid='grades_student_module_deleted')
+def clear_prefetched_student_module_scores(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the scores prefetched for the learner of a StudentModule that is
+    written, so that their grades are computed with its new score.
+    """
+    clear_prefetched_scores(instance.course_id, instance.student_id)
+
+
+@receiver(score_set, dispatch_uid='grades_submissions_score_set')
+@receiver(score_reset, dispatch_uid='grades_submissions_score_reset')
+def clear_prefetched_submissions_scores(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the scores prefetched for the learner of a Submissions API score
+    that is written, so that their grades are computed with the new score.
+    """
+    user = user_by_anonymous_id(kwargs['anonymous_user_id'])
+    if user is not None:
+        clear_prefetched_scores(kwargs['course_id'], user.id)
+
+
 @contextmanager
 def disconnect_submissions_signal_receiver(signal):
     """
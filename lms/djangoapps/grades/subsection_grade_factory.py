@@ -7,16 +7,15 @@ from collections import OrderedDict
 from logging import getLogger
 
 from lazy import lazy
-from submissions import api as submissions_api
 
 from lms.djangoapps.courseware.model_data import ScoresClient
 from lms.djangoapps.grades.config import assume_zero_if_absent, should_persist_grades
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from lms.djangoapps.grades.scores import possibly_scored
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
-from student.models import anonymous_id_for_user
 
 from .course_data import CourseData
+from .prefetch import get_submissions_scores
 from .subsection_grade import CreateSubsectionGrade, ReadSubsectionGrade, ZeroSubsectionGrade
 
 log = getLogger(__name__)
@@ -121,8 +120,7 @@ class SubsectionGradeFactory(object):
         Lazily queries and returns the scores stored by the
         Submissions API for the course, while caching the result.
         """
-        anonymous_user_id = anonymous_id_for_user(self.student, self.course_data.course_key)
-        return submissions_api.get_scores(str(self.course_data.course_key), anonymous_user_id)
+        return get_submissions_scores(self.course_data.course_key, self.student)
 
     def _get_bulk_cached_grade(self, subsection):
         """
@@ -0,0 +1,181 @@
+"""
+Tests for aggregator.py
+"""
+
+
+import random
+from collections import OrderedDict, namedtuple
+from unittest import TestCase
+
+import ddt
+import numpy
+
+from xmodule.graders import AssignmentFormatGrader, ProblemScore, aggregate_scores, grader_from_conf
+
+from ..aggregator import AggregatedSubsection, BatchGradeAggregator
+from ..course_grade import CourseGrade
+
+_SubsectionGrade = namedtuple('_SubsectionGrade', ['display_name', 'graded_total'])
+
+
+@ddt.ddt
+class TestBatchGradeAggregator(TestCase):
+    """
+    Verifies that BatchGradeAggregator computes the same grades as the
+    course grader, for randomized grading policies, courses and scores.
+    """
+    NUM_USERS = 20
+    ASSIGNMENT_TYPES = ['Homework', 'Lab', 'Midterm Exam', 'Final Exam']
+
+    def _random_policy(self, rand):
+        """
+        Returns a random (GRADER configuration, GRADE_CUTOFFS).
+        """
+        grader_conf = [
+            {
+                'type': assignment_type,
+                'min_count': rand.randint(0, 5),
+                'drop_count': rand.choice([0, 0, 1, 2, 6]),
+                'weight': rand.choice([0.0, 0.1, 0.15, 0.25, 0.3, 1.0 / 3, 0.5]),
+            }
+            for assignment_type in rand.sample(self.ASSIGNMENT_TYPES, rand.randint(1, len(self.ASSIGNMENT_TYPES)))
+        ]
+        grade_cutoffs = {
+            letter: rand.choice([0.0, 0.2, 0.5, 0.5, rand.random()])
+            for letter in rand.sample(['A', 'B', 'C', 'Pass'], rand.randint(1, 4))
+        }
+        return grader_conf, grade_cutoffs
+
+    def _random_course(self, rand, num_blocks):
+        """
+        Returns a random (list of AggregatedSubsection, blocks_graded).
+        """
+        subsections = [
+            AggregatedSubsection(
+                format=rand.choice(self.ASSIGNMENT_TYPES + ['Ungraded']),
+                graded=rand.random() < 0.8,
+                block_indices=[rand.randrange(num_blocks) for __ in range(rand.randint(0, 4))],
+            )
+            for __ in range(rand.randint(0, 12))
+        ]
+        blocks_graded = [rand.random() < 0.8 for __ in range(num_blocks)]
+        return subsections, blocks_graded
+
+    def _random_scores(self, rand, num_blocks):
+        """
+        Returns random (earned, possible) weighted score arrays.
+        """
+        possible = numpy.array([
+            [rand.choice([0.0, 1.0, 2.0, 3.0, rand.uniform(0, 10)]) for __ in range(num_blocks)]
+            for __ in range(self.NUM_USERS)
+        ])
+        earned = numpy.array([
+            [rand.choice([0.0, value, value / 3, rand.uniform(0, value)]) for value in row]
+            for row in possible
+        ])
+        return earned, possible
+
+    def _expected_grades(self, grader_conf, grade_cutoffs, subsections, blocks_graded, earned, possible):
+        """
+        Returns the grades computed by the course grader for each user, as
+        a list of (subsection totals, grader result, percent, letter grade, passed).
+        """
+        grader = grader_from_conf(grader_conf)
+        expected = []
+        for user_earned, user_possible in zip(earned, possible):
+            totals = []
+            grade_sheet = {}
+            for index, subsection in enumerate(subsections):
+                all_total, graded_total = aggregate_scores([
+                    ProblemScore(
+                        raw_earned=user_earned[block_index],
+                        raw_possible=user_possible[block_index],
+                        weighted_earned=user_earned[block_index],
+                        weighted_possible=user_possible[block_index],
+                        weight=None,
+                        graded=blocks_graded[block_index],
+                        first_attempted=None,
+                    )
+                    for block_index in subsection.block_indices
+                ])
+                totals.append((all_total, graded_total))
+                if subsection.graded and graded_total.possible > 0:
+                    grade_sheet.setdefault(subsection.format, OrderedDict())[index] = _SubsectionGrade(
+                        u'Subsection {}'.format(index), graded_total,
+                    )
+
+            grader_result = grader.grade(grade_sheet)
+            percent = CourseGrade._compute_percent(grader_result)  # pylint: disable=protected-access
+            expected.append((
+                totals,
+                grader_result,
+                percent,
+                CourseGrade._compute_letter_grade(grade_cutoffs, percent),  # pylint: disable=protected-access
+                bool(CourseGrade._compute_passed(grade_cutoffs, percent)),  # pylint: disable=protected-access
+            ))
+        return expected
+
+    @ddt.data(*range(50))
+    def test_matches_course_grader(self, seed):
+        rand = random.Random(seed)
+        num_blocks = rand.randint(1, 15)
+        grader_conf, grade_cutoffs = self._random_policy(rand)
+        subsections, blocks_graded = self._random_course(rand, num_blocks)
+        earned, possible = self._random_scores(rand, num_blocks)
+
+        result = BatchGradeAggregator(grader_conf, grade_cutoffs, subsections, blocks_graded).aggregate(
+            earned, possible,
+        )
+        expected = self._expected_grades(grader_conf, grade_cutoffs, subsections, blocks_graded, earned, possible)
+
+        for user_index, (totals, grader_result, percent, letter_grade, passed) in enumerate(expected):
+            for subsection_index, (all_total, graded_total) in enumerate(totals):
+                self.assertEqual(result.subsection_earned[user_index, subsection_index], all_total.earned)
+                self.assertEqual(result.subsection_possible[user_index, subsection_index], all_total.possible)
+                self.assertEqual(result.subsection_graded_earned[user_index, subsection_index], graded_total.earned)
+                self.assertEqual(
+                    result.subsection_graded_possible[user_index, subsection_index], graded_total.possible,
+                )
+            for assignment_type, breakdown in grader_result['grade_breakdown'].items():
+                weight = [conf['weight'] for conf in grader_conf if conf['type'] == assignment_type][0]
+                self.assertEqual(result.assignment_type_percents[assignment_type][user_index] * weight,
+                                 breakdown['percent'])
+            self.assertEqual(result.grader_percent[user_index], grader_result['percent'])
+            self.assertEqual(result.percent[user_index], percent)
+            self.assertEqual(result.letter_grade[user_index], letter_grade)
+            self.assertEqual(result.passed[user_index], passed)
+
+    def test_constant_possible_scores(self):
+        grader_conf = [{'type': 'Homework', 'min_count': 2, 'drop_count': 1, 'weight': 1.0}]
+        subsections = [
+            AggregatedSubsection('Homework', True, [0, 1]),
+            AggregatedSubsection('Homework', True, [2]),
+            AggregatedSubsection('Homework', True, [3]),
+        ]
+        result = BatchGradeAggregator(grader_conf, {'Pass': 0.5}, subsections, [True] * 4).aggregate(
+            [[1, 1, 0, 2], [0, 0, 1, 0]],
+            [1, 1, 1, 2],
+        )
+        self.assertEqual(result.assignment_type_percents['Homework'].tolist(), [1.0, 0.5])
+        self.assertEqual(result.letter_grade.tolist(), ['Pass', 'Pass'])
+        self.assertEqual(result.passed.tolist(), [True, True])
+
+    def test_unsupported_grader(self):
+        with self.assertRaises(ValueError):
+            BatchGradeAggregator(AssignmentFormatGrader('Homework', 1, 0), {}, [], [])
+
+    @ddt.data(*range(20))
+    def test_average_with_drops_matches_grader(self, seed):
+        rand = random.Random(seed)
+        num_subsections = rand.randint(1, 8)
+        subgrader = AssignmentFormatGrader('Homework', rand.randint(0, 5), rand.choice([0, 1, 2, 10]))
+        percents = [
+            [rand.choice([0.0, 0.5, 1.0, rand.random()]) for __ in range(num_subsections)]
+            for __ in range(self.NUM_USERS)
+        ]
+
+        averages = BatchGradeAggregator.average_with_drops(percents, subgrader)
+
+        for user_percents, average in zip(percents, averages):
+            expected, __ = subgrader.total_with_drops([{'percent': percent} for percent in user_percents])
+            self.assertEqual(average, expected)
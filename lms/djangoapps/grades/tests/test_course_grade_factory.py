@@ -17,6 +17,7 @@ from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from .. import parallel
 from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, waffle
 from ..course_grade import CourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
@@ -243,6 +244,34 @@ class TestCourseGradeFactory(GradeTestBase):
         self.assertEqual(expected_summary, actual_summary)
 
 
+class _InProcessResult(object):
+    """
+    The result of a task of an _InProcessPool.
+    """
+    def __init__(self, value):
+        self.value = value
+
+    def get(self, timeout=None):  # pylint: disable=unused-argument
+        return self.value
+
+
+class _InProcessPool(object):
+    """
+    Calls tasks in the calling process, in place of a pool of forked workers.
+    """
+    def __init__(self, processes, func, shared_objects):
+        self.processes = processes
+        parallel._init_worker(func, shared_objects)  # pylint: disable=protected-access
+
+    def apply_async(self, func, args):
+        return _InProcessResult(func(*args))
+
+    def close(self):
+        pass
+
+    terminate = join = close
+
+
 class TestGradeIteration(SharedModuleStoreTestCase):
     """
     Test iteration through student course grades.
@@ -337,6 +366,41 @@ class TestGradeIteration(SharedModuleStoreTestCase):
         self.assertIsNotNone(all_course_grades[student2])
         self.assertIsNotNone(all_course_grades[student5])
 
+    @patch('lms.djangoapps.grades.parallel.log')
+    @patch('lms.djangoapps.grades.parallel._prepare_to_fork')
+    @patch('lms.djangoapps.grades.parallel._create_pool', _InProcessPool)
+    @patch('lms.djangoapps.grades.course_grade_factory.can_fork_workers', return_value=True)
+    def test_iter_in_processes(self, _mock_can_fork, _mock_prepare, mock_log):
+        results = list(CourseGradeFactory().iter(self.students, self.course, workers=2))
+        self.assertFalse(mock_log.exception.called)
+        self.assertEqual([result.student for result in results], self.students)
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertEqual(result.course_grade.percent, 0.0)
+            # shared objects are not copied back from the workers
+            self.assertIs(result.course_grade.course_data.course, self.course)
+
+    @patch('lms.djangoapps.grades.parallel.log')
+    @patch('lms.djangoapps.grades.parallel._dumps', side_effect=TypeError)
+    @patch('lms.djangoapps.grades.parallel._prepare_to_fork')
+    @patch('lms.djangoapps.grades.parallel._create_pool', _InProcessPool)
+    @patch('lms.djangoapps.grades.course_grade_factory.can_fork_workers', return_value=True)
+    def test_iter_in_processes_unsent_results(self, _mock_can_fork, _mock_prepare, _mock_dumps, _mock_log):
+        with patch.object(CourseGradeFactory, '_update', wraps=CourseGradeFactory._update) as mock_update:
+            results = list(CourseGradeFactory().iter(self.students, self.course, force_update=True, workers=2))
+        # the grades updated in the workers are not updated again
+        self.assertEqual(mock_update.call_count, len(self.students))
+        self.assertEqual([result.student for result in results], self.students)
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertEqual(result.course_grade.percent, 0.0)
+
+    @patch('lms.djangoapps.grades.course_grade_factory.imap_in_processes')
+    def test_iter_in_transaction(self, mock_imap_in_processes):
+        results = list(CourseGradeFactory().iter(self.students, self.course, workers=2))
+        self.assertFalse(mock_imap_in_processes.called)
+        self.assertEqual([result.student for result in results], self.students)
+
     def _course_grades_and_errors_for(self, course, students):
         """
         Simple helper method to iterate through student grades and give us
@@ -0,0 +1,153 @@
+"""
+Tests for the parallel module, using real pools of forked processes.
+"""
+
+
+import os
+from unittest import TestCase
+
+import billiard
+from mock import patch
+
+from ..parallel import can_fork_workers, imap_in_processes
+
+CALLING_PROCESS_ID = os.getpid()
+
+
+def _square(item):
+    """
+    Returns the square of the given item.
+    """
+    return item * item
+
+
+def _square_with_process_id(item):
+    """
+    Returns the square of the given item and the id of the process it
+    is computed in.
+    """
+    return _square(item), os.getpid()
+
+
+def _squares_in_processes(items):
+    """
+    Returns the squares of the given items, computed in worker processes
+    by imap_in_processes, and the ids of those processes.
+    """
+    return list(imap_in_processes(_square_with_process_id, items, workers=2, shard_size=2))
+
+
+def _square_or_exit(item):
+    """
+    Returns the square of the given item, but terminates the worker
+    process it is called in when given 3.
+    """
+    if item == 3 and os.getpid() != CALLING_PROCESS_ID:
+        os._exit(1)  # pylint: disable=protected-access
+    return _square(item)
+
+
+class TestImapInProcesses(TestCase):
+    """
+    Tests for imap_in_processes.
+    """
+    def test_results_in_order(self):
+        results = imap_in_processes(_square, range(50), workers=3, shard_size=4)
+        self.assertEqual(list(results), [item * item for item in range(50)])
+
+    def test_items_are_streamed(self):
+        read_items = []
+
+        def items():
+            """
+            Yields the items, recording each one that is read.
+            """
+            for item in range(100):
+                read_items.append(item)
+                yield item
+
+        results = imap_in_processes(_square, items(), workers=2, shard_size=5)
+        self.assertEqual(next(results), 0)
+        self.assertLessEqual(len(read_items), 25)
+        self.assertEqual(list(results), [item * item for item in range(1, 100)])
+
+    def test_concurrent_pools(self):
+        squares = imap_in_processes(_square, range(10), workers=2, shard_size=2)
+        negatives = imap_in_processes(lambda item: -item, range(10), workers=2, shard_size=3)
+        self.assertEqual(list(zip(squares, negatives)), [(item * item, -item) for item in range(10)])
+
+    def test_shared_objects(self):
+        shared_object = {u'shared': True}
+        results = list(imap_in_processes(
+            lambda item: (item, shared_object),
+            range(5),
+            workers=2,
+            shard_size=2,
+            shared_objects=[shared_object],
+        ))
+        self.assertEqual([item for item, _ in results], list(range(5)))
+        for _, result_shared_object in results:
+            self.assertIs(result_shared_object, shared_object)
+
+    @patch('lms.djangoapps.grades.parallel.log')
+    def test_unpicklable_result(self, _mock_log):
+        results = imap_in_processes(
+            lambda item: lambda: item,
+            range(5),
+            workers=2,
+            shard_size=2,
+            fallback=_square,
+        )
+        self.assertEqual(list(results), [item * item for item in range(5)])
+
+    @patch('lms.djangoapps.grades.parallel.log')
+    def test_reload_unpicklable_result(self, _mock_log):
+        fallback_items = []
+
+        def fallback(item):
+            """
+            Records the items that are processed again in the calling process.
+            """
+            fallback_items.append(item)
+            return item
+
+        results = imap_in_processes(
+            lambda item: lambda: item,
+            range(5),
+            workers=2,
+            shard_size=2,
+            fallback=fallback,
+            reload_result=_square,
+        )
+        self.assertEqual(list(results), [item * item for item in range(5)])
+        self.assertEqual(fallback_items, [])
+
+    @patch('lms.djangoapps.grades.parallel.log')
+    def test_worker_terminated(self, mock_log):
+        results = imap_in_processes(_square_or_exit, range(20), workers=2, shard_size=2, timeout=1)
+        self.assertEqual(list(results), [item * item for item in range(20)])
+        self.assertTrue(mock_log.error.called)
+
+
+class TestCanForkWorkers(TestCase):
+    """
+    Tests for can_fork_workers.
+    """
+    def test_can_fork(self):
+        self.assertTrue(can_fork_workers())
+
+    def test_celery_worker_process(self):
+        # Celery's pool processes are daemonic billiard processes.
+        pool = billiard.Pool(processes=1)
+        try:
+            celery_worker_process_id = pool.apply(os.getpid)
+            self.assertTrue(pool.apply(can_fork_workers))
+            results = pool.apply(_squares_in_processes, (list(range(10)),))
+        finally:
+            pool.terminate()
+            pool.join()
+
+        self.assertEqual([square for square, _ in results], [item * item for item in range(10)])
+        worker_process_ids = {process_id for _, process_id in results}
+        self.assertNotIn(celery_worker_process_id, worker_process_ids)
+        self.assertNotIn(CALLING_PROCESS_ID, worker_process_ids)
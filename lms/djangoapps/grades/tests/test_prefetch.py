@@ -0,0 +1,93 @@
+"""
+Tests for prefetch.py
+"""
+
+
+import six
+from submissions import api as submissions_api
+
+from lms.djangoapps.courseware.model_data import ScoresClient
+from lms.djangoapps.courseware.models import StudentModule
+from lms.djangoapps.courseware.tests.factories import StudentModuleFactory
+from student.models import anonymous_id_for_user
+from student.tests.factories import UserFactory
+
+from ..prefetch import clear_prefetched_scores, get_submissions_scores, prefetch_scores
+from .base import GradeTestBase
+
+
+class TestPrefetchScores(GradeTestBase):
+    """
+    Tests for prefetching the scores of a batch of users.
+    """
+    def setUp(self):
+        super(TestPrefetchScores, self).setUp()
+        self.addCleanup(clear_prefetched_scores, self.course.id)
+        self.users = [UserFactory.create() for __ in range(3)]
+        self.locations = [self.problem.location, self.problem2.location]
+
+        for index, user in enumerate(self.users[:2]):
+            StudentModuleFactory.create(
+                student=user,
+                course_id=self.course.id,
+                module_state_key=self.problem.location,
+                grade=index,
+                max_grade=2,
+            )
+            student_item = {
+                'student_id': anonymous_id_for_user(user, self.course.id),
+                'course_id': six.text_type(self.course.id),
+                'item_id': six.text_type(self.problem2.location),
+                'item_type': 'problem',
+            }
+            submission = submissions_api.create_submission(student_item, 'any answer')
+            submissions_api.set_score(submission['uuid'], index + 1, 3)
+
+    def test_prefetched_scores_match(self):
+        expected = [
+            (
+                ScoresClient.create_for_locations(self.course.id, user.id, self.locations),
+                get_submissions_scores(self.course.id, user),
+            )
+            for user in self.users
+        ]
+
+        with self.assertNumQueries(2):
+            prefetch_scores(self.course.id, self.users, self.course_structure)
+
+        with self.assertNumQueries(0):
+            for user, (expected_csm_scores, expected_submissions_scores) in zip(self.users, expected):
+                csm_scores = ScoresClient.create_for_locations(self.course.id, user.id, self.locations)
+                for location in self.locations:
+                    self.assertEqual(csm_scores.get(location), expected_csm_scores.get(location))
+                self.assertEqual(get_submissions_scores(self.course.id, user), expected_submissions_scores)
+
+    def test_not_prefetched_user(self):
+        prefetch_scores(self.course.id, self.users[1:], self.course_structure)
+        with self.assertNumQueries(1):
+            csm_scores = ScoresClient.create_for_locations(self.course.id, self.users[0].id, self.locations)
+        self.assertEqual(csm_scores.get(self.problem.location).correct, 0)
+
+    def test_clear_prefetched_scores(self):
+        prefetch_scores(self.course.id, self.users, self.course_structure)
+        clear_prefetched_scores(self.course.id)
+        with self.assertNumQueries(1):
+            ScoresClient.create_for_locations(self.course.id, self.users[0].id, self.locations)
+
+    def test_cleared_by_score_writes(self):
+        prefetch_scores(self.course.id, self.users, self.course_structure)
+        csm_score = StudentModule.objects.get(student=self.users[1], module_state_key=self.problem.location)
+        csm_score.grade = 2
+        csm_score.save()
+        submissions_api.reset_score(
+            anonymous_id_for_user(self.users[1], self.course.id),
+            six.text_type(self.course.id),
+            six.text_type(self.problem2.location),
+        )
+
+        with self.assertNumQueries(0):
+            ScoresClient.create_for_locations(self.course.id, self.users[0].id, self.locations)
+            get_submissions_scores(self.course.id, self.users[0])
+        csm_scores = ScoresClient.create_for_locations(self.course.id, self.users[1].id, self.locations)
+        self.assertEqual(csm_scores.get(self.problem.location).correct, 2)
+        self.assertEqual(get_submissions_scores(self.course.id, self.users[1]), {})
@@ -13,6 +13,7 @@ WAFFLE_SWITCHES = WaffleSwitchNamespace(name=WAFFLE_NAMESPACE)
 # Waffle switches
 OPTIMIZE_GET_LEARNERS_FOR_COURSE = u'optimize_get_learners_for_course'
 GENERATE_GRADE_REPORT_VERIFIED_ONLY = u'generate_grade_report_for_verified_only'
+BULK_RESCORE_PROBLEMS = u'bulk_rescore_problems'
 
 
 def waffle_flags():
@@ -35,3 +36,11 @@ def generate_grade_report_for_verified_only():
     verified learners.
     """
     return WAFFLE_SWITCHES.is_enabled(GENERATE_GRADE_REPORT_VERIFIED_ONLY)
+
+
+def bulk_rescore_switch_enabled():
+    """
+    Returns True if the waffle switch is enabled that indicates rescoring capa
+    problems in batches of learners, with their definition loaded once.
+    """
+    return WAFFLE_SWITCHES.is_enabled(BULK_RESCORE_PROBLEMS)
@@ -17,16 +17,18 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 import codecs
 import csv
 import hashlib
+import io
 import json
 import logging
 import os.path
+import tempfile
 from uuid import uuid4
 
 import six
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.db import models, transaction
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext as _
@@ -196,9 +198,9 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Large reports can be built up in a CsvReportFile, which can be
+    appended to for the sake of memory efficiency, rather than passing in the
+    whole dataset.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -230,7 +232,8 @@ class ReportStore(object):
             )
         return DjangoStorageReportStore.from_config(config_name)
 
-    def _get_utf8_encoded_rows(self, rows):
+    @staticmethod
+    def _get_utf8_encoded_rows(rows):
         """
         Given a list of `rows` containing unicode strings, return a
         new list of rows with those strings encoded as utf-8 for CSV
@@ -306,14 +309,19 @@ class DjangoStorageReportStore(ReportStore):
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
         """
-        output_buffer = ContentFile('')
-        # Adding unicode signature (BOM) for MS Excel 2013 compatibility
-        if six.PY2:
-            output_buffer.write(codecs.BOM_UTF8)
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        with CsvReportFile() as report_file:
+            report_file.add_rows(rows)
+            self.store_report_file(course_id, filename, report_file)
+
+    def store_report_file(self, course_id, filename, report_file):
+        """
+        Store the contents of the given CsvReportFile in a directory
+        determined by hashing `course_id`, and name the file `filename`.
+        The file's contents are already utf-8 encoded, and are passed to the
+        storage backend without being read into memory.
+        """
+        path = self.path_to(course_id, filename)
+        self.storage.save(path, report_file.open_for_storage())
 
     def links_for(self, course_id):
         """
@@ -349,3 +357,51 @@ class DjangoStorageReportStore(ReportStore):
         """
         hashed_course_id = hashlib.sha1(text_type(course_id).encode('utf-8')).hexdigest()
         return os.path.join(hashed_course_id, filename)
+
+
+class CsvReportFile(object):
+    """
+    A CSV report that rows can be appended to a batch at a time. The rows are
+    written to a temporary file, rather than kept in memory, until the report
+    is stored with DjangoStorageReportStore.store_report_file.
+    """
+    def __init__(self):
+        self.num_rows = 0
+        self._file = tempfile.TemporaryFile()
+        if six.PY2:
+            # Adding unicode signature (BOM) for MS Excel 2013 compatibility
+            self._file.write(codecs.BOM_UTF8)
+            self._text_file = self._file
+        else:
+            self._text_file = io.TextIOWrapper(self._file, encoding='utf-8', newline='')
+        self._csvwriter = csv.writer(self._text_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_rows(self, rows):
+        """
+        Appends the given rows (each row is an iterable of strings) to the
+        report in csv format.
+        """
+        for row in ReportStore._get_utf8_encoded_rows(rows):  # pylint: disable=protected-access
+            self._csvwriter.writerow(row)
+            self.num_rows += 1
+
+    def open_for_storage(self):
+        """
+        Returns a django File of the report's utf-8 encoded contents, ready
+        to be read from the beginning.
+        """
+        self._text_file.flush()
+        self._file.seek(0)
+        return File(self._file)
+
+    def close(self):
+        """
+        Closes and deletes the report's temporary file.
+        """
+        self._text_file.close()
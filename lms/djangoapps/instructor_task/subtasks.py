@@ -16,6 +16,7 @@ from celery.states import READY_STATES, RETRY, SUCCESS
 from django.core.cache import cache
 from django.db import DatabaseError, transaction
 from django.utils.encoding import python_2_unicode_compatible
+from edx_django_utils import monitoring as monitoring_utils
 from six.moves import range, zip
 
 from util.db import outer_atomic
@@ -62,6 +63,7 @@ def track_memory_usage(metric, course_id):
         total_memory_info = process.get_memory_info()
         total_usage = getattr(total_memory_info, memory_type)
         memory_used = total_usage - baseline_usage
+        monitoring_utils.set_custom_metric(u'{}.{}'.format(metric, memory_type), memory_used)
 
 
 def _generate_items_for_subtask(
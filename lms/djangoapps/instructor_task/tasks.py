@@ -29,6 +29,7 @@ from django.conf import settings
 from django.utils.translation import ugettext_noop
 
 from bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.config.waffle import bulk_rescore_switch_enabled
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
@@ -47,6 +48,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
 from lms.djangoapps.instructor_task.tasks_helper.module_state import (
     delete_problem_module_state,
     override_score_module_state,
+    perform_bulk_rescore,
     perform_module_state_update,
     rescore_problem_module_state,
     reset_attempts_module_state
@@ -77,6 +79,10 @@ def rescore_problem(entry_id, xmodule_instance_args):
     """
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = ugettext_noop('rescored')
+    if bulk_rescore_switch_enabled():
+        visit_fcn = partial(perform_bulk_rescore, xmodule_instance_args)
+        return run_main_task(entry_id, visit_fcn, action_name)
+
     update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
 
     visit_fcn = partial(perform_module_state_update, update_fcn, None)
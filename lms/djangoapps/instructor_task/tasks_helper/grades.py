@@ -23,15 +23,18 @@ from course_modes.models import CourseMode
 from lms.djangoapps.certificates.models import CertificateWhitelist, GeneratedCertificate, certificate_info_for_user
 from lms.djangoapps.courseware.courses import get_course_by_id
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
+from lms.djangoapps.grades.aggregator import BatchGradeAggregator
 from lms.djangoapps.grades.api import CourseGradeFactory
 from lms.djangoapps.grades.api import context as grades_context
-from lms.djangoapps.grades.api import prefetch_course_and_subsection_grades
+from lms.djangoapps.grades.api import prefetch_course_and_subsection_grades, prefetch_scores
 from lms.djangoapps.instructor_analytics.basic import list_problem_responses
 from lms.djangoapps.instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.instructor_task.config.waffle import (
     generate_grade_report_for_verified_only,
     optimize_get_learners_switch_enabled
 )
+from lms.djangoapps.instructor_task.models import CsvReportFile
+from lms.djangoapps.instructor_task.subtasks import track_memory_usage
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.lib.cache_utils import get_cache
@@ -45,7 +48,7 @@ from xmodule.partitions.partitions_service import PartitionService
 from xmodule.split_test_module import get_split_user_partitions
 
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store, get_report_info, tracker_emit
+from .utils import get_report_info, tracker_emit, upload_report_file_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -163,31 +166,33 @@ class GradeReportBase(object):
         course_id = context.course_id
         return get_enrolled_learners_for_course(course_id=course_id, verified_only=context.report_for_verified_only)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, success_file, error_file):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        Writes the given batched_rows for the given context to the success_file
+        and error_file a batch at a time, so that the complete lists of rows
+        are never held in memory.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = zip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        succeeded = failed = 0
+        for success_rows, error_rows in batched_rows:
+            success_file.add_rows(success_rows)
+            error_file.add_rows(error_rows)
+            succeeded += len(success_rows)
+            failed += len(error_rows)
 
         # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
+        context.task_progress.succeeded = succeeded
+        context.task_progress.failed = failed
         context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
         context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
 
-    def _upload(self, context, success_rows, error_rows):
+    def _upload(self, context, success_file, error_file):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Uploads the given report files, each of which starts with a header row.
         """
         date = datetime.now(UTC)
-        upload_csv_to_report_store(success_rows, context.file_name, context.course_id, date)
-        if len(error_rows) > 1:
-            upload_csv_to_report_store(error_rows, context.file_name + '_err', context.course_id, date)
+        upload_report_file_to_report_store(success_file, context.file_name, context.course_id, date)
+        if error_file.num_rows > 1:
+            upload_report_file_to_report_store(error_file, context.file_name + '_err', context.course_id, date)
 
     def log_additional_info_for_testing(self, context, message):
         """
@@ -395,6 +400,7 @@ class _CourseGradeBulkContext(object):
         bulk_cache_cohorts(context.course_id, users)
         BulkRoleCache.prefetch(users)
         prefetch_course_and_subsection_grades(context.course_id, users)
+        prefetch_scores(context.course_id, users, context.course_structure)
         BulkCourseTags.prefetch(context.course_id, users)
 
 
@@ -423,11 +429,15 @@ class CourseGradeReport(object):
         error_headers = self._error_headers()
         batched_rows = self._batched_rows(context)
 
-        context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
+        with CsvReportFile() as success_file, CsvReportFile() as error_file:
+            success_file.add_rows([success_headers])
+            error_file.add_rows([error_headers])
+            with track_memory_usage('grade_report.memory', context.course_id):
+                context.update_status(u'Compiling grades')
+                self._compile(context, batched_rows, success_file, error_file)
 
-        context.update_status(u'Uploading grades')
-        self._upload(context, success_headers, success_rows, error_headers, error_rows)
+                context.update_status(u'Uploading grades')
+                self._upload(context, success_file, error_file)
 
         return context.update_status(u'Completed grades')
 
@@ -460,32 +470,33 @@ class CourseGradeReport(object):
             users = [u for u in users if u is not None]
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, success_file, error_file):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        Writes the given batched_rows for the given context to the success_file
+        and error_file a batch at a time, so that the complete lists of rows
+        are never held in memory.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = zip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        succeeded = failed = 0
+        for success_rows, error_rows in batched_rows:
+            success_file.add_rows(success_rows)
+            error_file.add_rows(error_rows)
+            succeeded += len(success_rows)
+            failed += len(error_rows)
 
         # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
+        context.task_progress.succeeded = succeeded
+        context.task_progress.failed = failed
         context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
         context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
 
-    def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
+    def _upload(self, context, success_file, error_file):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Uploads the given report files, each of which starts with a header row.
         """
         date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
-        if len(error_rows) > 0:
-            error_rows = [error_headers] + error_rows
-            upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
+        upload_report_file_to_report_store(success_file, 'grade_report', context.course_id, date)
+        if error_file.num_rows > 1:
+            upload_report_file_to_report_store(error_file, 'grade_report_err', context.course_id, date)
 
     def _grades_header(self, context):
         """
@@ -567,20 +578,21 @@ class CourseGradeReport(object):
         report_for_verified_only = generate_grade_report_for_verified_only()
         return get_enrolled_learners_for_course(course_id=course_id, verified_only=report_for_verified_only)
 
-    def _user_grades(self, course_grade, context):
+    def _user_grades(self, course_grade, context, assignment_averages):
         """
         Returns a list of grade results for the given course_grade corresponding
-        to the headers for this report.
+        to the headers for this report, given the user's average for each
+        assignment type.
         """
         grade_results = []
-        for _, assignment_info in six.iteritems(context.graded_assignments):
+        for assignment_type, assignment_info in six.iteritems(context.graded_assignments):
             subsection_grades, subsection_grades_results = self._user_subsection_grades(
                 course_grade,
                 assignment_info['subsection_headers'],
             )
             grade_results.extend(subsection_grades_results)
 
-            assignment_average = self._user_assignment_average(course_grade, subsection_grades, assignment_info)
+            assignment_average = assignment_averages.get(assignment_type)
             if assignment_average is not None:
                 grade_results.append([assignment_average])
 
@@ -603,18 +615,31 @@ class CourseGradeReport(object):
             subsection_grades.append(subsection_grade)
         return subsection_grades, grade_results
 
-    def _user_assignment_average(self, course_grade, subsection_grades, assignment_info):
-        if assignment_info['separate_subsection_avg_headers']:
-            if assignment_info['grader']:
-                if course_grade.attempted:
-                    subsection_breakdown = [
-                        {'percent': subsection_grade.percent_graded}
-                        for subsection_grade in subsection_grades
-                    ]
-                    assignment_average, _ = assignment_info['grader'].total_with_drops(subsection_breakdown)
-                else:
-                    assignment_average = 0.0
-                return assignment_average
+    def _assignment_averages(self, course_grades, context):
+        """
+        Returns, for each of the given course_grades, a dict of the average of
+        each assignment type that has a separate average column in this report.
+
+        The averages of the whole batch are computed at once by the
+        BatchGradeAggregator.
+        """
+        assignment_averages = [{} for __ in course_grades]
+        if not course_grades:
+            return assignment_averages
+        for assignment_type, assignment_info in six.iteritems(context.graded_assignments):
+            if not assignment_info['separate_subsection_avg_headers'] or not assignment_info['grader']:
+                continue
+            percents = [
+                [
+                    course_grade.subsection_grade(subsection_location).percent_graded
+                    for subsection_location in assignment_info['subsection_headers']
+                ]
+                for course_grade in course_grades
+            ]
+            averages = BatchGradeAggregator.average_with_drops(percents, assignment_info['grader'])
+            for user_averages, course_grade, average in zip(assignment_averages, course_grades, averages):
+                user_averages[assignment_type] = float(average) if course_grade.attempted else 0.0
+        return assignment_averages
 
     def _user_cohort_group_names(self, user, context):
         """
@@ -681,7 +706,7 @@ class CourseGradeReport(object):
         with modulestore().bulk_operations(context.course_id):
             bulk_context = _CourseGradeBulkContext(context, users)
 
-            success_rows, error_rows = [], []
+            graded_users, course_grades, error_rows = [], [], []
             for user, course_grade, error in CourseGradeFactory().iter(
                 users,
                 course=context.course,
@@ -692,16 +717,22 @@ class CourseGradeReport(object):
                     # An empty gradeset means we failed to grade a student.
                     error_rows.append([user.id, user.username, text_type(error)])
                 else:
-                    success_rows.append(
-                        [user.id, user.email, user.username] +
-                        self._user_grades(course_grade, context) +
-                        self._user_cohort_group_names(user, context) +
-                        self._user_experiment_group_names(user, context) +
-                        self._user_team_names(user, bulk_context.teams) +
-                        self._user_verification_mode(user, context, bulk_context.enrollments) +
-                        self._user_certificate_info(user, context, course_grade, bulk_context.certs) +
-                        [_user_enrollment_status(user, context.course_id)]
-                    )
+                    graded_users.append(user)
+                    course_grades.append(course_grade)
+
+            success_rows = []
+            assignment_averages = self._assignment_averages(course_grades, context)
+            for user, course_grade, user_assignment_averages in zip(graded_users, course_grades, assignment_averages):
+                success_rows.append(
+                    [user.id, user.email, user.username] +
+                    self._user_grades(course_grade, context, user_assignment_averages) +
+                    self._user_cohort_group_names(user, context) +
+                    self._user_experiment_group_names(user, context) +
+                    self._user_team_names(user, bulk_context.teams) +
+                    self._user_verification_mode(user, context, bulk_context.enrollments) +
+                    self._user_certificate_info(user, context, course_grade, bulk_context.certs) +
+                    [_user_enrollment_status(user, context.course_id)]
+                )
             return success_rows, error_rows
 
 
@@ -730,10 +761,14 @@ class ProblemGradeReport(GradeReportBase):
         error_headers = self._error_headers()
         batched_rows = self._batched_rows(context)
 
-        context.update_status('ProblemGradeReport - 2: Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
-        context.update_status('ProblemGradeReport - 3: Uploading grades')
-        self._upload(context, [success_headers] + success_rows, [error_headers] + error_rows)
+        with CsvReportFile() as success_file, CsvReportFile() as error_file:
+            success_file.add_rows([success_headers])
+            error_file.add_rows([error_headers])
+            with track_memory_usage('problem_grade_report.memory', context.course_id):
+                context.update_status('ProblemGradeReport - 2: Compiling grades')
+                self._compile(context, batched_rows, success_file, error_file)
+                context.update_status('ProblemGradeReport - 3: Uploading grades')
+                self._upload(context, success_file, error_file)
 
         return context.update_status('ProblemGradeReport - 4: Completed problem grades')
 
@@ -764,6 +799,7 @@ class ProblemGradeReport(GradeReportBase):
         Returns a list of rows for the given users for this report.
         """
         self.log_additional_info_for_testing(context, 'ProblemGradeReport: Starting to process new user batch.')
+        prefetch_scores(context.course_id, users, context.course_structure)
         success_rows, error_rows = [], []
         for student, course_grade, error in CourseGradeFactory().iter(
             users,
@@ -3,27 +3,45 @@ Instructor Tasks related to module state.
 """
 
 
+import copy
 import json
 import logging
+from datetime import datetime
+from functools import partial
 from time import time
 
+import pytz
 import six
+from ccx_keys.locator import CCXLocator
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_noop
+from eventtracking import tracker
 from opaque_keys.edx.keys import UsageKey
 from xblock.runtime import KvsFieldData
 from xblock.scorable import Score
 
+from capa.capa_problem import LoncapaProblem, LoncapaSystem
 from capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
+from lms.djangoapps.courseware.access import has_access
 from lms.djangoapps.courseware.courses import get_course_by_id, get_problems_in_section
 from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.module_render import get_module_for_descriptor_internal
+from lms.djangoapps.grades.api import constants as grades_constants
 from lms.djangoapps.grades.api import events as grades_events
-from student.models import get_user_by_username_or_email
+from lms.djangoapps.grades.api import signals as grades_signals
+from openedx.core.lib.grade_utils import is_score_higher_or_equal
+from student.models import anonymous_id_for_user, get_user_by_username_or_email
+from track import contexts
 from track.event_transaction_utils import create_new_event_transaction_id, set_event_transaction_type
 from track.views import task_track
 from util.db import outer_atomic
+from xmodule.capa_base import unmask_event
+from xmodule.capa_module import ProblemBlock
+from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
+from xmodule.util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
 
 from ..exceptions import UpdateProblemModuleStateError
 from .runner import TaskProgress
@@ -31,6 +49,9 @@ from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED,
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# number of learners rescored by perform_bulk_rescore in each transaction
+RESCORE_BATCH_SIZE = 100
+
 
 def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
     """
@@ -61,11 +82,93 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
 
     """
     start_time = time()
+    student_identifier = task_input.get('student')
+    override_score_task = action_name == ugettext_noop('overridden')
+    usage_keys, problems = _get_problems_to_update(course_id, task_input)
+
+    modules_to_update = _get_modules_to_update(
+        course_id, usage_keys, student_identifier, filter_fcn, override_score_task
+    )
+
+    task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
+    task_progress.update_task_state()
+
+    for module_to_update in modules_to_update:
+        module_descriptor = problems[six.text_type(module_to_update.module_state_key)]
+        # There is no try here:  if there's an error, we let it throw, and the task will
+        # be marked as FAILED, with a stack trace.
+        update_status = update_fcn(module_descriptor, module_to_update, task_input)
+        _count_update_status(task_progress, update_status)
+
+    return task_progress.update_task_state()
+
+
+def perform_bulk_rescore(xmodule_instance_args, _entry_id, course_id, task_input, action_name):
+    """
+    Rescores the learners' submissions to the problems, like
+    perform_module_state_update does with rescore_problem_module_state, and
+    returns the task's results.
+
+    The learners' submissions to capa problems are rescored by a
+    BulkProblemRescorer, which loads each problem's definition once, in
+    transactions of RESCORE_BATCH_SIZE learners.  The grade changes and tracking
+    events of a batch are sent once its transaction is committed.  The other
+    submissions, and the ones the BulkProblemRescorer can't rescore, are
+    rescored by rescore_problem_module_state.
+    """
+    start_time = time()
+    usage_keys, problems = _get_problems_to_update(course_id, task_input)
+    modules_to_update = _get_modules_to_update(
+        course_id, usage_keys, task_input.get('student'), None
+    ).select_related('student')
+
+    task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
+    task_progress.update_task_state()
+
+    rescorers = {}
+    with modulestore().bulk_operations(course_id):
+        for batch_start in range(0, len(modules_to_update), RESCORE_BATCH_SIZE):
+            modules_not_rescored = []
+            publish_after_commit = []
+            with outer_atomic():
+                for module_to_update in modules_to_update[batch_start:batch_start + RESCORE_BATCH_SIZE]:
+                    location = six.text_type(module_to_update.module_state_key)
+                    if location not in rescorers:
+                        rescorers[location] = BulkProblemRescorer.for_problem(
+                            course_id, problems[location], xmodule_instance_args, task_input['only_if_higher']
+                        )
+                    update_status = rescorers[location] and rescorers[location].rescore(
+                        module_to_update, publish_after_commit.append
+                    )
+                    if update_status is None:
+                        modules_not_rescored.append(module_to_update)
+                    else:
+                        _count_update_status(task_progress, update_status)
+
+            # so that the grades are recalculated from the committed scores
+            for publish in publish_after_commit:
+                publish()
+
+            # rescore_problem_module_state runs in its own transaction
+            for module_to_update in modules_not_rescored:
+                module_descriptor = problems[six.text_type(module_to_update.module_state_key)]
+                update_status = rescore_problem_module_state(
+                    xmodule_instance_args, module_descriptor, module_to_update, task_input
+                )
+                _count_update_status(task_progress, update_status)
+            task_progress.update_task_state()
+
+    return task_progress.update_task_state()
+
+
+def _get_problems_to_update(course_id, task_input):
+    """
+    Returns the usage keys of the problems to update for the task_input, and a
+    dict mapping their locations to their descriptors.
+    """
     usage_keys = []
     problem_url = task_input.get('problem_url')
     entrance_exam_url = task_input.get('entrance_exam_url')
-    student_identifier = task_input.get('student')
-    override_score_task = action_name == ugettext_noop('overridden')
     problems = {}
 
     # if problem_url is present make a usage key from it
@@ -82,31 +185,296 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
         problems = get_problems_in_section(entrance_exam_url)
         usage_keys = [UsageKey.from_string(location) for location in problems.keys()]
 
-    modules_to_update = _get_modules_to_update(
-        course_id, usage_keys, student_identifier, filter_fcn, override_score_task
-    )
+    return usage_keys, problems
 
-    task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
-    task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[six.text_type(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        update_status = update_fcn(module_descriptor, module_to_update, task_input)
-        if update_status == UPDATE_STATUS_SUCCEEDED:
-            # If the update_fcn returns true, then it performed some kind of work.
-            # Logging of failures is left to the update_fcn itself.
-            task_progress.succeeded += 1
-        elif update_status == UPDATE_STATUS_FAILED:
-            task_progress.failed += 1
-        elif update_status == UPDATE_STATUS_SKIPPED:
-            task_progress.skipped += 1
-        else:
-            raise UpdateProblemModuleStateError(u"Unexpected update_status returned: {}".format(update_status))
+def _count_update_status(task_progress, update_status):
+    """
+    Counts an attempted update with the given status in the task's progress.
+    """
+    task_progress.attempted += 1
+    if update_status == UPDATE_STATUS_SUCCEEDED:
+        # If the update_fcn returns true, then it performed some kind of work.
+        # Logging of failures is left to the update_fcn itself.
+        task_progress.succeeded += 1
+    elif update_status == UPDATE_STATUS_FAILED:
+        task_progress.failed += 1
+    elif update_status == UPDATE_STATUS_SKIPPED:
+        task_progress.skipped += 1
+    else:
+        raise UpdateProblemModuleStateError(u"Unexpected update_status returned: {}".format(update_status))
 
-    return task_progress.update_task_state()
+
+class _LearnerProblem(object):
+    """
+    Stands in for a learner's problem block, as the capa_module of a
+    LoncapaProblem being rescored, which its responses use to track the hints
+    they show.
+    """
+    def __init__(self, location, runtime):
+        self.location = location
+        self.runtime = runtime
+
+
+class _LearnerRuntime(object):
+    """
+    Stands in for the runtime of a learner's problem block.
+    """
+    def __init__(self, track_function):
+        self.track_function = track_function
+
+
+class BulkProblemRescorer(object):
+    """
+    Rescores the submissions of many learners to a capa problem, as
+    ProblemBlock.rescore does for a learner.
+
+    Rather than binding the problem to a new module system and FieldDataCache
+    for each learner, the rescorer loads the problem's definition once, then
+    grades a LoncapaProblem built from the state of each learner's
+    StudentModule, and saves the learner's state and score in the same update
+    of the StudentModule.  The LoncapaProblems share the parsed XML and the
+    script contexts for their seed (see capa.capa_problem).
+
+    rescore returns None for the learners whose submissions it can't rescore
+    exactly as ProblemBlock.rescore would, which are left to
+    rescore_problem_module_state.
+    """
+    def __init__(self, course_id, descriptor, xmodule_instance_args, only_if_higher):
+        self.course_id = course_id
+        self.descriptor = descriptor
+        self.xmodule_instance_args = xmodule_instance_args
+        self.only_if_higher = only_if_higher
+        self.uses_anonymous_student_id = 'anonymous_student_id' in descriptor.data
+        self.publish_scores = _can_update_student_state(course_id)
+
+    @classmethod
+    def for_problem(cls, course_id, descriptor, xmodule_instance_args, only_if_higher):
+        """
+        Returns a rescorer for the problem, or None if its learners' submissions
+        can't be rescored in bulk: if it isn't a capa problem, or its course is a
+        CCX, whose field overrides the problem isn't bound to.
+        """
+        if not isinstance(descriptor, ProblemBlock) or isinstance(course_id, CCXLocator):
+            return None
+        return cls(course_id, descriptor, xmodule_instance_args, only_if_higher)
+
+    def _capa_system(self, student):
+        """
+        Returns the LoncapaSystem of the learner's problem, as ProblemBlock.new_lcp
+        creates it, without the fields only used for rendering the problem.
+        """
+        descriptor = self.descriptor
+        return LoncapaSystem(
+            ajax_url=None,
+            anonymous_student_id=(
+                anonymous_id_for_user(student, self.course_id) if self.uses_anonymous_student_id else None
+            ),
+            cache=cache,
+            can_execute_unsafe_code=lambda: can_execute_unsafe_code(self.course_id),
+            get_python_lib_zip=lambda: get_python_lib_zip(contentstore, self.course_id),
+            DEBUG=settings.DEBUG,
+            filestore=descriptor.runtime.resources_fs,
+            i18n=descriptor.runtime.service(descriptor, 'i18n'),
+            node_path=settings.NODE_PATH,
+            render_template=None,
+            seed=None,
+            STATIC_URL=settings.STATIC_URL,
+            xqueue=None,
+            matlab_api_key=descriptor.matlab_api_key,
+        )
+
+    def rescore(self, student_module, publish_after_commit):
+        """
+        Rescores the learner's submission to the problem, and returns the status
+        of the update, or None if it must be rescored by rescore_problem_module_state.
+
+        The function that sends the learner's grade change and tracking events
+        is passed to publish_after_commit, to be called once the update of the
+        StudentModule is committed.
+        """
+        student = student_module.student
+        usage_key = student_module.module_state_key
+        state = json.loads(student_module.state) if student_module.state else {}
+
+        if not has_access(student, 'load', self.descriptor, self.course_id):
+            TASK_LOG.warning(u"No module {location} for student {student}--access denied?".format(
+                location=usage_key,
+                student=student
+            ))
+            return UPDATE_STATUS_FAILED
+
+        if not state.get('done'):
+            return UPDATE_STATUS_SKIPPED
+        if state.get('seed') is None:
+            return None
+
+        track_function = _get_track_function_for_task(student, self.xmodule_instance_args)
+        lcp = LoncapaProblem(
+            problem_text=self.descriptor.data,
+            id=self.descriptor.location.html_id(),
+            capa_system=self._capa_system(student),
+            capa_module=_LearnerProblem(self.descriptor.location, _LearnerRuntime(track_function)),
+            state={
+                'done': True,
+                'correct_map': state.get('correct_map') or {},
+                'student_answers': state.get('student_answers') or {},
+                'has_saved_answers': state.get('has_saved_answers', False),
+                'input_state': state.get('input_state') or {},
+                'seed': state['seed'],
+            },
+            seed=state['seed'],
+            extract_tree=False,
+        )
+        if not lcp.supports_rescoring():
+            return None
+
+        lcp_score = lcp.calculate_score()
+        if state.get('score') is None:
+            state['score'] = {'raw_earned': lcp_score['score'], 'raw_possible': lcp_score['total']}
+        event_info = {
+            'state': lcp.get_state(),
+            'problem_id': six.text_type(usage_key),
+            'orig_score': state['score']['raw_earned'],
+            'orig_total': state['score']['raw_possible'],
+        }
+
+        try:
+            # as ProblemBlock.update_correctness and calculate_score
+            lcp.context['attempt'] = max(state.get('attempts', 0), 1)
+            lcp.correct_map.update(lcp.get_grade_from_current_answers(None))
+            lcp_score = lcp.calculate_score()
+        except (LoncapaProblemError, StudentInputError, ResponseError):
+            TASK_LOG.warning(
+                u"error processing rescore call for course %(course)s, problem %(loc)s "
+                u"and student %(student)s",
+                dict(
+                    course=self.course_id,
+                    loc=usage_key,
+                    student=student
+                ),
+                exc_info=True,
+            )
+            event_info['failure'] = 'input_error'
+            publish_after_commit(partial(
+                self._track, student, lcp, track_function, 'problem_rescore_fail', event_info
+            ))
+            return UPDATE_STATUS_FAILED
+        except Exception:
+            event_info['failure'] = 'unexpected'
+            self._track(student, lcp, track_function, 'problem_rescore_fail', event_info)
+            raise
+
+        # rescoring has no effect on attempts, as in ProblemBlock.rescore
+        lcp_state = lcp.get_state()
+        for field in ('done', 'correct_map', 'input_state', 'student_answers', 'has_saved_answers'):
+            state[field] = lcp_state[field]
+        score_updated = self.publish_scores and self._update_score(
+            student_module, state, lcp_score['score'], lcp_score['total']
+        )
+        student_module.state = json.dumps(state)
+        student_module.save()
+
+        event_info['new_score'] = lcp_score['score']
+        event_info['new_total'] = lcp_score['total']
+        event_info['correct_map'] = lcp.correct_map.get_dict()
+        event_info['success'] = 'correct' if all(
+            lcp.correct_map.is_correct(answer_id) for answer_id in lcp.correct_map
+        ) else 'incorrect'
+        event_info['attempts'] = state.get('attempts', 0)
+        publish_after_commit(partial(
+            self._publish, student_module, lcp, track_function, lcp_score, score_updated, event_info
+        ))
+
+        TASK_LOG.debug(
+            u"successfully processed rescore call for course %(course)s, problem %(loc)s "
+            u"and student %(student)s",
+            dict(
+                course=self.course_id,
+                loc=usage_key,
+                student=student
+            )
+        )
+        return UPDATE_STATUS_SUCCEEDED
+
+    def _update_score(self, student_module, state, raw_earned, raw_possible):
+        """
+        Sets the learner's new score on the StudentModule and its state, unless
+        it's rescored only if higher and it isn't, as the grades app's
+        score_published_handler does, and returns whether it was set.
+        """
+        if self.only_if_higher and not is_score_higher_or_equal(
+            student_module.grade, student_module.max_grade, raw_earned, raw_possible
+        ):
+            TASK_LOG.warning(
+                u"Grades: Rescore is not higher than previous: "
+                u"user: {}, block: {}, previous: {}/{}, new: {}/{} ".format(
+                    student_module.student, student_module.module_state_key,
+                    student_module.grade, student_module.max_grade, raw_earned, raw_possible,
+                )
+            )
+            return False
+        student_module.grade = raw_earned
+        student_module.max_grade = raw_possible
+        state['score'] = {'raw_earned': raw_earned, 'raw_possible': raw_possible}
+        return True
+
+    def _publish(self, student_module, lcp, track_function, lcp_score, score_updated, event_info):
+        """
+        Sends the learner's grade change, if their score was updated, and the
+        problem_rescore tracking event, with the tracking info of a rescore, as
+        ProblemBlock.rescore does.
+        """
+        create_new_event_transaction_id()
+        set_event_transaction_type(grades_events.GRADES_RESCORE_EVENT_TYPE)
+        if score_updated:
+            self._send_score_changed(student_module, lcp_score['score'], lcp_score['total'])
+        self._track(student_module.student, lcp, track_function, 'problem_rescore', event_info)
+
+    def _send_score_changed(self, student_module, raw_earned, raw_possible):
+        """
+        Sends the signal that the learner's score changed, as the grades app's
+        score_published_handler does, to update the learner's grades.
+        """
+        grades_signals.PROBLEM_RAW_SCORE_CHANGED.send(
+            sender=None,
+            raw_earned=raw_earned,
+            raw_possible=raw_possible,
+            weight=self.descriptor.weight,
+            user_id=student_module.student_id,
+            course_id=six.text_type(self.course_id),
+            usage_id=six.text_type(student_module.module_state_key),
+            only_if_higher=self.only_if_higher,
+            modified=student_module.modified,
+            score_db_table=grades_constants.ScoreDatabaseTableEnum.courseware_student_module,
+            score_deleted=False,
+            grader_response=False,
+        )
+
+    def _track(self, student, lcp, track_function, event_type, event_info):
+        """
+        Emits the tracking event, with the choice names unmasked, in the context
+        the module system of the learner's problem block would.
+        """
+        event_unmasked = copy.deepcopy(event_info)
+        unmask_event(lcp, event_unmasked)
+        context = contexts.course_context_from_course_id(self.course_id)
+        context['user_id'] = student.id
+        context['asides'] = {}
+        with tracker.get_tracker().context(event_type, context):
+            track_function(event_type, event_unmasked)
+
+
+def _can_update_student_state(course_id):
+    """
+    Returns whether the learners' scores in the course can be updated, as
+    module_render checks before handling a grade event.
+    """
+    if not settings.FEATURES.get("ALLOW_STUDENT_STATE_UPDATES_ON_CLOSED_COURSE", True):
+        course = modulestore().get_course(course_id, depth=0)
+        if course.end is not None and datetime.now(pytz.UTC) > course.end:
+            return False
+    return True
 
 
 @outer_atomic
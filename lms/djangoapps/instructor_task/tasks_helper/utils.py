@@ -64,6 +64,25 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
     return report_name
 
 
+def upload_report_file_to_report_store(report_file, csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'):
+    """
+    Upload a CsvReportFile using ReportStore.
+
+    Arguments:
+        report_file: CsvReportFile containing the report's rows
+        csv_name: Name of the resulting CSV
+        course_id: ID of the course
+
+    Returns:
+        report_name: string - Name of the generated report
+    """
+    report_store, report_name = get_report_info(csv_name, course_id, timestamp, config_name)
+
+    report_store.store_report_file(course_id, report_name, report_file)
+    tracker_emit(csv_name)
+    return report_name
+
+
 def tracker_emit(report_name):
     """
     Emits a 'report.requested' event for the given report.
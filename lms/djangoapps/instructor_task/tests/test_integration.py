@@ -11,6 +11,7 @@ import json
 import logging
 import textwrap
 from collections import namedtuple
+from contextlib import contextmanager
 
 import ddt
 import six
@@ -20,17 +21,20 @@ from django.urls import reverse
 from mock import patch
 from six import text_type
 from six.moves import range
+from waffle.testutils import override_switch
 
 from capa.responsetypes import StudentInputError
 from capa.tests.response_xml_factory import CodeResponseXMLFactory, CustomResponseXMLFactory
 from lms.djangoapps.courseware.model_data import StudentModule
 from lms.djangoapps.grades.api import CourseGradeFactory
+from lms.djangoapps.grades.api import signals as grades_signals
 from lms.djangoapps.instructor_task.api import (
     submit_delete_problem_state_for_all_students,
     submit_rescore_problem_for_all_students,
     submit_rescore_problem_for_student,
     submit_reset_problem_attempts_for_all_students
 )
+from lms.djangoapps.instructor_task.config.waffle import BULK_RESCORE_PROBLEMS, WAFFLE_NAMESPACE
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport
 from lms.djangoapps.instructor_task.tests.test_base import (
@@ -432,6 +436,66 @@ class TestRescoringTask(TestIntegrationTask):
             self.check_state(user, descriptor, 0, 1, expected_attempts=2)
 
 
+@override_switch('.'.join([WAFFLE_NAMESPACE, BULK_RESCORE_PROBLEMS]), True)
+class TestBulkRescoringTask(TestRescoringTask):
+    """
+    Integration-style tests for rescoring problems in a background task, with
+    the learners' submissions rescored in bulk.
+    """
+
+    def test_problem_modules_not_bound(self):
+        """
+        The learners' submissions to capa problems are rescored without binding
+        the problem to each learner.
+        """
+        problem_url_name = 'H1P1'
+        self.define_option_problem(problem_url_name)
+        location = InstructorTaskModuleTestCase.problem_location(problem_url_name)
+        descriptor = self.module_store.get_item(location)
+        self.submit_student_answer('u1', problem_url_name, [OPTION_1, OPTION_1])
+        self.submit_student_answer('u2', problem_url_name, [OPTION_1, OPTION_2])
+        self.redefine_option_problem(problem_url_name, correct_answer=OPTION_2)
+
+        with patch(
+            'lms.djangoapps.instructor_task.tasks_helper.module_state.get_module_for_descriptor_internal'
+        ) as mock_get_module:
+            self.submit_rescore_all_student_answers('instructor', problem_url_name)
+        self.assertFalse(mock_get_module.called)
+
+        self.check_state(self.user1, descriptor, 0, 2)
+        self.check_state(self.user2, descriptor, 1, 2)
+
+    def test_grade_changes_sent_after_commit(self):
+        """
+        The grade changes of a batch of learners are sent once the batch's
+        transaction is committed.
+        """
+        problem_url_name = 'H1P1'
+        self.define_option_problem(problem_url_name)
+        self.submit_student_answer('u1', problem_url_name, [OPTION_1, OPTION_1])
+        self.submit_student_answer('u2', problem_url_name, [OPTION_1, OPTION_2])
+        self.redefine_option_problem(problem_url_name, correct_answer=OPTION_2)
+
+        open_batches = []
+
+        @contextmanager
+        def batch_transaction():
+            open_batches.append(True)
+            yield
+            open_batches.pop()
+
+        sent_in_batch = []
+
+        def score_changed_receiver(**kwargs):  # pylint: disable=unused-argument
+            sent_in_batch.append(bool(open_batches))
+
+        grades_signals.PROBLEM_RAW_SCORE_CHANGED.connect(score_changed_receiver)
+        self.addCleanup(grades_signals.PROBLEM_RAW_SCORE_CHANGED.disconnect, score_changed_receiver)
+        with patch('lms.djangoapps.instructor_task.tasks_helper.module_state.outer_atomic', batch_transaction):
+            self.submit_rescore_all_student_answers('instructor', problem_url_name)
+        self.assertEqual(sent_in_batch, [False, False])
+
+
 class TestResetAttemptsTask(TestIntegrationTask):
     """
     Integration-style tests for resetting problem attempts in a background task.
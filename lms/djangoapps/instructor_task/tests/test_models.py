@@ -12,7 +12,7 @@ from django.test import SimpleTestCase, TestCase, override_settings
 from opaque_keys.edx.locator import CourseLocator
 
 from common.test.utils import MockS3BotoMixin
-from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore, TASK_INPUT_LENGTH
+from lms.djangoapps.instructor_task.models import CsvReportFile, InstructorTask, ReportStore, TASK_INPUT_LENGTH
 from lms.djangoapps.instructor_task.tests.test_base import TestReportMixin
 
 
@@ -69,6 +69,29 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_store_report_file(self):
+        """
+        Test that rows added to a CsvReportFile a batch at a time are stored
+        as they were by the in-memory csv buffer of add_rows() and store().
+        """
+        report_store = self.create_report_store()
+        rows = [[u'Student ID', u'Username'], [1, u'\u00e9ric'], [2, u'bob'], [3, u'a,"b"'], [4, u'line\nbreak']]
+        output_buffer = report_store.add_rows(rows)
+        output_buffer.seek(0)
+        report_store.store(self.course_id, 'buffer_file', output_buffer)
+        with CsvReportFile() as report_file:
+            report_file.add_rows(rows[:2])
+            report_file.add_rows(rows[2:])
+            self.assertEqual(report_file.num_rows, len(rows))
+            report_store.store_report_file(self.course_id, 'report_file', report_file)
+
+        stored_contents = []
+        for filename in ['buffer_file', 'report_file']:
+            with report_store.storage.open(report_store.path_to(self.course_id, filename)) as stored_file:
+                stored_contents.append(stored_file.read())
+        self.assertEqual(stored_contents[0], stored_contents[1])
+        self.assertIn(u'\u00e9ric'.encode('utf-8'), stored_contents[1])
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -164,6 +164,18 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
         self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    @patch('lms.djangoapps.instructor_task.subtasks.monitoring_utils.set_custom_metric')
+    def test_memory_usage_metric(self, mock_set_custom_metric, _mock_current_task):
+        """
+        Test that the memory used to generate the report is recorded.
+        """
+        self.create_student('student', 'student@example.com')
+        CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+        recorded_metrics = [call_args[0][0] for call_args in mock_set_custom_metric.call_args_list]
+        self.assertIn('grade_report.memory.rss', recorded_metrics)
+        self.assertIn('grade_report.memory.vms', recorded_metrics)
+
     def test_cohort_data_in_grading(self):
         """
         Test that cohort data is included in grades csv if cohort configuration is enabled for course.
@@ -5,13 +5,13 @@ Module implementing `xblock.runtime.Runtime` functionality for the LMS
 
 import six
 import xblock.reference.plugins
-from completion.services import CompletionService
 from django.conf import settings
 from django.urls import reverse
 from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
 
 from badges.service import BadgingService
 from badges.utils import badges_enabled
+from lms.djangoapps.courseware.services import CoursewareCompletionService
 from lms.djangoapps.lms_xblock.models import XBlockAsidesConfig
 from lms.djangoapps.teams.services import TeamsService
 from openedx.core.djangoapps.user_api.course_tag import api as user_course_tag_api
@@ -193,7 +193,7 @@ class LmsModuleSystem(LmsCourse, LmsUser, ModuleSystem):  # pylint: disable=abst
         services = kwargs.setdefault('services', {})
         user = kwargs.get('user')
         if user and user.is_authenticated:
-            services['completion'] = CompletionService(user=user, context_key=kwargs.get('course_id'))
+            services['completion'] = CoursewareCompletionService(user=user, context_key=kwargs.get('course_id'))
         services['fs'] = xblock.reference.plugins.FSService()
         services['i18n'] = ModuleI18nService
         services['library_tools'] = LibraryToolsService(store)
@@ -206,10 +206,26 @@ class LmsModuleSystem(LmsCourse, LmsUser, ModuleSystem):  # pylint: disable=abst
         if badges_enabled():
             services['badging'] = BadgingService(course_id=kwargs.get('course_id'), modulestore=store)
         self.request_token = kwargs.pop('request_token', None)
+        self.render_metrics_recorder = kwargs.pop('render_metrics_recorder', None)
         services['teams'] = TeamsService()
         services['teams_configuration'] = TeamsConfigurationService()
         super().__init__(**kwargs)
 
+    def render(self, block, view_name, context=None):
+        """
+        Renders the view of the block, measuring it with the runtime's
+        render_metrics_recorder, if it has one.
+
+        See :method:`xblock.runtime:Runtime.render`
+        """
+        if self.render_metrics_recorder is None:
+            return super().render(block, view_name, context=context)
+        return self.render_metrics_recorder.render(
+            block,
+            view_name,
+            lambda: super(LmsModuleSystem, self).render(block, view_name, context=context),
+        )
+
     def handler_url(self, *args, **kwargs):
         """
         Implement the XBlock runtime handler_url interface.
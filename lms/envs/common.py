@@ -1021,6 +1021,20 @@ XBLOCK_FS_STORAGE_BUCKET = None
 XBLOCK_FS_STORAGE_PREFIX = None
 XBLOCK_SETTINGS = {}
 
+# Timeout, in seconds, of the cached fragments of XBlock views that are shared
+# between users (see the courseware.xblock_fragment_cache waffle flag).
+XBLOCK_FRAGMENT_CACHE_TIMEOUT = 60 * 60
+
+# Import paths of the classes that receive the render metrics of each XBlock (see the
+# courseware.xblock_render_metrics waffle flag), such as
+# lms.djangoapps.courseware.render_metrics.LogRenderMetricsSink and
+# lms.djangoapps.courseware.render_metrics.MonitoringRenderMetricsSink.
+XBLOCK_RENDER_METRICS_SINKS = []
+
+# Timeout, in seconds, of the contexts of randomized problems computed when their
+# course is published (see the courseware.precompute_problem_contexts waffle flag).
+PROBLEM_CONTEXT_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
 ############# ModuleStore Configuration ##########
 
 MODULESTORE_BRANCH = 'published-only'
@@ -1092,6 +1106,16 @@ MODULESTORE = {
     }
 }
 
+# Maximum size, in bytes, of the per-process LRU cache of pickled split
+# modulestore course structures that sits in front of 'course_structure_cache'.
+# Structures are immutable, so cached entries never go stale. 0 disables it.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_BYTES = 0
+
+# Maximum size, in bytes, of the per-process LRU cache of pickled split
+# modulestore definitions, keyed by definition id. Saved definitions are
+# immutable, so cached entries never go stale. 0 disables it.
+COURSE_DEFINITION_PROCESS_CACHE_MAX_BYTES = 0
+
 DATABASES = {
     # edxapp's edxapp-migrate scripts and the edxapp_migrate play
     # will ensure that any DB not named read_replica will be migrated
@@ -1150,6 +1174,18 @@ CODE_JAIL = {
     },
 }
 
+# Executes sandboxed code in a pool of sandbox workers that stay running, instead of
+# starting a new sandboxed Python for each execution (see capa/safe_exec/worker_pool.py).
+CODE_JAIL_WORKER_POOL = {
+    'ENABLED': False,
+    # Number of workers started by each process.
+    'SIZE': 2,
+    # Number of executions after which a worker is replaced.
+    'MAX_EXECUTIONS': 100,
+    # Seconds to wait for a worker, before executing the code in a new sandbox.
+    'ACQUIRE_TIMEOUT': 1,
+}
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
@@ -1227,6 +1263,13 @@ STATICFILES_DIRS = [
     NODE_MODULES_ROOT / "@edx",
 ]
 
+# Maximum number of entries in the per-process LRU cache of the urls that /static/ asset
+# paths in rendered content resolve to. 0 disables it. Entries expire after
+# STATIC_REPLACE_ASSET_URL_CACHE_TIMEOUT seconds, since locking or unlocking an asset
+# changes whether it is served from the CDN.
+STATIC_REPLACE_ASSET_URL_CACHE_SIZE = 0
+STATIC_REPLACE_ASSET_URL_CACHE_TIMEOUT = 300
+
 FAVICON_PATH = 'images/favicon.ico'
 DEFAULT_COURSE_ABOUT_IMAGE_URL = 'images/pencils.jpg'
 
@@ -2890,6 +2933,17 @@ POLICY_CHANGE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
 
 RECALCULATE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
 
+# Number of processes that CourseGradeFactory.iter shards users across when
+# computing grades, and the number of users sent to a process at a time.
+# With a single worker, grades are computed in the calling process. The
+# workers are also forked from Celery prefork pool workers, so this applies
+# to grade report tasks.
+COURSE_GRADE_ITER_WORKERS = 1
+COURSE_GRADE_ITER_SHARD_SIZE = 20
+# Seconds to wait for the grades of a shard before the remaining users
+# are graded in the calling process, such as when a worker process dies.
+COURSE_GRADE_ITER_SHARD_TIMEOUT = 600
+
 SOFTWARE_SECURE_VERIFICATION_ROUTING_KEY = 'edx.lms.core.default'
 
 GRADES_DOWNLOAD = {
@@ -4026,6 +4080,13 @@ FERNET_KEYS = [
 # Maximum number of rows to fetch in XBlockUserStateClient calls. Adjust for performance
 USER_STATE_BATCH_SIZE = 5000
 
+# User state fields, by block type, whose writes are buffered in the cache and
+# saved in a single update per block after COALESCED_USER_STATE_FLUSH_DELAY
+# seconds, instead of on every request. Only list frequently written fields
+# that do not affect grades, for example: {'video': ['saved_video_position']}.
+COALESCED_USER_STATE_FIELDS = {}
+COALESCED_USER_STATE_FLUSH_DELAY = 30
+
 # Max no. of bad requests after which ratelimitier backend will block IP's access
 RATE_LIMIT_BACKEND_MAX_REQUESTS = 30
 
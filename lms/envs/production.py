@@ -359,6 +359,8 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
     else:
         CODE_JAIL[name] = value
 
+CODE_JAIL_WORKER_POOL.update(ENV_TOKENS.get('CODE_JAIL_WORKER_POOL', {}))
+
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
 
 # Event Tracking
@@ -169,9 +169,15 @@ class Bookmark(TimeStampedModel):
         Returns:
             list of PathItems
         """
+        # Imported here because bookmarks are also used by Studio.
+        from lms.djangoapps.course_blocks.api import path_to_location_in_block_structure
+
         with modulestore().bulk_operations(usage_key.course_key):
             try:
-                path = search.path_to_location(modulestore(), usage_key, full_path=True)
+                path = (
+                    path_to_location_in_block_structure(usage_key, full_path=True) or
+                    search.path_to_location(modulestore(), usage_key, full_path=True)
+                )
             except ItemNotFoundError:
                 log.error(u'Block with usage_key: %s not found.', usage_key)
                 return []
@@ -23,7 +23,7 @@ class BookmarksService(object):
     """
     A service that provides access to the bookmarks API.
 
-    When bookmarks() or is_bookmarked() is called for the
+    When bookmarks(), is_bookmarked() or are_bookmarked() is called for the
     first time, the service fetches and caches all the bookmarks
     of the user for the relevant course. So multiple calls to
     get bookmark status during a request (for, example when
@@ -80,13 +80,31 @@ class BookmarksService(object):
         Returns:
             Bool
         """
-        usage_id = six.text_type(usage_key)
-        bookmarks_cache = self._bookmarks_cache(usage_key.course_key, fetch=True)
-        for bookmark in bookmarks_cache:
-            if bookmark['usage_id'] == usage_id:
-                return True
+        return self.are_bookmarked([usage_key])[usage_key]
 
-        return False
+    def are_bookmarked(self, usage_keys):
+        """
+        Return whether each of the blocks has been bookmarked by the user.
+
+        The bookmarks of each course are fetched at most once, so this
+        makes no more than one query for blocks of the same course.
+
+        Arguments:
+            usage_keys: list of UsageKeys of the blocks.
+
+        Returns:
+            dict mapping each UsageKey to a Bool
+        """
+        bookmarked_usage_ids = {}
+        result = {}
+        for usage_key in usage_keys:
+            course_key = usage_key.course_key
+            if course_key not in bookmarked_usage_ids:
+                bookmarked_usage_ids[course_key] = {
+                    bookmark['usage_id'] for bookmark in self._bookmarks_cache(course_key, fetch=True)
+                }
+            result[usage_key] = six.text_type(usage_key) in bookmarked_usage_ids[course_key]
+        return result
 
     def set_bookmarked(self, usage_key):
         """
@@ -372,10 +372,106 @@ class TransformerDataMap(dict):
             map[TransformerClass] or
             map['transformer_name']
         """
+        return self.transformer_name(key)
+
+    @staticmethod
+    def transformer_name(transformer):
+        """
+        Returns the name of the given transformer (class or instance),
+        or the given value itself if it is already a name.
+        """
         try:
-            return key.name()
+            return transformer.name()
         except AttributeError:
-            return key
+            return transformer
+
+
+class LazyTransformerDataMap(TransformerDataMap):
+    """
+    A TransformerDataMap whose per-transformer entries are only
+    deserialized, by the shared loader, the first time any of them
+    is accessed.
+
+    Pickling the map loads all pending transformers and produces a
+    plain TransformerDataMap.
+    """
+    def __init__(self, loader):
+        super(LazyTransformerDataMap, self).__init__()
+        self._loader = loader
+
+    def __getitem__(self, key):
+        key = self._translate_key(key)
+        self._loader.load(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        key = self._translate_key(key)
+        self._loader.load(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        key = self._translate_key(key)
+        self._loader.load(key)
+        dict.__delitem__(self, key)
+
+    def __contains__(self, key):
+        key = self._translate_key(key)
+        self._loader.load(key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        key = self._translate_key(key)
+        self._loader.load(key)
+        return dict.get(self, key, default)
+
+    def __iter__(self):
+        self._loader.load_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._loader.load_all()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self._loader.load_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def keys(self):
+        self._loader.load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._loader.load_all()
+        return dict.values(self)
+
+    def items(self):
+        self._loader.load_all()
+        return dict.items(self)
+
+    def set_loaded(self, key, value):
+        """
+        Stores the given deserialized value without triggering a load.
+        Used by the loader itself.
+        """
+        dict.__setitem__(self, key, value)
+
+    def __reduce__(self):
+        self._loader.load_all()
+        return TransformerDataMap, (), None, None, iter(dict.items(self))
+
+    def __deepcopy__(self, memo):
+        # The copy shares a (copied) loader with the other copied
+        # blocks, so pending transformers remain unloaded.
+        copied = LazyTransformerDataMap(deepcopy(self._loader, memo))
+        memo[id(self)] = copied
+        for key, value in dict.items(self):
+            dict.__setitem__(copied, key, deepcopy(value, memo))
+        return copied
 
 
 class BlockData(FieldData):
@@ -417,18 +513,52 @@ class BlockStructureBlockData(BlockStructure):
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
 
+        # Loader of the block-specific transformer data that has not yet
+        # been deserialized, if the structure was loaded lazily.
+        self._transformer_data_loader = None
+
     def copy(self):
         """
         Returns a new instance of BlockStructureBlockData with a
         deep-copy of this instance's contents.
+
+        Transformer data that has not yet been loaded is not loaded
+        by copying.
         """
         from .factory import BlockStructureFactory
-        return BlockStructureFactory.create_new(
+        memo = {}
+        block_structure = BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
-            deepcopy(self.transformer_data),
-            deepcopy(self._block_data_map),
+            deepcopy(self._block_relations, memo),
+            deepcopy(self.transformer_data, memo),
+            deepcopy(self._block_data_map, memo),
         )
+        block_structure._transformer_data_loader = deepcopy(self._transformer_data_loader, memo)
+        return block_structure
+
+    def unloaded_transformers(self):
+        """
+        Returns the names of the transformers whose collected block
+        data has not been loaded yet.
+        """
+        if self._transformer_data_loader is None:
+            return set()
+        return self._transformer_data_loader.pending_transformers
+
+    def load_transformer_data(self, transformers):
+        """
+        Loads the collected block data of the given transformers, if it
+        has not been loaded yet. The data of all other transformers is
+        left unloaded until it is first accessed.
+
+        Arguments:
+            transformers ([BlockStructureTransformer or string]) - The
+                transformers, or their names, whose data is needed.
+        """
+        if self._transformer_data_loader is None:
+            return
+        for transformer in transformers:
+            self._transformer_data_loader.load(TransformerDataMap.transformer_name(transformer))
 
     def iteritems(self):
         """
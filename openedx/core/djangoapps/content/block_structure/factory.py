@@ -1,7 +1,9 @@
 """
 Module for factory class for BlockStructure objects.
 """
-from .block_structure import BlockStructureBlockData, BlockStructureModulestoreData
+from xmodule.modulestore.exceptions import ItemNotFoundError
+
+from .block_structure import BlockStructureBlockData, BlockStructureModulestoreData, _BlockRelations
 
 
 class BlockStructureFactory(object):
@@ -53,10 +55,173 @@ class BlockStructureFactory(object):
                 block_structure._add_relation(xblock.location, child.location)  # pylint: disable=protected-access
                 build_block_structure(child)
 
-        root_xblock = modulestore.get_item(root_block_usage_key, depth=None, lazy=False)
+        # The blocks' data, such as their HTML, is only loaded for the types
+        # of blocks whose data the transformers read, e.g. problems' XML to
+        # find their maximum scores.
+        root_xblock = modulestore.get_item(
+            root_block_usage_key, depth=None, lazy=False, exclude_definition_fields=['data'],
+        )
         build_block_structure(root_xblock)
         return block_structure
 
+    @classmethod
+    def create_from_modulestore_changes(cls, previous_block_structure, changed_block_keys, modulestore):
+        """
+        Creates and returns the block structure of the current version
+        of the blocks in the modulestore, given a previously collected
+        block structure and the keys of the blocks that were added,
+        removed or modified since it was collected.
+
+        Only the blocks affected by the changes - the changed blocks
+        together with their descendants and ancestors, and the children
+        of all of these, so that siblings reordered, added or moved
+        around a changed block are included - are loaded from the
+        modulestore. Transformers rely on data percolating down from
+        ancestors, so these blocks are returned as a separate sub-structure
+        that is to be collected and then merged back with merge_collected.
+
+        Arguments:
+            previous_block_structure (BlockStructureBlockData) - The
+                previously collected block structure.
+
+            changed_block_keys ([UsageKey]) - Keys of the blocks that
+                were added, removed or modified since the previous block
+                structure was collected.
+
+            modulestore (ModuleStoreRead) - The modulestore that
+                contains the current version of the blocks.
+
+        Returns:
+            (BlockStructureModulestoreData, dict) - The sub-structure of
+                affected blocks, with instantiated xBlocks, and a map of
+                each block's usage key to its _BlockRelations within the
+                complete current block structure.
+
+            None is returned if any affected block has more than one
+            parent, in which case the entire block structure should be
+            collected.
+        """
+        root_block_usage_key = previous_block_structure.root_block_usage_key
+        changed_xblocks = {}
+        for usage_key in changed_block_keys:
+            try:
+                changed_xblocks[usage_key] = modulestore.get_item(usage_key)
+            except ItemNotFoundError:
+                # The block was removed.
+                pass
+
+        # Map of usage key to xBlock for all xBlocks loaded so far.
+        loaded_xblocks = dict(changed_xblocks)
+
+        def get_children(usage_key):
+            """
+            Returns the current children of the block with the given usage_key.
+            """
+            if usage_key in changed_xblocks:
+                children = changed_xblocks[usage_key].get_children()
+                for child in children:
+                    loaded_xblocks.setdefault(child.location, child)
+                return [child.location for child in children]
+            return previous_block_structure.get_children(usage_key)
+
+        # Rebuild the relations of the complete structure, visiting the
+        # blocks in the same order as create_from_modulestore.
+        block_relations = {root_block_usage_key: _BlockRelations()}
+        visit_order = []
+
+        def build_block_relations(usage_key):
+            """
+            Recursively adds the relations of the given block and its descendants.
+            """
+            visit_order.append(usage_key)
+            for child_key in get_children(usage_key):
+                child_visited = child_key in block_relations
+                if not child_visited:
+                    block_relations[child_key] = _BlockRelations()
+                block_relations[usage_key].children.append(child_key)
+                block_relations[child_key].parents.append(usage_key)
+                if not child_visited:
+                    build_block_relations(child_key)
+
+        build_block_relations(root_block_usage_key)
+
+        # The affected blocks are the changed blocks that are still in the
+        # structure, all of their descendants, all of their ancestors and
+        # the siblings of all of these, since a block's position among its
+        # siblings changes when they are reordered or moved.
+        affected_keys = {root_block_usage_key}
+        to_visit = [usage_key for usage_key in changed_xblocks if usage_key in block_relations]
+        while to_visit:
+            usage_key = to_visit.pop()
+            if usage_key not in affected_keys:
+                affected_keys.add(usage_key)
+                to_visit.extend(block_relations[usage_key].children)
+        to_visit = list(affected_keys)
+        while to_visit:
+            usage_key = to_visit.pop()
+            for parent_key in block_relations[usage_key].parents:
+                if parent_key not in affected_keys:
+                    affected_keys.add(parent_key)
+                    to_visit.append(parent_key)
+        for usage_key in list(affected_keys):
+            affected_keys.update(block_relations[usage_key].children)
+
+        # Data merged from multiple parents would have to be collected
+        # from the parents' previous data, which isn't in the sub-structure.
+        if any(len(block_relations[usage_key].parents) > 1 for usage_key in affected_keys):
+            return None
+
+        affected_structure = BlockStructureModulestoreData(root_block_usage_key)
+        for usage_key in visit_order:
+            if usage_key not in affected_keys:
+                continue
+            if usage_key in loaded_xblocks:
+                xblock = loaded_xblocks[usage_key]
+            else:
+                xblock = modulestore.get_item(usage_key)
+            affected_structure._add_xblock(usage_key, xblock)  # pylint: disable=protected-access
+            for child_key in block_relations[usage_key].children:
+                if child_key in affected_keys:
+                    affected_structure._add_relation(usage_key, child_key)  # pylint: disable=protected-access
+
+        return affected_structure, block_relations
+
+    @classmethod
+    def merge_collected(cls, previous_block_structure, affected_block_structure, block_relations):
+        """
+        Returns a new block structure with the given block_relations, the
+        collected data of the blocks in affected_block_structure and the
+        previously collected data of all other blocks.
+
+        See create_from_modulestore_changes.
+        """
+        root_block_usage_key = previous_block_structure.root_block_usage_key
+        previous_block_structure.load_transformer_data(previous_block_structure.unloaded_transformers())
+
+        affected_block_data_map = affected_block_structure._block_data_map  # pylint: disable=protected-access
+        previous_block_data_map = previous_block_structure._block_data_map  # pylint: disable=protected-access
+        course_version = affected_block_structure.get_xblock_field(root_block_usage_key, 'course_version')
+
+        block_data_map = {}
+        for usage_key in block_relations:
+            if usage_key in affected_block_structure:
+                block_data = affected_block_data_map.get(usage_key)
+            else:
+                block_data = previous_block_data_map.get(usage_key)
+                # Every block carries the version of the structure it was
+                # loaded from, which changes even for unaffected blocks.
+                if block_data is not None and course_version is not None and 'course_version' in block_data.fields:
+                    block_data.fields['course_version'] = course_version
+            if block_data is not None:
+                block_data_map[usage_key] = block_data
+
+        return cls.create_new(
+            root_block_usage_key,
+            block_relations,
+            affected_block_structure.transformer_data,
+            block_data_map,
+        )
+
     @classmethod
     def create_from_store(cls, root_block_usage_key, block_structure_store):
         """
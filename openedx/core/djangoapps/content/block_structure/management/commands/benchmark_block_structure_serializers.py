@@ -0,0 +1,105 @@
+"""
+Command to compare the Block Structure serializers on existing courses.
+"""
+
+
+import logging
+from timeit import default_timer
+
+import six
+from django.core.management.base import BaseCommand
+
+import openedx.core.djangoapps.content.block_structure.api as api
+from openedx.core.djangoapps.content.block_structure.serializers import SERIALIZERS, deserialize
+from openedx.core.lib.command_utils import get_mutually_exclusive_required_option, parse_course_keys
+from xmodule.modulestore.django import modulestore
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serializers --all_courses --settings=devstack
+        $ ./manage.py lms benchmark_block_structure_serializers --courses 'edX/DemoX/Demo_Course' --settings=devstack
+    """
+    help = u'Compares the size and speed of the Block Structure serializers on collected course blocks.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--courses',
+            dest='courses',
+            nargs='+',
+            help=u'Benchmark the collected course blocks of the list of courses provided.',
+        )
+        parser.add_argument(
+            '--all_courses',
+            help=u'Benchmark the collected course blocks of all courses.',
+            action='store_true',
+            default=False,
+        )
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of times to serialize and deserialize each course.',
+            default=5,
+            type=int,
+        )
+        parser.add_argument(
+            '--transformers',
+            nargs='*',
+            default=[],
+            help=u'Names of transformers whose data is accessed after deserializing, to measure lazy loading.',
+        )
+
+    def handle(self, *args, **options):
+        courses_mode = get_mutually_exclusive_required_option(options, 'courses', 'all_courses')
+        if courses_mode == 'all_courses':
+            course_keys = [course.id for course in modulestore().get_course_summaries()]
+        else:
+            course_keys = parse_course_keys(options['courses'])
+
+        for course_key in course_keys:
+            try:
+                self._benchmark_course(course_key, options['iterations'], options['transformers'])
+            except Exception as ex:  # pylint: disable=broad-except
+                log.exception(
+                    u'BlockStructure: An error occurred while benchmarking course blocks for %s: %s',
+                    six.text_type(course_key),
+                    six.text_type(ex),
+                )
+
+    def _benchmark_course(self, course_key, iterations, transformer_names):
+        """
+        Writes the size and average serialization and deserialization
+        times of each serializer for the given course.
+        """
+        block_structure = api.get_course_in_cache(course_key)
+        root_block_usage_key = block_structure.root_block_usage_key
+        self.stdout.write(u'{} ({} blocks)'.format(six.text_type(course_key), len(block_structure)))
+
+        for name, serializer in sorted(six.iteritems(SERIALIZERS)):
+            start = default_timer()
+            for __ in range(iterations):
+                serialized_data = serializer.serialize(block_structure)
+            serialize_time = (default_timer() - start) / iterations
+
+            start = default_timer()
+            for __ in range(iterations):
+                deserialized = deserialize(serialized_data, root_block_usage_key)
+                for transformer_name in transformer_names:
+                    for block_data in deserialized.itervalues():
+                        block_data.transformer_data.get(transformer_name)
+            deserialize_time = (default_timer() - start) / iterations
+
+            self.stdout.write(
+                u'    {name:<10} size: {size:>10} bytes  serialize: {serialize:8.1f} ms  '
+                u'deserialize: {deserialize:8.1f} ms'.format(
+                    name=name,
+                    size=len(serialized_data),
+                    serialize=serialize_time * 1000,
+                    deserialize=deserialize_time * 1000,
+                )
+            )
@@ -5,6 +5,7 @@ BlockStructures.
 
 
 from contextlib import contextmanager
+from logging import getLogger
 
 import six
 
@@ -14,6 +15,8 @@ from .factory import BlockStructureFactory
 from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
+logger = getLogger(__name__)  # pylint: disable=C0103
+
 
 class BlockStructureManager(object):
     """
@@ -64,7 +67,10 @@ class BlockStructureManager(object):
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
-        block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected()
+        if collected_block_structure:
+            block_structure = collected_block_structure.copy()
+        else:
+            block_structure = self.get_collected(transformers.names())
 
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
@@ -80,7 +86,7 @@ class BlockStructureManager(object):
         transformers.transform(block_structure)
         return block_structure
 
-    def get_collected(self):
+    def get_collected(self, transformers=None):
         """
         Returns the collected Block Structure for the root_block_usage_key,
         getting block data from the cache and modulestore, as needed.
@@ -89,17 +95,22 @@ class BlockStructureManager(object):
         the modulestore is accessed if needed (at cache miss), and the
         transformers data is collected if needed.
 
+        Arguments:
+            transformers ([BlockStructureTransformer or string]) - The
+                transformers, or their names, whose collected data the
+                caller needs. If the stored structure supports partial
+                loading, only the block data of these transformers is
+                loaded up front; the data of other transformers is
+                loaded only if it is accessed. If None, the data of
+                all transformers is loaded.
+
         Returns:
             BlockStructureBlockData - A collected block structure,
                 starting at root_block_usage_key, with collected data
                 from each registered transformer.
         """
         try:
-            block_structure = BlockStructureFactory.create_from_store(
-                self.root_block_usage_key,
-                self.store,
-            )
-            BlockStructureTransformers.verify_versions(block_structure)
+            block_structure = self._get_collected_from_store(transformers)
 
         except (BlockStructureNotFound, TransformerDataIncompatible):
             if config.waffle().is_enabled(config.RAISE_ERROR_WHEN_NOT_FOUND):
@@ -109,6 +120,48 @@ class BlockStructureManager(object):
 
         return block_structure
 
+    def get_collected_if_stored(self, transformers=None):
+        """
+        Returns the collected Block Structure for the root_block_usage_key
+        if it is found in the store, without accessing the modulestore.
+
+        Arguments:
+            transformers ([BlockStructureTransformer or string]) - The
+                transformers, or their names, whose collected data the
+                caller needs. See get_collected.
+
+        Returns:
+            BlockStructureBlockData - A collected block structure, or
+                None if it isn't in the store or its collected data is
+                incompatible with the registered transformers.
+        """
+        try:
+            return self._get_collected_from_store(transformers)
+        except (BlockStructureNotFound, TransformerDataIncompatible):
+            return None
+
+    def _get_collected_from_store(self, transformers):
+        """
+        Returns the collected Block Structure from the store, with the
+        block data of the given transformers loaded.
+
+        Raises:
+            BlockStructureNotFound - If it isn't in the store.
+            TransformerDataIncompatible - If its collected data is
+                incompatible with the registered transformers.
+        """
+        block_structure = BlockStructureFactory.create_from_store(
+            self.root_block_usage_key,
+            self.store,
+        )
+        BlockStructureTransformers.verify_versions(block_structure)
+        # Load the needed transformer data while a failure to
+        # deserialize it can still be handled as a cache miss.
+        if transformers is None:
+            transformers = block_structure.unloaded_transformers()
+        block_structure.load_transformer_data(transformers)
+        return block_structure
+
     def update_collected_if_needed(self):
         """
         The store is updated with newly collected transformers data from
@@ -124,14 +177,69 @@ class BlockStructureManager(object):
         the modulestore.
         """
         with self._bulk_operations():
-            block_structure = BlockStructureFactory.create_from_modulestore(
-                self.root_block_usage_key,
-                self.modulestore,
-            )
-            BlockStructureTransformers.collect(block_structure)
+            block_structure = None
+            if config.waffle().is_enabled(config.INCREMENTAL_COLLECTION):
+                block_structure = self._collect_incrementally()
+
+            if block_structure is None:
+                block_structure = BlockStructureFactory.create_from_modulestore(
+                    self.root_block_usage_key,
+                    self.modulestore,
+                )
+                BlockStructureTransformers.collect(block_structure)
             self.store.add(block_structure)
             return block_structure
 
+    def _collect_incrementally(self):
+        """
+        Returns a newly collected block structure, collecting data only
+        for the blocks affected by changes in the modulestore since the
+        block structure in the store was collected, and reusing the stored
+        data of all other blocks.
+
+        Returns None if incremental collection isn't possible, in which
+        case the entire block structure should be collected.
+        """
+        try:
+            previous_block_structure = self.store.get(self.root_block_usage_key)
+            previous_block_structure.load_transformer_data(previous_block_structure.unloaded_transformers())
+        except BlockStructureNotFound:
+            return None
+
+        if not BlockStructureTransformers.supports_incremental_collect(previous_block_structure):
+            return None
+
+        previous_version = previous_block_structure.get_xblock_field(self.root_block_usage_key, 'course_version')
+        get_blocks_changed_since = getattr(self.modulestore, 'get_blocks_changed_since', None)
+        if previous_version is None or get_blocks_changed_since is None:
+            return None
+
+        changed_block_keys = get_blocks_changed_since(self.root_block_usage_key.course_key, previous_version)
+        if changed_block_keys is None:
+            return None
+
+        affected = BlockStructureFactory.create_from_modulestore_changes(
+            previous_block_structure,
+            changed_block_keys,
+            self.modulestore,
+        )
+        if affected is None:
+            return None
+
+        affected_block_structure, block_relations = affected
+        BlockStructureTransformers.collect(affected_block_structure)
+        logger.info(
+            u'BlockStructure: Collected %d of %d blocks incrementally for %s.',
+            len(affected_block_structure),
+            len(block_relations),
+            self.root_block_usage_key,
+        )
+        return BlockStructureFactory.merge_collected(
+            previous_block_structure,
+            affected_block_structure,
+            block_relations,
+        )
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
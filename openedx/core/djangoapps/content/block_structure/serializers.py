@@ -0,0 +1,341 @@
+"""
+Serializers for the collected data of BlockStructure objects.
+
+Two serializers are available:
+
+    PickleBlockStructureSerializer - The original format: the block
+        relations, transformer data and block data map are pickled
+        together and zlib-compressed.
+
+    ColumnarBlockStructureSerializer - A compact, version-tagged format.
+        Usage keys are interned and referenced by integer index, block
+        relations are stored as index lists, and collected fields are
+        stored as sparse columns per field name. Each transformer's
+        block data is compressed as a separate segment that is only
+        deserialized when the transformer's data is first accessed.
+
+Serialized data is self-describing, so data written by either serializer
+can always be read back with deserialize(), regardless of which
+serializer is currently configured for writing.
+"""
+# pylint: disable=protected-access
+
+
+import zlib
+from copy import deepcopy
+from logging import getLogger
+
+import six
+from six.moves import cPickle as pickle
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .block_structure import (
+    BlockData,
+    LazyTransformerDataMap,
+    TransformerData,
+    TransformerDataMap,
+    _BlockRelations,
+)
+from .exceptions import BlockStructureNotFound
+from .factory import BlockStructureFactory
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+
+# Keep this constant as we upgrade from python 2 to 3.
+PICKLE_PROTOCOL = 4
+
+
+def _dumps(data):
+    """
+    Returns a zlib compressed pickled serialization of the given data.
+    """
+    return zlib.compress(pickle.dumps(data, PICKLE_PROTOCOL), 1)
+
+
+def _loads(zdata):
+    """
+    Returns the data serialized with _dumps.
+    """
+    if isinstance(zdata, six.text_type):
+        # Data pickled under python 2 is unpickled as latin1 text.
+        zdata = zdata.encode('latin1')
+    if six.PY2:
+        return pickle.loads(zlib.decompress(zdata))
+    else:
+        return pickle.loads(zlib.decompress(zdata), encoding='latin1')
+
+
+class PickleBlockStructureSerializer(object):
+    """
+    Serializes the entire block structure as a single zpickle.
+    """
+    name = u'pickle'
+
+    @classmethod
+    def serialize(cls, block_structure):
+        """
+        Returns the serialized data for the given block_structure.
+        """
+        data_to_cache = (
+            block_structure._block_relations,
+            block_structure.transformer_data,
+            block_structure._block_data_map,
+        )
+        return zpickle(data_to_cache)
+
+    @classmethod
+    def deserialize(cls, serialized_data, root_block_usage_key):
+        """
+        Returns the block structure for the given serialized_data.
+        """
+        block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+        return BlockStructureFactory.create_new(
+            root_block_usage_key,
+            block_relations,
+            transformer_data,
+            block_data_map,
+        )
+
+
+class _TransformerSegmentLoader(object):
+    """
+    Deserializes the compressed per-transformer block data segments of a
+    columnar serialization on demand, filling in the transformer_data
+    maps of the blocks they belong to.
+
+    A segment that fails to deserialize is treated like a missing block
+    structure, raising BlockStructureNotFound when it is accessed.
+    """
+    def __init__(self, root_block_usage_key, blocks_data, segments):
+        self._root_block_usage_key = root_block_usage_key
+        # List of each block's BlockData, indexed by its serialized block index.
+        self._blocks_data = blocks_data
+        self._pending_segments = segments
+
+    @property
+    def pending_transformers(self):
+        """
+        Returns the names of the transformers whose data is not yet loaded.
+        """
+        return set(self._pending_segments)
+
+    def load(self, transformer_name):
+        """
+        Deserializes the given transformer's block data, if still pending.
+        """
+        segment = self._pending_segments.pop(transformer_name, None)
+        if segment is None:
+            return
+
+        try:
+            block_indices, columns = _loads(segment)
+        except Exception:
+            logger.exception(
+                u"BlockStructure: Failed to load data of transformer %s for %s",
+                transformer_name,
+                self._root_block_usage_key,
+            )
+            raise BlockStructureNotFound(self._root_block_usage_key)
+
+        blocks_data = {index: TransformerData() for index in block_indices}
+        for field_name, (indices, values) in six.iteritems(columns):
+            for index, value in zip(indices, values):
+                blocks_data[index].fields[field_name] = value
+
+        for index, transformer_data in six.iteritems(blocks_data):
+            self._blocks_data[index].transformer_data.set_loaded(transformer_name, transformer_data)
+
+    def load_all(self):
+        """
+        Deserializes the block data of all pending transformers.
+        """
+        for transformer_name in list(self._pending_segments):
+            self.load(transformer_name)
+
+    def __getstate__(self):
+        self.load_all()
+        return self.__dict__
+
+    def __deepcopy__(self, memo):
+        copied = _TransformerSegmentLoader(self._root_block_usage_key, None, dict(self._pending_segments))
+        memo[id(self)] = copied
+        copied._blocks_data = deepcopy(self._blocks_data, memo)
+        return copied
+
+
+class ColumnarBlockStructureSerializer(object):
+    """
+    Serializes a block structure into a compact columnar format, with
+    lazily deserialized per-transformer segments.
+    """
+    name = u'columnar'
+
+    # Prefix identifying data in this format. Increment the version
+    # whenever the layout of the serialized data changes.
+    VERSION = 1
+    TAG = b'bs-columnar:1\n'
+
+    @classmethod
+    def serialize(cls, block_structure):
+        """
+        Returns the serialized data for the given block_structure.
+        """
+        root_course_key = block_structure.root_block_usage_key.course_key
+        usage_keys = list(block_structure._block_relations)
+        key_indices = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+
+        relations = [
+            (
+                [
+                    key_indices[parent] for parent in block_structure._block_relations[usage_key].parents
+                    if parent in key_indices
+                ],
+                [
+                    key_indices[child] for child in block_structure._block_relations[usage_key].children
+                    if child in key_indices
+                ],
+            )
+            for usage_key in usage_keys
+        ]
+
+        block_fields = {}
+        transformer_block_fields = {}
+        for index, usage_key in enumerate(usage_keys):
+            block_data = block_structure._block_data_map.get(usage_key)
+            if block_data is None:
+                continue
+            cls._add_to_columns(block_fields, index, block_data.fields)
+            for transformer_name, transformer_data in six.iteritems(block_data.transformer_data):
+                block_indices, columns = transformer_block_fields.setdefault(transformer_name, ([], {}))
+                block_indices.append(index)
+                cls._add_to_columns(columns, index, transformer_data.fields)
+
+        segments = {
+            'structure': _dumps((
+                [cls._intern_usage_key(usage_key, root_course_key) for usage_key in usage_keys],
+                relations,
+                [
+                    index for index, usage_key in enumerate(usage_keys)
+                    if usage_key in block_structure._block_data_map
+                ],
+                dict(block_structure.transformer_data),
+            )),
+            'block_fields': _dumps(block_fields),
+            'transformers': {
+                transformer_name: _dumps(segment)
+                for transformer_name, segment in six.iteritems(transformer_block_fields)
+            },
+        }
+        return cls.TAG + pickle.dumps(segments, PICKLE_PROTOCOL)
+
+    @classmethod
+    def deserialize(cls, serialized_data, root_block_usage_key):
+        """
+        Returns the block structure for the given serialized_data. The
+        transformers' block data is not deserialized until it is accessed.
+        """
+        if six.PY2:
+            segments = pickle.loads(serialized_data[len(cls.TAG):])
+        else:
+            segments = pickle.loads(serialized_data[len(cls.TAG):], encoding='latin1')
+        interned_keys, relations, block_data_indices, transformer_data = _loads(segments['structure'])
+
+        root_course_key = root_block_usage_key.course_key
+        usage_keys = [cls._resolve_usage_key(interned_key, root_course_key) for interned_key in interned_keys]
+
+        block_relations = {}
+        for usage_key, (parents, children) in zip(usage_keys, relations):
+            relation = _BlockRelations()
+            relation.parents = [usage_keys[index] for index in parents]
+            relation.children = [usage_keys[index] for index in children]
+            block_relations[usage_key] = relation
+
+        # Blocks are addressed by index while deserializing, to avoid
+        # repeatedly hashing usage keys.
+        blocks_data = [None] * len(usage_keys)
+        loader = _TransformerSegmentLoader(root_block_usage_key, blocks_data, dict(segments['transformers']))
+        for index in block_data_indices:
+            block_data = BlockData(usage_keys[index])
+            block_data.transformer_data = LazyTransformerDataMap(loader)
+            blocks_data[index] = block_data
+
+        for field_name, (indices, values) in six.iteritems(_loads(segments['block_fields'])):
+            for index, value in zip(indices, values):
+                blocks_data[index].fields[field_name] = value
+
+        block_data_map = {
+            usage_keys[index]: blocks_data[index]
+            for index in block_data_indices
+        }
+
+        structure_transformer_data = TransformerDataMap()
+        structure_transformer_data.update(transformer_data)
+
+        block_structure = BlockStructureFactory.create_new(
+            root_block_usage_key,
+            block_relations,
+            structure_transformer_data,
+            block_data_map,
+        )
+        block_structure._transformer_data_loader = loader
+        return block_structure
+
+    @staticmethod
+    def _add_to_columns(columns, index, fields):
+        """
+        Appends the given fields of the block at the given index
+        to the sparse (indices, values) column of each field.
+        """
+        for field_name, value in six.iteritems(fields):
+            try:
+                indices, values = columns[field_name]
+            except KeyError:
+                indices, values = columns[field_name] = ([], [])
+            indices.append(index)
+            values.append(value)
+
+    @staticmethod
+    def _intern_usage_key(usage_key, root_course_key):
+        """
+        Returns a compact representation of the given usage key. Keys
+        within the root's course are stored as (block_type, block_id)
+        tuples; any other keys are stored as is.
+        """
+        interned_key = (usage_key.block_type, usage_key.block_id)
+        if root_course_key.make_usage_key(*interned_key) == usage_key:
+            return interned_key
+        return usage_key
+
+    @staticmethod
+    def _resolve_usage_key(interned_key, root_course_key):
+        """
+        Returns the usage key for the given value of _intern_usage_key.
+        """
+        if isinstance(interned_key, tuple):
+            return root_course_key.make_usage_key(*interned_key)
+        return interned_key
+
+
+SERIALIZERS = {
+    serializer.name: serializer
+    for serializer in (PickleBlockStructureSerializer, ColumnarBlockStructureSerializer)
+}
+
+
+def get_serializer(name):
+    """
+    Returns the serializer registered with the given name.
+    """
+    return SERIALIZERS[name]
+
+
+def deserialize(serialized_data, root_block_usage_key):
+    """
+    Returns the block structure for the given serialized_data, using
+    the serializer that the data was written with.
+    """
+    if serialized_data.startswith(ColumnarBlockStructureSerializer.TAG):
+        return ColumnarBlockStructureSerializer.deserialize(serialized_data, root_block_usage_key)
+    return PickleBlockStructureSerializer.deserialize(serialized_data, root_block_usage_key)
@@ -9,13 +9,12 @@ from logging import getLogger
 import six
 
 from django.utils.encoding import python_2_unicode_compatible
-from openedx.core.lib.cache_utils import zpickle, zunpickle
 
 from . import config
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
-from .factory import BlockStructureFactory
 from .models import BlockStructureModel
+from .serializers import ColumnarBlockStructureSerializer, PickleBlockStructureSerializer, deserialize
 from .transformer_registry import TransformerRegistry
 
 logger = getLogger(__name__)  # pylint: disable=C0103
@@ -45,14 +44,20 @@ class BlockStructureStore(object):
     """
     Storage for BlockStructure objects.
     """
-    def __init__(self, cache):
+    def __init__(self, cache, serializer=None):
         """
         Arguments:
             cache (django.core.cache.backends.base.BaseCache) - The
                 cache into which cacheable data of the block structure
                 is to be serialized.
+
+            serializer - The serializer (see serializers.py) with which
+                block structures are written. If not given, it is chosen
+                by the COLUMNAR_SERIALIZATION waffle switch. Data is
+                always read with the serializer it was written with.
         """
         self._cache = cache
+        self._serializer = serializer
 
     def add(self, block_structure):
         """
@@ -196,12 +201,7 @@ class BlockStructureStore(object):
         """
         Serializes the data for the given block_structure.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        return zpickle(data_to_cache)
+        return self._get_serializer().serialize(block_structure)
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
@@ -209,19 +209,22 @@ class BlockStructureStore(object):
         """
 
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            return deserialize(serialized_data, root_block_usage_key)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
             logger.exception(u"BlockStructure: Failed to load data from cache for %s", bs_model)
             raise BlockStructureNotFound(bs_model.data_usage_key)
 
-        return BlockStructureFactory.create_new(
-            root_block_usage_key,
-            block_relations,
-            transformer_data,
-            block_data_map,
-        )
+    def _get_serializer(self):
+        """
+        Returns the serializer with which to write block structures.
+        """
+        if self._serializer is not None:
+            return self._serializer
+        if config.waffle().is_enabled(config.COLUMNAR_SERIALIZATION):
+            return ColumnarBlockStructureSerializer
+        return PickleBlockStructureSerializer
 
     @staticmethod
     def _encode_root_cache_key(bs_model):
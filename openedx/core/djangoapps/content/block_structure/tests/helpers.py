@@ -91,7 +91,7 @@ class MockModulestore(object):
         """
         self.blocks = blocks
 
-    def get_item(self, block_key, depth=None, lazy=False):  # pylint: disable=unused-argument
+    def get_item(self, block_key, depth=None, lazy=False, **kwargs):  # pylint: disable=unused-argument
         """
         Returns the mock XBlock (MockXBlock) associated with the
         given block_key.
@@ -178,6 +178,7 @@ class MockTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -197,6 +198,7 @@ class MockFilteringTransformer(FilteringTransformerMixin, BlockStructureTransfor
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -10,7 +10,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from ..exceptions import BlockStructureNotFound
 from ..factory import BlockStructureFactory
 from ..store import BlockStructureStore
-from .helpers import ChildrenMapTestMixin, MockCache, MockModulestoreFactory
+from .helpers import ChildrenMapTestMixin, MockCache, MockModulestoreFactory, MockTransformer, MockXBlock
 
 
 class TestBlockStructureFactory(TestCase, ChildrenMapTestMixin):
@@ -65,3 +65,110 @@ class TestBlockStructureFactory(TestCase, ChildrenMapTestMixin):
             block_structure._block_data_map,  # pylint: disable=protected-access
         )
         self.assert_block_structure(new_structure, self.children_map)
+
+    def _change_modulestore(self):
+        """
+        Adds a new block 5 as a child of block 2 in the modulestore and
+        returns the keys of the changed blocks.
+        """
+        self.modulestore.blocks[2].children = [5]
+        self.modulestore.blocks[5] = MockXBlock(5, modulestore=self.modulestore)
+        return [2, 5]
+
+    def test_from_modulestore_changes(self):
+        previous_structure = BlockStructureFactory.create_from_modulestore(
+            root_block_usage_key=0, modulestore=self.modulestore
+        )
+        changed_block_keys = self._change_modulestore()
+
+        affected_structure, block_relations = BlockStructureFactory.create_from_modulestore_changes(
+            previous_structure, changed_block_keys, self.modulestore,
+        )
+        self.assert_block_structure(affected_structure, [[1, 2], [], [5], [], [], []], missing_blocks=[3, 4])
+        self.assertEqual(block_relations[0].children, [1, 2])
+        self.assertEqual(block_relations[2].children, [5])
+        self.assertEqual(block_relations[5].parents, [2])
+
+    def test_from_modulestore_changes_removed_block(self):
+        previous_structure = BlockStructureFactory.create_from_modulestore(
+            root_block_usage_key=0, modulestore=self.modulestore
+        )
+        self.modulestore.blocks[1].children = [3]
+        del self.modulestore.blocks[4]
+
+        affected_structure, block_relations = BlockStructureFactory.create_from_modulestore_changes(
+            previous_structure, [1, 4], self.modulestore,
+        )
+        self.assert_block_structure(affected_structure, [[1, 2], [3], [], []])
+        self.assertNotIn(4, block_relations)
+
+    def test_from_modulestore_changes_siblings(self):
+        previous_structure = BlockStructureFactory.create_from_modulestore(
+            root_block_usage_key=0, modulestore=self.modulestore
+        )
+
+        # an unchanged sibling's position depends on the changed block
+        affected_structure, _ = BlockStructureFactory.create_from_modulestore_changes(
+            previous_structure, [3], self.modulestore,
+        )
+        self.assert_block_structure(affected_structure, [[1, 2], [3, 4], [], [], []])
+
+        # siblings reordered by their parent
+        self.modulestore.blocks[1].children = [4, 3]
+        affected_structure, block_relations = BlockStructureFactory.create_from_modulestore_changes(
+            previous_structure, [1], self.modulestore,
+        )
+        self.assertEqual(affected_structure.get_children(1), [4, 3])
+        self.assertEqual(block_relations[1].children, [4, 3])
+
+    def test_from_modulestore_changes_moved_block(self):
+        previous_structure = BlockStructureFactory.create_from_modulestore(
+            root_block_usage_key=0, modulestore=self.modulestore
+        )
+        self.modulestore.blocks[1].children = [3]
+        self.modulestore.blocks[2].children = [4]
+
+        affected_structure, block_relations = BlockStructureFactory.create_from_modulestore_changes(
+            previous_structure, [1, 2], self.modulestore,
+        )
+        self.assert_block_structure(affected_structure, [[1, 2], [3], [4], [], []])
+        self.assertEqual(block_relations[4].parents, [2])
+
+    def test_from_modulestore_changes_multiple_parents(self):
+        self.modulestore = MockModulestoreFactory.create(self.DAG_CHILDREN_MAP, self.block_key_factory)
+        previous_structure = BlockStructureFactory.create_from_modulestore(
+            root_block_usage_key=0, modulestore=self.modulestore
+        )
+
+        # block 4 and its ancestors have a single parent, but its sibling
+        # block 3 has parents 1 and 2
+        self.assertIsNone(BlockStructureFactory.create_from_modulestore_changes(
+            previous_structure, [4], self.modulestore,
+        ))
+
+        # block 3, a descendant of block 1, has parents 1 and 2
+        self.assertIsNone(BlockStructureFactory.create_from_modulestore_changes(
+            previous_structure, [1], self.modulestore,
+        ))
+
+    def test_merge_collected(self):
+        previous_structure = BlockStructureFactory.create_from_modulestore(
+            root_block_usage_key=0, modulestore=self.modulestore
+        )
+        for block_key in previous_structure:
+            previous_structure.set_transformer_block_field(block_key, MockTransformer, 'collected', 'previous')
+        affected_structure, block_relations = BlockStructureFactory.create_from_modulestore_changes(
+            previous_structure, self._change_modulestore(), self.modulestore,
+        )
+        for block_key in affected_structure:
+            affected_structure.set_transformer_block_field(block_key, MockTransformer, 'collected', 'affected')
+
+        merged_structure = BlockStructureFactory.merge_collected(
+            previous_structure, affected_structure, block_relations,
+        )
+        self.assert_block_structure(merged_structure, [[1, 2], [3, 4], [5], [], [], []])
+        for block_key in range(6):
+            self.assertEqual(
+                merged_structure.get_transformer_block_field(block_key, MockTransformer, 'collected'),
+                'affected' if block_key in (0, 1, 2, 5) else 'previous',
+            )
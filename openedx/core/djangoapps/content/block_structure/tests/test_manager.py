@@ -183,6 +183,26 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
                 with self.assertRaises(BlockStructureNotFound):
                     self.bs_manager.get_collected()
 
+    def test_get_collected_if_stored(self):
+        with mock_registered_transformers(self.registered_transformers):
+            assert self.bs_manager.get_collected_if_stored([TestTransformer1]) is None
+            assert self.modulestore.get_items_call_count == 0
+            assert TestTransformer1.collect_call_count == 0
+
+        self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
+        self.modulestore.get_items_call_count = 0
+        with mock_registered_transformers(self.registered_transformers):
+            block_structure = self.bs_manager.get_collected_if_stored([TestTransformer1])
+        self.assert_block_structure(block_structure, self.children_map)
+        TestTransformer1.assert_collected(block_structure)
+        assert self.modulestore.get_items_call_count == 0
+
+        # stored data that the transformers can't read is a miss
+        TestTransformer1.READ_VERSION += 1
+        with mock_registered_transformers(self.registered_transformers):
+            assert self.bs_manager.get_collected_if_stored([TestTransformer1]) is None
+        TestTransformer1.READ_VERSION -= 1
+
     @ddt.data(True, False)
     def test_update_collected_if_needed(self, with_storage_backing):
         with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
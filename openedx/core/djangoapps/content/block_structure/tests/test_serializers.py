@@ -0,0 +1,203 @@
+"""
+Tests for block_structure/serializers.py
+"""
+# pylint: disable=protected-access
+
+
+import struct
+from unittest import TestCase
+
+import ddt
+import six
+from six.moves import cPickle as pickle
+
+from ..block_structure import TransformerDataMap
+from ..exceptions import BlockStructureNotFound
+from ..serializers import (
+    ColumnarBlockStructureSerializer,
+    PickleBlockStructureSerializer,
+    deserialize,
+    get_serializer,
+)
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+def _python2_pickle(data):
+    """
+    Returns a protocol 2 pickle of the given dict of strings, as
+    python 2 writes it, with all strings pickled as python 2 str objects.
+    """
+    return b'\x80\x02' + _python2_pickle_value(data) + b'.'
+
+
+def _python2_pickle_value(data):
+    """
+    Returns the pickle opcodes of the given value for _python2_pickle.
+    """
+    if isinstance(data, dict):
+        pickled = b'}('
+        for key, value in sorted(data.items()):
+            pickled += _python2_pickle_value(key) + _python2_pickle_value(value)
+        return pickled + b'u'
+    if isinstance(data, six.text_type):
+        data = data.encode('latin1')
+    if len(data) < 256:
+        return b'U' + six.int2byte(len(data)) + data
+    return b'T' + struct.pack('<i', len(data)) + data
+
+
+@ddt.ddt
+class TestBlockStructureSerializers(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the Block Structure serializers
+    """
+    def setUp(self):
+        super(TestBlockStructureSerializers, self).setUp()
+        self.children_map = self.DAG_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        self.block_structure._add_transformer(MockTransformer)
+        for block_id in range(len(self.children_map)):
+            block_key = self.block_key_factory(block_id)
+            self.block_structure._get_or_create_block(block_key).display_name = u'Block {}'.format(block_id)
+            if block_id % 2 == 0:
+                self.block_structure.set_transformer_block_field(block_key, MockTransformer, 'even', block_id)
+            self.block_structure.set_transformer_block_field(block_key, u'other_transformer', 'data', [block_id])
+
+    def deserialize(self, serializer):
+        """
+        Returns the block structure after a round trip through the given serializer.
+        """
+        serialized_data = serializer.serialize(self.block_structure)
+        return deserialize(serialized_data, self.block_structure.root_block_usage_key)
+
+    @ddt.data(PickleBlockStructureSerializer, ColumnarBlockStructureSerializer)
+    def test_round_trip(self, serializer):
+        block_structure = self.deserialize(serializer)
+        self.assert_block_structure(block_structure, self.children_map)
+        self.assertEqual(block_structure.get_transformer_data(MockTransformer, '_version'), 1)
+
+        for block_id in range(len(self.children_map)):
+            block_key = self.block_key_factory(block_id)
+            self.assertEqual(block_structure.get_xblock_field(block_key, 'display_name'), u'Block {}'.format(block_id))
+            self.assertEqual(
+                block_structure.get_transformer_block_field(block_key, MockTransformer, 'even'),
+                block_id if block_id % 2 == 0 else None,
+            )
+            self.assertEqual(
+                block_structure.get_transformer_block_field(block_key, u'other_transformer', 'data'),
+                [block_id],
+            )
+
+    @ddt.data(PickleBlockStructureSerializer, ColumnarBlockStructureSerializer)
+    def test_children_order(self, serializer):
+        block_structure = self.deserialize(serializer)
+        for block_id, children in enumerate(self.children_map):
+            self.assertEqual(
+                block_structure.get_children(self.block_key_factory(block_id)),
+                [self.block_key_factory(child) for child in children],
+            )
+
+    def test_get_serializer(self):
+        self.assertIs(get_serializer(u'pickle'), PickleBlockStructureSerializer)
+        self.assertIs(get_serializer(u'columnar'), ColumnarBlockStructureSerializer)
+
+    def test_columnar_is_tagged(self):
+        serialized_data = ColumnarBlockStructureSerializer.serialize(self.block_structure)
+        self.assertTrue(serialized_data.startswith(ColumnarBlockStructureSerializer.TAG))
+
+    def test_columnar_loads_transformers_lazily(self):
+        block_structure = self.deserialize(ColumnarBlockStructureSerializer)
+        self.assertEqual(block_structure.unloaded_transformers(), {MockTransformer.name(), u'other_transformer'})
+
+        block_structure.get_transformer_block_field(self.block_key_factory(2), MockTransformer, 'even')
+        self.assertEqual(block_structure.unloaded_transformers(), {u'other_transformer'})
+
+    def test_columnar_block_without_transformer_data(self):
+        block_structure = self.deserialize(ColumnarBlockStructureSerializer)
+        block_key = self.block_key_factory(1)
+        with self.assertRaises(KeyError):
+            block_structure.get_transformer_block_data(block_key, MockTransformer)
+        self.assertNotIn(MockTransformer.name(), block_structure[block_key].transformer_data)
+
+    def test_columnar_set_before_load(self):
+        block_structure = self.deserialize(ColumnarBlockStructureSerializer)
+        block_key = self.block_key_factory(0)
+        block_structure.set_transformer_block_field(block_key, MockTransformer, 'new_field', u'value')
+        self.assertEqual(block_structure.get_transformer_block_field(block_key, MockTransformer, 'even'), 0)
+        self.assertEqual(block_structure.get_transformer_block_field(block_key, MockTransformer, 'new_field'), u'value')
+
+    def test_columnar_pickle(self):
+        block_structure = self.deserialize(ColumnarBlockStructureSerializer)
+        block_key = self.block_key_factory(2)
+
+        pickled = pickle.loads(pickle.dumps(block_structure[block_key]))
+        self.assertIs(type(pickled.transformer_data), TransformerDataMap)
+        self.assertEqual(pickled.transformer_data[u'other_transformer'].data, [2])
+        self.assertEqual(block_structure.unloaded_transformers(), set())
+
+    def test_columnar_copy_stays_lazy(self):
+        block_structure = self.deserialize(ColumnarBlockStructureSerializer)
+        block_structure.load_transformer_data([MockTransformer])
+        block_key = self.block_key_factory(2)
+
+        copied = block_structure.copy()
+        self.assertEqual(copied.unloaded_transformers(), {u'other_transformer'})
+        self.assertEqual(copied.get_transformer_block_field(block_key, u'other_transformer', 'data'), [2])
+        self.assertEqual(copied.unloaded_transformers(), set())
+
+        # loading into the copy neither loads nor shares data with the original
+        self.assertEqual(block_structure.unloaded_transformers(), {u'other_transformer'})
+        copied.set_transformer_block_field(block_key, MockTransformer, 'even', u'changed')
+        self.assertEqual(block_structure.get_transformer_block_field(block_key, MockTransformer, 'even'), 2)
+
+    def test_columnar_corrupt_transformer_data(self):
+        serialized_data = ColumnarBlockStructureSerializer.serialize(self.block_structure)
+        segments = pickle.loads(serialized_data[len(ColumnarBlockStructureSerializer.TAG):])
+        segments['transformers'][u'other_transformer'] = b'corrupt'
+        block_structure = deserialize(
+            ColumnarBlockStructureSerializer.TAG + pickle.dumps(segments),
+            self.block_structure.root_block_usage_key,
+        )
+
+        block_structure.load_transformer_data([MockTransformer])
+        with self.assertRaises(BlockStructureNotFound):
+            block_structure.load_transformer_data([u'other_transformer'])
+
+    def test_columnar_python2_pickle(self):
+        serialized_data = ColumnarBlockStructureSerializer.serialize(self.block_structure)
+        segments = pickle.loads(serialized_data[len(ColumnarBlockStructureSerializer.TAG):])
+        block_structure = deserialize(
+            ColumnarBlockStructureSerializer.TAG + _python2_pickle(segments),
+            self.block_structure.root_block_usage_key,
+        )
+        self.assert_block_structure(block_structure, self.children_map)
+        self.assertEqual(
+            block_structure.get_transformer_block_field(self.block_key_factory(2), u'other_transformer', 'data'),
+            [2],
+        )
+
+    def test_load_transformer_data(self):
+        block_structure = self.deserialize(ColumnarBlockStructureSerializer)
+        self.assertEqual(block_structure.unloaded_transformers(), {MockTransformer.name(), u'other_transformer'})
+        block_structure.load_transformer_data([MockTransformer])
+        self.assertEqual(block_structure.unloaded_transformers(), {u'other_transformer'})
+        block_structure.load_transformer_data([u'other_transformer'])
+        self.assertEqual(block_structure.unloaded_transformers(), set())
+
+    def test_load_transformer_data_not_lazy(self):
+        block_structure = self.deserialize(PickleBlockStructureSerializer)
+        block_structure.load_transformer_data([MockTransformer])
+        self.assertEqual(block_structure.unloaded_transformers(), set())
+
+    def test_columnar_serializes_lazily_loaded_structure(self):
+        block_structure = self.deserialize(ColumnarBlockStructureSerializer)
+        for serializer in (PickleBlockStructureSerializer, ColumnarBlockStructureSerializer):
+            reloaded = deserialize(serializer.serialize(block_structure), block_structure.root_block_usage_key)
+            self.assertEqual(
+                reloaded.get_transformer_block_field(self.block_key_factory(4), MockTransformer, 'even'),
+                4,
+            )
+            self.assertEqual(
+                reloaded.get_xblock_field(self.block_key_factory(4), 'display_name'),
+                six.text_type('Block 4'),
+            )
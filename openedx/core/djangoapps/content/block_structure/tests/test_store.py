@@ -7,7 +7,7 @@ import ddt
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import COLUMNAR_SERIALIZATION, STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
 from ..store import BlockStructureStore
@@ -59,6 +59,25 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             self.assertIsNotNone(stored_value)
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_add_and_get_columnar(self, with_storage_backing):
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
+            with waffle().override(COLUMNAR_SERIALIZATION, active=True):
+                self.store.add(self.block_structure)
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(stored_value, self.children_map)
+            self.assertEqual(
+                stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+                u'{} val'.format(MockTransformer.name()),
+            )
+
+    def test_corrupt_data(self):
+        self.store.add(self.block_structure)
+        for key in self.mock_cache.map:
+            self.mock_cache.map[key] = b'corrupt'
+        with self.assertRaises(BlockStructureNotFound):
+            self.store.get(self.block_structure.root_block_usage_key)
+
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
         with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
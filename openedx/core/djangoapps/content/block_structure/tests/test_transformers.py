@@ -47,6 +47,13 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
             self.transformers._transformers['supports_filter']  # pylint: disable=protected-access
         )
 
+    def test_names(self):
+        self.add_mock_transformer()
+        self.assertEqual(
+            self.transformers.names(),
+            [MockFilteringTransformer.name(), MockTransformer.name()],
+        )
+
     def test_add_unregistered(self):
         with self.assertRaises(TransformerException):
             self.transformers += [self.UnregisteredTransformer()]
@@ -82,3 +89,17 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
                 self.transformers.verify_versions(block_structure)
             self.transformers.collect(block_structure)
             self.assertTrue(self.transformers.verify_versions(block_structure))
+
+    def test_supports_incremental_collect(self):
+        block_structure = self.create_block_structure(
+            self.SIMPLE_CHILDREN_MAP,
+            BlockStructureModulestoreData
+        )
+
+        with mock_registered_transformers(self.registered_transformers):
+            self.assertFalse(self.transformers.supports_incremental_collect(block_structure))
+            self.transformers.collect(block_structure)
+            self.assertTrue(self.transformers.supports_incremental_collect(block_structure))
+
+            with patch.object(MockFilteringTransformer, 'SUPPORTS_INCREMENTAL_COLLECT', False):
+                self.assertFalse(self.transformers.supports_incremental_collect(block_structure))
@@ -57,6 +57,22 @@ class BlockStructureTransformer(object):
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collected data may be collected
+    # incrementally after a course is modified: the collect method is
+    # then called on a block structure containing only the modified
+    # blocks, their descendants, their ancestors and the children of all
+    # of these, and the previously collected data is kept for all other
+    # blocks.
+    #
+    # This holds as long as the data collected for a block depends only
+    # on the block itself, its ancestors (see the collect method on
+    # percolating ancestors' data down), its siblings and the root block.
+    # Transformers that collect data for a block from its descendants
+    # do not support it. Only set this to True once the transformer's
+    # collect method has been verified to meet these conditions.
+    #
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
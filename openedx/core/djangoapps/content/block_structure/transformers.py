@@ -71,6 +71,15 @@ class BlockStructureTransformers(object):
                 self._transformers['no_filter'].append(transformer)
         return self
 
+    def names(self):
+        """
+        Returns the names of the transformers in the collection.
+        """
+        return [
+            transformer.name()
+            for transformer in self._transformers['supports_filter'] + self._transformers['no_filter']
+        ]
+
     @classmethod
     def collect(cls, block_structure):
         """
@@ -83,6 +92,20 @@ class BlockStructureTransformers(object):
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def supports_incremental_collect(cls, block_structure):
+        """
+        Returns whether all registered transformers support incremental
+        collection and the given previously collected block structure
+        was collected by the current version of each of them.
+        """
+        get_data_version = block_structure._get_transformer_data_version  # pylint: disable=protected-access
+        return all(
+            transformer.SUPPORTS_INCREMENTAL_COLLECT and
+            get_data_version(transformer) == transformer.WRITE_VERSION
+            for transformer in TransformerRegistry.get_registered_transformers()
+        )
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
@@ -19,6 +19,7 @@ from rest_framework.views import APIView
 from course_modes.models import CourseMode
 from edxnotes.helpers import is_feature_enabled
 from lms.djangoapps.course_api.api import course_detail
+from lms.djangoapps.course_blocks.api import path_to_location_in_block_structure
 from lms.djangoapps.courseware.access import has_access
 from lms.djangoapps.courseware.courses import check_course_access
 from lms.djangoapps.courseware.module_render import get_module_by_usage_id
@@ -329,7 +330,10 @@ class Resume(DeveloperErrorViewMixin, APIView):
 
         try:
             block_key = get_key_to_last_completed_block(request.user, course_id)
-            path = path_to_location(modulestore(), block_key, request, full_path=True)
+            path = (
+                path_to_location_in_block_structure(block_key, request, full_path=True) or
+                path_to_location(modulestore(), block_key, request, full_path=True)
+            )
             resp['section_id'] = str(path[2])
             resp['unit_id'] = str(path[3])
             resp['block_id'] = str(block_key)
@@ -10,6 +10,7 @@ from completion.test_utils import CompletionWaffleTestMixin
 from opaque_keys.edx.keys import CourseKey
 from six.moves import range
 
+from lms.djangoapps.courseware.services import CoursewareCompletionService
 from openedx.core.djangolib.testing.utils import skip_unless_lms
 from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
@@ -157,6 +158,19 @@ class CompletionServiceTestCase(CompletionWaffleTestMixin, SharedModuleStoreTest
             False,
         )
 
+    def test_verticals_are_complete(self):
+        completion_service = CoursewareCompletionService(self.user, self.course_key)
+        self.assertEqual(completion_service.verticals_are_complete([self.vertical]), {self.vertical.location: False})
+
+        for block_key in self.block_keys:
+            BlockCompletion.objects.submit_completion(
+                user=self.user,
+                block_key=block_key,
+                completion=1.0
+            )
+
+        self.assertEqual(completion_service.verticals_are_complete([self.vertical]), {self.vertical.location: True})
+
     def test_can_mark_block_complete_on_view(self):
 
         self.assertEqual(self.completion_service.can_mark_block_complete_on_view(self.course), False)